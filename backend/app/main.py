@@ -5,7 +5,8 @@ import pandas as pd
 from datetime import datetime
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
-from backend.app.schemas import PredictionRequest
+from pydantic import ValidationError
+from backend.app.schemas import PredictionRequest, BatchPredictionRequest
 from backend.app.state import SALE_MODEL, RENT_MODEL, SALE_SCHEMA, RENT_SCHEMA
 
 # Run locally from backend/app:
@@ -39,41 +40,44 @@ def get_inference_data(transaction_type: str):
     else:
         raise HTTPException(status_code=400, detail="Invalid transaction type")
 
-@app.post("/api/predict")
-def predict(req: PredictionRequest):
-    """Returns predicted total price"""
-
-    # --- select model
-    if req.transaction_type == "sale":
-        pipeline = SALE_MODEL
-    elif req.transaction_type == "rent":
-        pipeline = RENT_MODEL
+def select_model(transaction_type):
+    """Returns the trained pipeline for the given transaction type"""
+    if transaction_type == "sale":
+        return SALE_MODEL
+    elif transaction_type == "rent":
+        return RENT_MODEL
     else:
         raise HTTPException(status_code=400, detail="Invalid transaction type")
 
-    # --- construct upload_date
-    upload_date = datetime(
-        year=req.year,
-        month=req.month,
-        day=15,
-        hour=12,
-        minute=0,
-        second=0
-    )
-
-    # --- build input dataframe
-    X = pd.DataFrame([{
+
+def build_features(requests):
+    """Builds the model input dataframe, one row per validated request"""
+    return pd.DataFrame([{
         "city": req.city,
         "district_name": req.district,
         "area_m2": req.area_m2,
         "bedrooms": req.bedrooms,
         "floor": req.floor,
-        "upload_date": upload_date
-    }])
+        # --- construct upload_date
+        "upload_date": datetime(year=req.year, month=req.month, day=15, hour=12, minute=0, second=0)
+    } for req in requests])
+
+
+def predict_prices(pipeline, X):
+    """Runs one vectorized predict call and converts log predictions back to prices.
+    Rounded per value with Python's round like the former single prediction (np.round sends some half cents the other way)"""
+    pred_log = pipeline.predict(X)
+    return [round(float(value), 2) for value in np.expm1(pred_log)]
+
+
+@app.post("/api/predict")
+def predict(req: PredictionRequest):
+    """Returns predicted total price"""
+    pipeline = select_model(req.transaction_type)
+    X = build_features([req])
 
     try:
-        pred_log = pipeline.predict(X)[0]
-        prediction = round(float(np.expm1(pred_log)), 2)
+        prediction = predict_prices(pipeline, X)[0]
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {e}")
 
@@ -82,6 +86,56 @@ def predict(req: PredictionRequest):
     }
 
 
+@app.post("/api/predict/batch")
+def predict_batch(batch: BatchPredictionRequest):
+    """
+    Returns predicted total prices for a list of apartments (sale and rent can be mixed).
+    Items are validated individually and grouped by transaction type, so every model
+    is called once per batch. Results keep the order of the input items and contain
+    either "total_price" or "error".
+    """
+    results = [None] * len(batch.items)
+    groups = {}  # transaction_type -> list of (index, request)
+
+    # --- validate every item on its own
+    for i, item in enumerate(batch.items):
+        if not isinstance(item, dict):
+            results[i] = {"index": i, "error": f"Item must be an object, got {type(item).__name__}"}
+            continue
+
+        try:
+            req = PredictionRequest.model_validate(item)
+        except ValidationError as e:
+            messages = [
+                f"{'.'.join(map(str, err['loc']))}: {err['msg']}" if err["loc"] else err["msg"]
+                for err in e.errors()
+            ]
+            results[i] = {"index": i, "error": "; ".join(messages)}
+            continue
+
+        groups.setdefault(req.transaction_type, []).append((i, req))
+
+    # --- one predict call per model
+    for transaction_type, indexed_requests in groups.items():
+        pipeline = select_model(transaction_type)
+        indices = [i for i, _ in indexed_requests]
+        X = build_features([req for _, req in indexed_requests])
+
+        try:
+            predictions = predict_prices(pipeline, X)
+        except Exception as e:
+            for i in indices:
+                results[i] = {"index": i, "error": f"Prediction failed: {e}"}
+            continue
+
+        for i, prediction in zip(indices, predictions):
+            results[i] = {"index": i, "total_price": prediction}
+
+    return {
+        "results": results
+    }
+
+
 @app.get("/")
 def root():
     """Health check endpoint"""
@@ -1,6 +1,6 @@
 # schemas.py
-from pydantic import BaseModel, model_validator, PrivateAttr
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator, PrivateAttr
+from typing import Any, Optional
 from backend.app.state import SALE_SCHEMA, RENT_SCHEMA
 
 
@@ -83,4 +83,9 @@ class PredictionRequest(BaseModel):
         if self.month not in valid_months:
             raise ValueError("Invalid month for year")
 
-        return self
\ No newline at end of file
+        return self
+
+
+class BatchPredictionRequest(BaseModel):
+    # items are validated one by one in the endpoint (non-objects included), so a single bad item doesn't reject the whole batch
+    items: list[Any] = Field(..., min_length=1, max_length=10_000)
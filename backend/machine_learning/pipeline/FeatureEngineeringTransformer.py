@@ -12,22 +12,31 @@ class FeatureEngineeringTransformer(BaseEstimator, TransformerMixin):
         self.count_mapping = None
         self.min_year = None
 
+    def _group_districts(self, df):
+        """ Replaces districts with too few training listings by 'other' (only for cities seen in fit) """
+        valid_pairs = pd.MultiIndex.from_tuples(
+            [(city, district) for city, districts in self.district_mapping.items() for district in districts],
+            names=["city", "district_name"]
+        )
+        is_known_city = df["city"].notna() & df["city"].isin(list(self.district_mapping))
+        is_valid_district = pd.MultiIndex.from_arrays([df["city"], df["district_name"]]).isin(valid_pairs)
+
+        return df["district_name"].where(~is_known_city | is_valid_district, "other")
+
     # FIT (learn from TRAIN only)
     def fit(self, X, y=None):
         df = X.copy()
 
         # --- group districts
-        self.district_mapping = {}
-        for city in df["city"].unique():
-            counts = df[df["city"] == city]["district_name"].value_counts()
-            valid_districts = counts[counts >= 100].index
-            self.district_mapping[city] = set(valid_districts)
+        counts = df.groupby(["city", "district_name"]).size()
+        valid_pairs = counts[counts >= 100].index
+
+        self.district_mapping = {city: set() for city in df["city"].unique()}
+        for city, district in valid_pairs:
+            self.district_mapping[city].add(district)
 
         # apply grouping temporarily for next steps
-        df["district_grouped"] = df["district_name"]
-        for city, valid_set in self.district_mapping.items():
-            mask = (df["city"] == city) & (~df["district_name"].isin(valid_set))
-            df.loc[mask, "district_grouped"] = "other"
+        df["district_grouped"] = self._group_districts(df)
 
         # --- median price per sqm
         self.median_mapping = (df.groupby(["city", "district_grouped"])["price_per_sqm"].median())
@@ -65,22 +74,19 @@ class FeatureEngineeringTransformer(BaseEstimator, TransformerMixin):
         df["area_per_bedroom"] = df["area_m2"] / (df["bedrooms"] + 1)
 
         # --- group districts
-        df["district_grouped"] = df["district_name"]
-        for city, valid_set in self.district_mapping.items():
-            mask = (df["city"] == city) & (~df["district_name"].isin(valid_set))
-            df.loc[mask, "district_grouped"] = "other"
+        df["district_grouped"] = self._group_districts(df)
 
         # --- city_district
         df["city_district"] = df["city"] + "_" + df["district_grouped"]
 
-        # --- median price per sqm
-        idx = list(zip(df["city"], df["district_grouped"]))
-        df["district_median_price_per_sqm"] = [self.median_mapping.get(k, self.global_median) for k in idx]
-        df["district_median_price_per_sqm"] = df["district_median_price_per_sqm"].round(1)
+        # --- median price per sqm and listing count (one MultiIndex lookup per mapping)
+        keys = pd.MultiIndex.from_arrays([df["city"], df["district_grouped"]])
 
-        # --- listing count
-        df["district_listing_count"] = [self.count_mapping.get(k, 0) for k in idx]
-        df["district_listing_count"] = np.log1p(df["district_listing_count"])
+        median_values = self.median_mapping.reindex(keys, fill_value=self.global_median).to_numpy()
+        df["district_median_price_per_sqm"] = np.round(median_values.astype(float), 1)
+
+        count_values = self.count_mapping.reindex(keys, fill_value=0).to_numpy()
+        df["district_listing_count"] = np.log1p(count_values.astype(float))
 
         # --- extract year/month
         df["upload_date"] = pd.to_datetime(df["upload_date"], errors="coerce")
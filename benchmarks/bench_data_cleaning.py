@@ -0,0 +1,256 @@
+"""
+Throughput of the DataCleaning normalizers: row-wise apply (legacy) vs vectorized string ops.
+
+Run from the project root:
+    python -m benchmarks.bench_data_cleaning
+"""
+import re
+import time
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from data_cleaning.DataCleaning import DataCleaning
+
+CURRENCY_RATE = 0.37
+
+
+class LegacyDataCleaning(DataCleaning):
+    """ Previous row-wise implementations, kept for comparison """
+    def _normalize_price(self):
+        def parse_price(value):
+            if pd.isna(value):
+                return pd.NA
+
+            price_str = str(value).lower().replace(",", "").strip()
+
+            try:
+                if "$" in price_str:
+                    number = round(float(price_str.replace("$", "").strip()), 2)
+                    return number if number > 0 else pd.NA
+
+                if "₾" in price_str:
+                    number = round(float(price_str.replace("₾", "").strip()), 2)
+                    return round(number * self.currency_rate, 2) if number > 0 else pd.NA
+
+                return round(float(price_str), 2) if round(float(price_str), 2) > 0 else pd.NA
+
+            except ValueError:
+                return pd.NA
+
+        self.apartments_df["price"] = (self.apartments_df["price"].apply(parse_price).astype("Float64"))
+
+    def _normalize_price_per_sqm(self):
+        def parse_row(row):
+            value = row.get("price_per_sqm")
+
+            if pd.notna(value):
+                text = str(value).lower().replace(",", "").strip()
+
+                match = re.search(r"\d+(?:\.\d+)?", text)
+                if match:
+                    amount = round(float(match.group()), 2)
+
+                    if "$" in text:
+                        return amount
+
+                    if "₾" in text:
+                        return round(amount * self.currency_rate, 2)
+
+            price = row.get("price")
+            area = row.get("area_m2")
+
+            if pd.notna(price) and pd.notna(area) and area > 0:
+                value = round(float(price) / float(area), 2)
+                return value if value > 0 else pd.NA
+
+            return pd.NA
+
+        self.apartments_df["price_per_sqm"] = (self.apartments_df.apply(parse_row, axis=1).astype("Float64"))
+
+
+    def _normalize_bedrooms(self):
+        def extract_bedrooms(value):
+            if pd.isna(value):
+                return pd.NA
+
+            text = str(value).lower()
+
+            match = re.search(r'\d+', text)
+            if match:
+                return int(match.group())
+
+            return pd.NA
+
+        def infer_bedrooms(area):
+            if pd.isna(area):
+                return pd.NA
+
+            if area <= 50:
+                return 1
+            elif area <= 100:
+                return 2
+            elif area <= 150:
+                return 3
+            elif area <= 175:
+                return 4
+            elif area <= 200:
+                return 5
+            elif area <= 225:
+                return 6
+            else:
+                return 7
+
+        self.apartments_df['bedrooms'] = self.apartments_df['bedrooms'].apply(extract_bedrooms).astype('Int64')
+
+        self.apartments_df['bedrooms'] = self.apartments_df.apply(
+            lambda row: (
+                infer_bedrooms(row['area_m2'])
+                if pd.isna(row['bedrooms'])
+                else row['bedrooms']
+            ),
+            axis=1
+        ).astype('Int64')
+
+    def _normalize_floor(self):
+        def extract_floor(value):
+            if pd.isna(value):
+                return pd.NA
+
+            text = str(value)
+            match = re.search(r'\d+', text)
+            if match:
+                return int(match.group())
+
+            return pd.NA
+
+        self.apartments_df['floor'] = self.apartments_df['floor'].apply(extract_floor).astype('Int64')
+
+    def _normalize_upload_date(self, now=None):
+        now = now or datetime.now()
+
+        def parse_date(value):
+            if pd.isna(value):
+                return pd.NA
+
+            # Already-normalized datetime (string or datetime)
+            parsed = pd.to_datetime(value, errors="coerce")
+            if pd.notna(parsed):
+                if parsed <= now:
+                    return parsed.floor("min")
+                else:
+                    # future timestamps are invalid → roll back one year
+                    return parsed.replace(year=parsed.year - 1).floor("min")
+
+            text = str(value).strip().lower()
+
+            try:
+                # Relative minutes: "1 წუთის წინ"
+                if 'წუთ' in text:
+                    minutes = int(re.search(r'\d+', text).group())
+                    return now - timedelta(minutes=minutes)
+
+                # Relative hours: "23 საათის წინ"
+                if 'საათ' in text:
+                    hours = int(re.search(r'\d+', text).group())
+                    return now - timedelta(hours=hours)
+
+                parts = text.replace(',', '').split()
+
+                # Full date with year: "01 იან 2026"
+                if len(parts) == 3 and parts[2].isdigit():
+                    day, geo_month, year = parts
+                    month = self.geo_months.get(geo_month[:3])
+                    if not month:
+                        return pd.NA
+                    return datetime(int(year), month, int(day), 12, 0)
+
+                # Date + time without year: "30 დეკ 12:02"
+                if len(parts) == 3 and ':' in parts[2]:
+                    day, geo_month, time_str = parts
+                    month = self.geo_months.get(geo_month[:3])
+                    if not month:
+                        return pd.NA
+
+                    hour, minute = map(int, time_str.split(':'))
+                    candidate = datetime(year=now.year, month=month, day=int(day), hour=hour, minute=minute)
+
+                    # Handles year rollover
+                    if candidate > now:
+                        candidate = candidate.replace(year=now.year - 1)
+
+                    return candidate
+
+            except Exception:
+                return pd.NA
+
+            return pd.NA
+
+        self.apartments_df['upload_date'] = (
+            self.apartments_df['upload_date']
+            .apply(parse_date).astype('datetime64[ns]').dt.floor('min')
+        )
+
+
+def make_raw_apartments(n_rows, seed=42):
+    """ Synthetic raw scraper output with the formats seen on the three websites """
+    rng = np.random.default_rng(seed)
+
+    amounts = rng.integers(300, 500_000, n_rows)
+    price_formats = np.array(["{:,} $", "{:,}$", "{:,} ₾", "{}", "ფასი შეთანხმებით"])
+    price = [fmt.format(amount) for fmt, amount in zip(rng.choice(price_formats, n_rows), amounts)]
+
+    sqm_formats = np.array(["{:,} $ /მ2", "{:,}/მ² ₾", "{:,}/მ² $", ""])
+    price_per_sqm = [fmt.format(amount // 60) or None for fmt, amount in zip(rng.choice(sqm_formats, n_rows), amounts)]
+
+    return pd.DataFrame({
+        "price": price,
+        "price_per_sqm": price_per_sqm,
+        "area_m2": rng.uniform(20, 260, n_rows).round(1),
+        "bedrooms": rng.choice(np.array(["საძ. 1", "საძ2", "3", None, "unknown"], dtype=object), n_rows),
+        "floor": rng.choice(np.array(["სართ. 3", "8/11", "5", None, "-"], dtype=object), n_rows),
+        "upload_date": make_upload_dates(rng, n_rows),
+    })
+
+
+def make_upload_dates(rng, n_rows):
+    """ Mix of relative, Georgian and already normalized upload dates """
+    relative = np.array([f"{n} წუთის წინ" for n in range(1, 60)] + [f"{n} საათის წინ" for n in range(1, 24)])
+    months = np.array(["იან", "თებ", "მარ", "აპრ", "მაი", "ივნ", "ივლ", "აგვ", "სექ", "ოქტ", "ნოე", "დეკ"])
+    days = rng.integers(1, 29, n_rows)
+    month = rng.choice(months, n_rows)
+    iso = pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 365 * 24 * 60, n_rows), unit="min")
+
+    formats = rng.integers(0, 4, n_rows)
+    return np.select(
+        [formats == 0, formats == 1, formats == 2],
+        [
+            rng.choice(relative, n_rows),
+            [f"{d:02d} {m} 2025" for d, m in zip(days, month)],
+            [f"{d:02d} {m}, {h:02d}:{mi:02d}" for d, m, h, mi in zip(days, month, rng.integers(0, 24, n_rows), rng.integers(0, 60, n_rows))],
+        ],
+        iso.strftime("%Y-%m-%d %H:%M:%S"),
+    ).astype(object)
+
+
+def rows_per_second(cleaning_class, method_names, df):
+    cleaner = cleaning_class(df.copy(), currency_rate=CURRENCY_RATE)
+    start = time.perf_counter()
+    for method_name in method_names:
+        getattr(cleaner, method_name)()
+    return len(df) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    benchmarks = {
+        "price + price_per_sqm": ["_normalize_price", "_normalize_price_per_sqm"],
+        "bedrooms + floor": ["_normalize_bedrooms", "_normalize_floor"],
+        "upload_date": ["_normalize_upload_date"],
+    }
+
+    for n_rows in [10_000, 1_000_000]:
+        df = make_raw_apartments(n_rows)
+        for name, method_names in benchmarks.items():
+            legacy_rps = rows_per_second(LegacyDataCleaning, method_names, df)
+            vectorized_rps = rows_per_second(DataCleaning, method_names, df)
+            print(f"{name:<24} {n_rows:>10,} rows | legacy {legacy_rps:>12,.0f} rows/s | "
+                  f"vectorized {vectorized_rps:>12,.0f} rows/s | {vectorized_rps / legacy_rps:>5.1f}x")
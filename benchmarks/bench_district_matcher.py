@@ -0,0 +1,95 @@
+"""
+District extraction throughput: per-row variant scans (legacy) vs the compiled DistrictMatcher,
+using the real variant maps from datastorage/extra_data.
+
+Run from the project root:
+    python -m benchmarks.bench_district_matcher
+"""
+import json
+import time
+import numpy as np
+import pandas as pd
+from config import paths
+from data_cleaning.utils.DistrictMatcher import DistrictMatcher
+
+
+def legacy_extract_district(description, tbilisi_districts):
+    """ Previous NormalizeDistricts.normalize_tbilisi_districts.extract_district """
+    if not isinstance(description, str):
+        return None
+    for variant in sorted(tbilisi_districts, key=len, reverse=True):
+        if variant in description:
+            return tbilisi_districts[variant]
+    return None
+
+
+def legacy_extract_district_from_street(street_address, district_names):
+    """ Previous NormalizeDistricts.__extract_district_from_street """
+    if not isinstance(street_address, str):
+        return None
+
+    for district in district_names:
+        if district in street_address:
+            return district
+
+    return None
+
+
+def make_descriptions(variants, n_rows, seed=42):
+    """ Listing-like descriptions, about two thirds of them mention a district variant """
+    rng = np.random.default_rng(seed)
+    filler = np.array(["იყიდება", "ბინა", "ახალ აშენებულ", "კორპუსში", "რემონტით", "ქირავდება", "თვიურად", "მ²"])
+    variants = np.array(list(variants) + [""] * (len(variants) // 2))
+
+    return pd.Series([
+        " ".join([*rng.choice(filler, 6), variant, *rng.choice(filler, 4), f"{rng.integers(1, 400)} $"])
+        for variant in rng.choice(variants, n_rows)
+    ])
+
+
+def make_street_addresses(city_map, n_rows, seed=42):
+    """ Street addresses drawn from the real street map with house numbers; popular streets repeat a lot """
+    rng = np.random.default_rng(seed)
+    streets = np.array(list(city_map) + list(dict.fromkeys(city_map.values())))
+    weights = 1 / np.arange(1, len(streets) + 1)
+
+    return pd.Series([
+        f"{street} {number}" if number else street
+        for street, number in zip(rng.choice(streets, n_rows, p=weights / weights.sum()), rng.integers(0, 40, n_rows))
+    ])
+
+
+def rows_per_second(extract, texts):
+    start = time.perf_counter()
+    extract(texts)
+    return len(texts) / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    with open(paths.TBILISI_CANONICAL_DISTRICTS_PATH, "r", encoding="utf-8") as f:
+        tbilisi_districts = json.load(f)
+    with open(paths.STREET_TO_DISTRICT_JSON_PATH, "r", encoding="utf-8") as f:
+        kutaisi_streets = json.load(f)["ქუთაისი"]
+    kutaisi_districts = list(dict.fromkeys(kutaisi_streets.values()))
+
+    cases = {
+        "tbilisi descriptions": (
+            tbilisi_districts,
+            lambda n_rows: make_descriptions(tbilisi_districts, n_rows),
+            lambda texts: texts.apply(legacy_extract_district, args=(tbilisi_districts,)),
+        ),
+        "kutaisi streets": (
+            kutaisi_districts,
+            lambda n_rows: make_street_addresses(kutaisi_streets, n_rows),
+            lambda texts: texts.apply(legacy_extract_district_from_street, args=(set(kutaisi_districts),)),
+        ),
+    }
+
+    for name, (variants, make_texts, legacy) in cases.items():
+        matcher = DistrictMatcher(variants)
+        for n_rows in [10_000, 200_000]:
+            texts = make_texts(n_rows)
+            legacy_rps = rows_per_second(legacy, texts)
+            matcher_rps = rows_per_second(matcher.find_series, texts)
+            print(f"{name:<22} {n_rows:>8,} rows | legacy {legacy_rps:>10,.0f} rows/s | "
+                  f"matcher {matcher_rps:>10,.0f} rows/s | {matcher_rps / legacy_rps:>5.1f}x")
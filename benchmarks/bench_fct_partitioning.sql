@@ -0,0 +1,85 @@
+-- =====================================
+-- bench_fct_partitioning.sql
+-- =====================================
+
+-- Heap vs monthly range-partitioned fact table on synthetic data, for a "last 90 days" query (TimeAnalysis,
+-- retraining windows). Self-contained: everything lives in a scratch schema that is dropped at the end.
+--
+--   psql "$DATABASE_URL" -f benchmarks/bench_fct_partitioning.sql
+--
+-- Compare the two EXPLAIN outputs: the partitioned plan only lists the last 3-4 monthly partitions
+-- ("Subplans Removed" / pruned partitions) and reads far fewer buffers than the heap scan.
+
+\set rows 5000000
+\set months 36
+
+DROP SCHEMA IF EXISTS bench_fct CASCADE;
+CREATE SCHEMA bench_fct;
+
+SELECT setseed(0.42);
+
+-- Synthetic facts spread uniformly over the last :months months
+CREATE TABLE bench_fct.source AS
+SELECT
+    i                                                                   AS apartment_fct_surr_id,
+    (random() * 1)::BIGINT + 1                                          AS transaction_type_surr_id,
+    (random() * 9)::BIGINT + 1                                          AS city_surr_id,
+    (random() * 200)::BIGINT + 1                                        AS district_surr_id,
+    i                                                                   AS apartment_surr_id,
+    date_trunc('minute', now() - random() * (:months * INTERVAL '1 month'))::TIMESTAMP AS upload_ts,
+    round((20000 + random() * 300000)::NUMERIC, 2)                      AS price,
+    round((20 + random() * 200)::NUMERIC, 2)                            AS area_m2
+FROM generate_series(1, :rows) AS i;
+
+-- Unpartitioned heap, same secondary index as before the migration
+CREATE TABLE bench_fct.fct_heap AS
+SELECT * FROM bench_fct.source ORDER BY apartment_fct_surr_id;
+
+CREATE INDEX ON bench_fct.fct_heap (transaction_type_surr_id, city_surr_id);
+
+-- Monthly partitions with the indexes of 01_DDL.sql
+CREATE TABLE bench_fct.fct_partitioned (LIKE bench_fct.source) PARTITION BY RANGE (upload_ts);
+CREATE TABLE bench_fct.fct_partitioned_default PARTITION OF bench_fct.fct_partitioned DEFAULT;
+
+DO $$
+DECLARE
+    month_start TIMESTAMP;
+BEGIN
+    FOR month_start IN
+        SELECT DISTINCT date_trunc('month', upload_ts) FROM bench_fct.source
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE bench_fct.%I PARTITION OF bench_fct.fct_partitioned FOR VALUES FROM (%L) TO (%L)',
+            'fct_partitioned_' || to_char(month_start, 'YYYY_MM'), month_start, month_start + INTERVAL '1 month'
+        );
+    END LOOP;
+END;
+$$;
+
+-- Rows arrive in upload order, as with the nightly ETL
+INSERT INTO bench_fct.fct_partitioned SELECT * FROM bench_fct.source ORDER BY upload_ts;
+
+CREATE INDEX ON bench_fct.fct_partitioned USING BRIN (upload_ts);
+CREATE INDEX ON bench_fct.fct_partitioned (transaction_type_surr_id, city_surr_id);
+
+VACUUM ANALYZE bench_fct.fct_heap;
+VACUUM ANALYZE bench_fct.fct_partitioned;
+
+-- Last 90 days of sale listings, count and average price per sqm per city
+\echo '=== heap ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT city_surr_id, COUNT(*), AVG(price / area_m2)
+FROM bench_fct.fct_heap
+WHERE upload_ts >= now() - INTERVAL '90 days'
+  AND transaction_type_surr_id = 1
+GROUP BY city_surr_id;
+
+\echo '=== partitioned ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT city_surr_id, COUNT(*), AVG(price / area_m2)
+FROM bench_fct.fct_partitioned
+WHERE upload_ts >= now() - INTERVAL '90 days'
+  AND transaction_type_surr_id = 1
+GROUP BY city_surr_id;
+
+DROP SCHEMA bench_fct CASCADE;
@@ -0,0 +1,117 @@
+"""
+Row throughput of FeatureEngineeringTransformer.transform: per-row lookups (legacy) vs MultiIndex lookups.
+
+Run from the project root:
+    python -m benchmarks.bench_feature_engineering_transform
+"""
+import time
+import numpy as np
+import pandas as pd
+from backend.machine_learning.pipeline.FeatureEngineeringTransformer import FeatureEngineeringTransformer
+
+
+class LegacyFeatureEngineeringTransformer(FeatureEngineeringTransformer):
+    """ Previous transform implementation (per-city masks and per-row Series.get), kept for comparison """
+    def transform(self, X):
+        df = X.copy()
+
+        # --- floor buckets
+        df["floor_bucket"] = pd.cut(
+            df["floor"],
+            bins=[-1, 2, 5, 10, 100],
+            labels=["low", "mid", "high", "very_high"],
+            right=False
+        ).astype(str)
+
+        # --- area buckets
+        df["area_bucket"] = pd.cut(
+            df["area_m2"],
+            bins=[0, 35, 60, 90, 130, float("inf")],
+            labels=["studio", "small", "medium", "large", "very_large"],
+            right=False
+        ).astype(str)
+
+        # --- area per bedroom
+        df["area_per_bedroom"] = df["area_m2"] / (df["bedrooms"] + 1)
+
+        # --- group districts
+        df["district_grouped"] = df["district_name"]
+        for city, valid_set in self.district_mapping.items():
+            mask = (df["city"] == city) & (~df["district_name"].isin(valid_set))
+            df.loc[mask, "district_grouped"] = "other"
+
+        # --- city_district
+        df["city_district"] = df["city"] + "_" + df["district_grouped"]
+
+        # --- median price per sqm
+        idx = list(zip(df["city"], df["district_grouped"]))
+        df["district_median_price_per_sqm"] = [self.median_mapping.get(k, self.global_median) for k in idx]
+        df["district_median_price_per_sqm"] = df["district_median_price_per_sqm"].round(1)
+
+        # --- listing count
+        df["district_listing_count"] = [self.count_mapping.get(k, 0) for k in idx]
+        df["district_listing_count"] = np.log1p(df["district_listing_count"])
+
+        # --- extract year/month
+        df["upload_date"] = pd.to_datetime(df["upload_date"], errors="coerce")
+        df["upload_year"] = df["upload_date"].dt.year - self.min_year
+        df["upload_month"] = df["upload_date"].dt.month
+
+        # --- drop unused
+        DROP_ALWAYS = {
+            "url",
+            "description",
+            "street_address",
+            "source",
+            "upload_date",
+            "price_per_sqm",
+            "district_name",
+            "transaction_type"
+        }
+
+        df.drop(columns=DROP_ALWAYS, errors="ignore", inplace=True)
+
+        return df
+
+
+def make_apartments(n_rows, seed=42):
+    """ Synthetic apartments with a realistic number of cities and districts """
+    rng = np.random.default_rng(seed)
+    cities = np.array(["თბილისი", "ბათუმი", "ქუთაისი"])
+    districts = np.array([f"district_{i}" for i in range(60)])
+    district_weights = np.linspace(2, 0.1, len(districts))  # a few large districts and a long tail
+
+    area = rng.uniform(20, 200, n_rows).round(1)
+    price = (area * rng.uniform(500, 2500, n_rows)).round(2)
+
+    return pd.DataFrame({
+        "city": rng.choice(cities, n_rows, p=[0.6, 0.3, 0.1]),
+        "district_name": rng.choice(districts, n_rows, p=district_weights / district_weights.sum()),
+        "area_m2": area,
+        "bedrooms": rng.integers(1, 6, n_rows),
+        "floor": rng.integers(1, 30, n_rows),
+        "price_per_sqm": (price / area).round(2),
+        "upload_date": pd.Timestamp("2025-07-01") + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D"),
+    })
+
+
+def rows_per_second(transformer, df, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transformer.transform(df)
+        best = min(best, time.perf_counter() - start)
+    return len(df) / best
+
+
+if __name__ == "__main__":
+    train_df = make_apartments(200_000)
+    vectorized = FeatureEngineeringTransformer().fit(train_df)
+    legacy = LegacyFeatureEngineeringTransformer().fit(train_df)
+
+    print(f"{'rows':>10} | {'legacy rows/s':>15} | {'vectorized rows/s':>18} | {'speedup':>8}")
+    for n_rows in [1_000, 100_000, 1_000_000]:
+        df = make_apartments(n_rows, seed=n_rows)
+        legacy_rps = rows_per_second(legacy, df, repeat=1 if n_rows >= 1_000_000 else 3)
+        vectorized_rps = rows_per_second(vectorized, df)
+        print(f"{n_rows:>10,} | {legacy_rps:>15,.0f} | {vectorized_rps:>18,.0f} | {vectorized_rps / legacy_rps:>7.1f}x")
@@ -13,29 +13,50 @@ PROCESSED_DATA_DIR = DATA_DIR / "processed"
 LIVO_APARTMENTS_RAW_PATH = RAW_DATA_DIR / "livo_apartments.csv"
 MYHOME_APARTMENTS_RAW_PATH = RAW_DATA_DIR / "myhome_apartments.csv"
 SSHOME_APARTMENTS_RAW_PATH = RAW_DATA_DIR / "sshome_apartments.csv"
-ALL_RAW_DATA_PATH = RAW_DATA_DIR / "all_data.csv"
+ALL_RAW_DATA_PATH = RAW_DATA_DIR / "all_data.csv"  # legacy combined raw CSV, imported once into the raw store
+
+# Partitioned Parquet raw store (scrape_date / source) and its URL → latest partition index
+RAW_STORE_DIR = RAW_DATA_DIR / "store"
+RAW_STORE_URL_INDEX_PATH = RAW_STORE_DIR / "url_index.parquet"
+
+# Listing URLs that were already scraped (one per line), used for incremental scraping
+SEEN_URLS_PATH = RAW_DATA_DIR / "seen_urls.txt"
 
 # Canonical cleaned CSV
 APARTMENTS_PROCESSED_PATH = PROCESSED_DATA_DIR / "apartments.csv"
 
+# Derived lookup tables cached between runs (safe to delete, rebuilt on demand)
+CACHE_DIR = DATA_DIR / "cache"
+STREET_MAPS_CACHE_PATH = CACHE_DIR / "street_to_district_normalized.json"
+
 """ ====================== Data storage (serving layer) """
 DATASTORAGE_DIR = PROJECT_ROOT / "datastorage"
 
 CSV_STORAGE_DIR = DATASTORAGE_DIR / "csv"
 POSTGRESQL_DIR = DATASTORAGE_DIR / "postgresql"
+DUCKDB_DIR = DATASTORAGE_DIR / "duckdb"
 
 STREET_TO_DISTRICT_JSON_PATH = DATASTORAGE_DIR / "extra_data" / "street_to_district.json"
 TBILISI_CANONICAL_DISTRICTS_PATH = DATASTORAGE_DIR / "extra_data" / "tbilisi_canonical_districts.json"
 
 # Stored CSV (historical / merged) and backups
 APARTMENTS_CSV_PATH = CSV_STORAGE_DIR / "apartments.csv"
+APARTMENTS_CSV_URL_INDEX_PATH = CSV_STORAGE_DIR / "apartments.url_index.npz"  # url / row hashes per CSV row
 APARTMENTS_CSV_BACKUPS_DIR = CSV_STORAGE_DIR / "backups"
 
 # POSTGRESQL scripts directory
 POSTGRESQL_SCRIPTS_DIR = POSTGRESQL_DIR / "sql"
 
 #POSGRESQL script files
+DML_INIT_DIMENSIONS_03_PATH = POSTGRESQL_SCRIPTS_DIR / "03_DML_INIT_DIMENSIONS.sql"
 DML_ETL_FROM_STAGING_04_PATH = POSTGRESQL_SCRIPTS_DIR / "04_DML_ETL_FROM_STAGING.sql"
+VIEWS_07_PATH = POSTGRESQL_SCRIPTS_DIR / "07_VIEWS.sql"
+
+# Local DuckDB warehouse (settings.STORAGE_BACKEND = "duckdb"), same star schema and views as PostgreSQL
+DUCKDB_DATABASE_PATH = DUCKDB_DIR / "apartments.duckdb"
+DUCKDB_SCRIPTS_DIR = DUCKDB_DIR / "sql"
+DUCKDB_DDL_01_PATH = DUCKDB_SCRIPTS_DIR / "01_DDL.sql"
+DUCKDB_DML_ETL_FROM_STAGING_04_PATH = DUCKDB_SCRIPTS_DIR / "04_DML_ETL_FROM_STAGING.sql"
 
 """ ====================== Backend """
 BACKEND_DIR = PROJECT_ROOT / "backend"
@@ -0,0 +1,102 @@
+# config/schema.py
+import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+
+""" ====================== Apartment columns (single definition for every CSV reader / writer) """
+NA_REP = "<NA>"  # missing value marker written by DataCleaning.write_to_csv
+NA_VALUES = ["", NA_REP, "NA", "N/A", "NaN", "nan", "None", "null"]  # read as missing (pandas' usual markers)
+
+# Raw scraper output (scrapers/BaseScraper.headers): scraped text, parsed later by DataCleaning
+RAW_COLUMNS = [
+    "url", "city", "price", "price_per_sqm", "description", "district_name",
+    "street_address", "area_m2", "bedrooms", "floor", "upload_date"
+]
+RAW_DTYPES = {column: "string[pyarrow]" for column in RAW_COLUMNS}
+
+# Cleaned apartments (new_data/processed/apartments.csv and datastorage/csv/apartments.csv)
+PROCESSED_DTYPES = {
+    "url": "string[pyarrow]",
+    "city": "category",
+    "price": "Float64",
+    "price_per_sqm": "Float64",
+    "description": "string[pyarrow]",
+    "district_name": "category",
+    "street_address": "string[pyarrow]",
+    "area_m2": "Float64",
+    "bedrooms": "Int64",
+    "floor": "Int64",
+    "upload_date": "datetime64[ns]",
+    "transaction_type": "category",
+    "source": "category",
+}
+PROCESSED_COLUMNS = list(PROCESSED_DTYPES)
+PROCESSED_DATE_COLUMNS = ["upload_date"]
+
+# Columns read by EDA and model training: the long url / description texts and the source are never used there
+ANALYSIS_COLUMNS = [column for column in PROCESSED_COLUMNS if column not in ("url", "description", "source")]
+
+# Arrow type parsed from the file for each pandas dtype (integers may be written as "2.0" by older files)
+ARROW_TYPES = {
+    "string[pyarrow]": pa.string(),
+    "category": pa.string(),
+    "Float64": pa.float64(),
+    "Int64": pa.float64(),
+}
+
+
+def _csv_options(dtypes, date_columns=()):
+    """ pyarrow parse / convert options declaring the type of every known column """
+    parse_options = pa_csv.ParseOptions(newlines_in_values=True)  # descriptions contain quoted newlines
+    convert_options = pa_csv.ConvertOptions(
+        column_types={
+            column: pa.timestamp("ns") if column in date_columns else ARROW_TYPES[dtype]
+            for column, dtype in dtypes.items()
+        },
+        null_values=NA_VALUES,
+        strings_can_be_null=True,
+    )
+    return parse_options, convert_options
+
+
+def _read_csv(path, dtypes, date_columns=()):
+    """
+    Reads a CSV with the pyarrow parser, declaring the type of every known column.
+    pandas' engine="pyarrow" does not enable quoted newlines, so pyarrow is used directly.
+    """
+    parse_options, convert_options = _csv_options(dtypes, date_columns)
+    table = pa_csv.read_csv(path, parse_options=parse_options, convert_options=convert_options)
+    return apply_dtypes(table.to_pandas(), dtypes)
+
+
+def apply_dtypes(df, dtypes):
+    """ Casts the known columns of df to their schema dtype, e.g. after a concat mixed the categories """
+    return df.astype({column: dtype for column, dtype in dtypes.items() if column in df.columns})
+
+
+def read_raw_csv(path):
+    """ Reads a raw scraper CSV, every known column as text """
+    return _read_csv(path, RAW_DTYPES)
+
+
+def read_processed_csv(path):
+    """ Reads a cleaned apartments CSV with typed columns """
+    return _read_csv(path, PROCESSED_DTYPES, PROCESSED_DATE_COLUMNS)
+
+
+def iter_processed_csv(path, block_size=16 << 20):
+    """ Streams a cleaned apartments CSV as typed DataFrames of about block_size bytes each """
+    parse_options, convert_options = _csv_options(PROCESSED_DTYPES, PROCESSED_DATE_COLUMNS)
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        parse_options=parse_options,
+        convert_options=convert_options,
+    )
+    for batch in reader:
+        yield apply_dtypes(batch.to_pandas(), PROCESSED_DTYPES)
+
+
+def write_processed_csv(df, path, mode="w"):
+    """ Writes (mode="w") or appends without a header (mode="a") a cleaned apartments CSV readable by read_processed_csv """
+    df.to_csv(path, index=False, na_rep=NA_REP, mode=mode, header=mode == "w")
@@ -5,3 +5,11 @@ import os
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "postgresql")  # "postgresql" or "duckdb" (local file, no server)
+
+# PostgreSQL connection pool (one engine per process, shared by every PostgresDatabase)
+POSTGRES_POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", 5))
+POSTGRES_MAX_OVERFLOW = int(os.getenv("POSTGRES_MAX_OVERFLOW", 5))
+POSTGRES_POOL_TIMEOUT_S = int(os.getenv("POSTGRES_POOL_TIMEOUT_S", 30))  # wait for a free connection
+POSTGRES_POOL_RECYCLE_S = int(os.getenv("POSTGRES_POOL_RECYCLE_S", 1800))  # reconnect connections older than this
+POSTGRES_STATEMENT_TIMEOUT_MS = int(os.getenv("POSTGRES_STATEMENT_TIMEOUT_MS", 600_000))  # 0 disables, lifted for the load (COPY / ETL / view refresh)
@@ -0,0 +1,146 @@
+from functools import cached_property
+import numpy as np
+import pandas as pd
+
+
+
+class Aggregates:
+    """
+    Grouped statistics shared by all EDA chart classes, built once from the preprocessed sale and rent frames.
+    Every table is computed by a single groupby pass per transaction type on first access and memoized, so the
+    charts only look up their city / district / bedroom / month rows instead of filtering the full frames again.
+    Tables are keyed by transaction title: "Sale" or "Rent". Per group values are taken by the row positions of
+    the group, no sub-frames are materialized.
+    """
+    FLOOR_BUCKETS = ["1–2", "3–5", "6–9", "10–15", "16+"]
+    FLOOR_BINS = [-np.inf, 2, 5, 9, 15, np.inf]
+    MONTHLY_FEATURES = ["price", "price_per_sqm"]
+
+    def __init__(self, sale_df, rent_df):
+        self.frames = {"Sale": sale_df, "Rent": rent_df}
+
+    @staticmethod
+    def __positions(df, keys):
+        """ {group key: row positions of the group} in one pass over df """
+        return df.groupby(keys, observed=True, sort=False).indices
+
+    def __values(self, title, positions, column):
+        """ Column values at the given row positions (empty when the group does not exist) """
+        values = self.frames[title][column].to_numpy()
+        return values[positions] if positions is not None else values[:0]
+
+    @cached_property
+    def city_positions(self):
+        """ {title: {city: row positions}} """
+        return {title: self.__positions(df, "city") for title, df in self.frames.items()}
+
+    def city_values(self, title, city, column):
+        """ Values of a column for the listings of one city """
+        return self.__values(title, self.city_positions[title].get(city), column)
+
+    @cached_property
+    def city_stats(self):
+        """ {title: DataFrame indexed by city with the listings count and median price} """
+        return {
+            title: df.groupby("city", observed=True)["price"].agg(count="size", median_price="median")
+            for title, df in self.frames.items()
+        }
+
+    @cached_property
+    def city_counts(self):
+        """ Listings per city over both transaction types, highest first """
+        counts = pd.concat([stats["count"] for stats in self.city_stats.values()])
+        return counts.groupby(level=0).sum().sort_values(ascending=False, kind="stable")
+
+    @cached_property
+    def district_counts(self):
+        """ {title: listings per (city, district_name), districts in order of first appearance like value_counts} """
+        return {
+            title: df.groupby(["city", "district_name"], observed=True, sort=False).size()
+            for title, df in self.frames.items()
+        }
+
+    def top_districts(self, title, city, n):
+        """ Listings of the n largest districts of a city, highest first (same order as value_counts().nlargest(n)) """
+        counts = self.district_counts[title]
+        if city not in counts.index.get_level_values("city"):
+            return counts.iloc[:0].droplevel("city")
+        return counts.xs(city, level="city").sort_values(ascending=False, kind="stable").nlargest(n)
+
+    @cached_property
+    def district_positions(self):
+        """ {title: {(city, district_name): row positions}} """
+        return {title: self.__positions(df, ["city", "district_name"]) for title, df in self.frames.items()}
+
+    def district_values(self, title, city, district, column):
+        """ Values of a column for the listings of one district """
+        return self.__values(title, self.district_positions[title].get((city, district)), column)
+
+    @cached_property
+    def bedroom_prices(self):
+        """ {title: {bedrooms: price values}} """
+        return {
+            title: {bedrooms: group.values for bedrooms, group in df.groupby("bedrooms", observed=True)["price"]}
+            for title, df in self.frames.items()
+        }
+
+    @cached_property
+    def floor_bucket_counts(self):
+        """ Listings per city (rows) and floor bucket (columns) over both transaction types.
+            Unknown floors are counted as "16+", like the former per-row bucketing (every comparison with NaN is False)
+        """
+        counts = []
+        for df in self.frames.values():
+            buckets = pd.cut(df["floor"], bins=self.FLOOR_BINS, labels=self.FLOOR_BUCKETS).fillna(self.FLOOR_BUCKETS[-1])
+            counts.append(df.groupby([df["city"], buckets], observed=True).size())
+
+        return (
+            pd.concat(counts).groupby(level=[0, 1]).sum()
+            .unstack(fill_value=0).reindex(columns=self.FLOOR_BUCKETS, fill_value=0)
+        )
+
+    @cached_property
+    def monthly_frames(self):
+        """ {title: city, MONTHLY_FEATURES and the upload month (first day, datetime64) of the rows with a valid upload date} """
+        monthly = {}
+        for title, df in self.frames.items():
+            upload_date = pd.to_datetime(df["upload_date"], errors="coerce")
+            dated = upload_date.notna().to_numpy()
+
+            df = df.loc[dated, ["city", *self.MONTHLY_FEATURES]]
+            monthly[title] = df.assign(year_month=upload_date.to_numpy()[dated].astype("datetime64[M]").astype("datetime64[ns]"))
+        return monthly
+
+    @cached_property
+    def monthly_counts(self):
+        """ {title: listings per month (Timestamp index), None when there are no dated listings} """
+        counts = {}
+        for title, df in self.monthly_frames.items():
+            monthly = df.groupby("year_month").size().sort_index()
+            counts[title] = monthly if not monthly.empty else None
+        return counts
+
+    @cached_property
+    def monthly_city_stats(self):
+        """
+        {(title, feature): (listings, {city: (city listings, monthly median Series with a Timestamp index)})}
+        for every feature in MONTHLY_FEATURES, only over the rows with a known city and a positive feature value
+        """
+        stats = {}
+        for title, df in self.monthly_frames.items():
+            df = df[df["city"].notna()]
+
+            # Non-positive values masked out, so one grouped pass gives the medians of every feature
+            features = df[self.MONTHLY_FEATURES]
+            features = features.where(features > 0)
+            keys = [df["city"], df["year_month"]]
+            medians = features.groupby(keys, observed=True).median().sort_index()
+            sizes = features.notna().groupby(df["city"], observed=True).sum()
+
+            for feature in self.MONTHLY_FEATURES:
+                per_city = {}
+                for city, city_medians in medians[feature].dropna().groupby(level=0, observed=True):
+                    per_city[city] = (int(sizes.at[city, feature]), city_medians.droplevel(0))
+
+                stats[(title, feature)] = (int(sizes[feature].sum()), per_city)
+        return stats
@@ -1,4 +1,5 @@
 from data_analysis.EDA.DataAnalysis import DataAnalysis
+from data_analysis.EDA.Aggregates import Aggregates
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -6,13 +7,14 @@ import numpy as np
 
 class ApartmentCharacteristics(DataAnalysis):
     """Apartment Characteristics class used to generate area histograms, bedrooms box plots and floor bar charts."""
-    def __init__(self, sale_df, rent_df, combined_df):
+    def __init__(self, sale_df, rent_df, combined_df, aggregates=None):
         super().__init__()
         self.inner_dir = self.output_dir / "apartment_characteristics"
         self.inner_dir.mkdir(parents=True, exist_ok=True)
         self.sale_df = sale_df
         self.rent_df = rent_df
         self.df = combined_df
+        self.aggregates = aggregates or Aggregates(sale_df, rent_df)
 
     def area_distribution_histogram_generate(self, df, title):
         """
@@ -49,12 +51,11 @@ class ApartmentCharacteristics(DataAnalysis):
 
         self.save_fig(fig, histogram_dir / f"area_{title.lower()}.png")
 
-    def bedrooms_vs_price_boxplot_generate(self, df, title):
+    def bedrooms_vs_price_boxplot_generate(self, title):
         """
         Generates boxplot of price by number of bedrooms.
 
         Parameters:
-        - df: filtered dataframe (sale_df or rent_df)
         - title: "Sale" or "Rent"
         """
         boxplot_dir = self.inner_dir / "bedrooms_vs_price_boxplot"
@@ -63,8 +64,10 @@ class ApartmentCharacteristics(DataAnalysis):
         bedroom_groups = []
         bedroom_labels = []
 
+        bedroom_prices = self.aggregates.bedroom_prices[title]
+
         for bedrooms in range(1, 11):
-            prices = df[df["bedrooms"] == bedrooms]["price"].values
+            prices = bedroom_prices.get(bedrooms, [])
 
             if len(prices) < 10:
                 continue
@@ -81,7 +84,7 @@ class ApartmentCharacteristics(DataAnalysis):
             patch.set_alpha(0.6)
 
         # Title + subtitle
-        ax.set_title(f"{title} Price by Number of Bedrooms\nListings: {len(df):,}", **self.styles["title"])
+        ax.set_title(f"{title} Price by Number of Bedrooms\nListings: {len(self.aggregates.frames[title]):,}", **self.styles["title"])
 
         # Axis labels
         ax.set_xlabel("Bedrooms", **self.styles["axis_title"])
@@ -94,37 +97,14 @@ class ApartmentCharacteristics(DataAnalysis):
         self.save_fig(fig, boxplot_dir / f"{title.lower()}.png")
 
     def floor_distribution_bar_chart_generate(self):
-        """
-        Generates floor distribution bar charts (bucketed) per city.
-
-        Parameters:
-        - df: filtered dataframe (sale_df / rent_df / combined)
-        - title: optional (e.g. "Sale", "Rent", or "All")
-        """
+        """ Generates floor distribution bar charts (buckets 1–2, 3–5, 6–9, 10–15, 16+) per city, sale and rent combined. """
         floor_dir = self.inner_dir / "floor_bar_charts"
         floor_dir.mkdir(parents=True, exist_ok=True)
 
-        df = self.df.copy()
-
-        # Floor bucket helper (local)
-        def bucket_floor(floor):
-            if floor <= 2:
-                return "1–2"
-            elif floor <= 5:
-                return "3–5"
-            elif floor <= 9:
-                return "6–9"
-            elif floor <= 15:
-                return "10–15"
-            else:
-                return "16+"
-
-        df["floor_bucket"] = df["floor"].apply(bucket_floor)
-        bucket_order = ["1–2", "3–5", "6–9", "10–15", "16+"]
+        bucket_counts = self.aggregates.floor_bucket_counts
 
         for city in self.cities:
-            city_df = df[df["city"] == city]
-            counts = (city_df["floor_bucket"].value_counts().reindex(bucket_order, fill_value=0))
+            counts = bucket_counts.reindex([city], fill_value=0).loc[city]
             fig, ax = plt.subplots(figsize=self.figsize)
 
             color = self.city_colors.get(city, "#CCCCCC")
@@ -157,8 +137,8 @@ class ApartmentCharacteristics(DataAnalysis):
         self.area_distribution_histogram_generate(self.rent_df, "Rent")
 
         # Bedrooms box plots
-        self.bedrooms_vs_price_boxplot_generate(self.sale_df, "Sale")
-        self.bedrooms_vs_price_boxplot_generate(self.rent_df, "Rent")
+        self.bedrooms_vs_price_boxplot_generate("Sale")
+        self.bedrooms_vs_price_boxplot_generate("Rent")
 
         # Floor Distribution
         self.floor_distribution_bar_chart_generate()
@@ -1,4 +1,5 @@
 from data_analysis.EDA.DataAnalysis import DataAnalysis
+from data_analysis.EDA.Aggregates import Aggregates
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -6,13 +7,14 @@ import numpy as np
 
 class LocationInsights(DataAnalysis):
     """ Location Insights class used to generate district bar charts by listings and top district box plots """
-    def __init__(self, sale_df, rent_df, combined_df):
+    def __init__(self, sale_df, rent_df, combined_df, aggregates=None):
         super().__init__()
         self.inner_dir = self.output_dir / "location_insights"
         self.inner_dir.mkdir(parents=True, exist_ok=True)
         self.sale_df = sale_df
         self.rent_df = rent_df
         self.df = combined_df
+        self.aggregates = aggregates or Aggregates(sale_df, rent_df)
 
     def listings_by_district_bar_chart_generate(self):
         """
@@ -25,16 +27,10 @@ class LocationInsights(DataAnalysis):
         district_dir = self.inner_dir / "districts_bar_charts"
         district_dir.mkdir(parents=True, exist_ok=True)
 
-        sale_df = self.sale_df.copy()
-        rent_df = self.rent_df.copy()
-
         for city in self.cities:
-            sale_df_copy = sale_df[sale_df["city"] == city]
-            rent_df_copy = rent_df[rent_df["city"] == city]
-
             # Top 10 districts (highest first)
-            sale_counts = sale_df_copy["district_name"].value_counts().nlargest(10)
-            rent_counts = rent_df_copy["district_name"].value_counts().nlargest(10)
+            sale_counts = self.aggregates.top_districts("Sale", city, 10)
+            rent_counts = self.aggregates.top_districts("Rent", city, 10)
 
             if sale_counts.empty and rent_counts.empty:
                 continue
@@ -92,23 +88,21 @@ class LocationInsights(DataAnalysis):
         boxplot_dir.mkdir(parents=True, exist_ok=True)
 
         for city in self.cities:
-            sale_city_df = self.sale_df[self.sale_df["city"] == city]
-            rent_city_df = self.rent_df[self.rent_df["city"] == city]
+            sale_top_districts = self.aggregates.top_districts("Sale", city, 8).index
+            rent_top_districts = self.aggregates.top_districts("Rent", city, 8).index
 
-            if sale_city_df.empty and rent_city_df.empty:
+            if sale_top_districts.empty and rent_top_districts.empty:
                 continue
 
             fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 10), sharey=False)
 
             # SALE
-            if not sale_city_df.empty:
-                top_districts = (sale_city_df["district_name"].value_counts().nlargest(8).index)
-
+            if not sale_top_districts.empty:
                 district_data = []
                 district_labels = []
 
-                for district in top_districts:
-                    values = sale_city_df[sale_city_df["district_name"] == district]["price_per_sqm"].values
+                for district in sale_top_districts:
+                    values = self.aggregates.district_values("Sale", city, district, "price_per_sqm")
 
                     if len(values) < 10:
                         continue
@@ -140,14 +134,12 @@ class LocationInsights(DataAnalysis):
                     ax1.invert_yaxis()
 
             # RENT
-            if not rent_city_df.empty:
-                top_districts = (rent_city_df["district_name"].value_counts().nlargest(8).index)
-
+            if not rent_top_districts.empty:
                 district_data = []
                 district_labels = []
 
-                for district in top_districts:
-                    values = rent_city_df[rent_city_df["district_name"] == district]["price"].values
+                for district in rent_top_districts:
+                    values = self.aggregates.district_values("Rent", city, district, "price")
 
                     if len(values) < 10:
                         continue
@@ -1,17 +1,19 @@
 import matplotlib.pyplot as plt
 from data_analysis.EDA.DataAnalysis import DataAnalysis
+from data_analysis.EDA.Aggregates import Aggregates
 
 
 
 class MarketOverview(DataAnalysis):
     """ Market Overview class, used to generate city listing distributions and transaction type comparisons """
-    def __init__(self, sale_df, rent_df, combined_df):
+    def __init__(self, sale_df, rent_df, combined_df, aggregates=None):
         super().__init__()
         self.inner_dir = self.output_dir / "market_overview"
         self.inner_dir.mkdir(parents=True, exist_ok=True)
         self.sale_df = sale_df
         self.rent_df = rent_df
         self.df = combined_df
+        self.aggregates = aggregates or Aggregates(sale_df, rent_df)
 
     def __city_distribution_generate(self):
         """
@@ -19,7 +21,7 @@ class MarketOverview(DataAnalysis):
         Displays each city's percentage share and total listing count, providing
         a high-level overview of market concentration and geographic composition.
         """
-        city_counts = self.df["city"].value_counts()
+        city_counts = self.aggregates.city_counts
         total = city_counts.sum()
         colors = [self.city_colors.get(city, "#CCCCCC") for city in city_counts.index]
 
@@ -74,12 +76,12 @@ class MarketOverview(DataAnalysis):
 
     def __transaction_by_city_generate(self):
         """ Generate a pie chart showing the distribution of different transaction types per each city """
-        # Group counts per (city, transaction_type)
-        sale_grouped = self.sale_df.groupby(["city"]).size()
-        rent_grouped = self.rent_df.groupby(["city"]).size()
+        # Counts per (city, transaction_type)
+        sale_grouped = self.aggregates.city_stats["Sale"]["count"]
+        rent_grouped = self.aggregates.city_stats["Rent"]["count"]
 
         for city in self.cities:
-            values = [sale_grouped.loc[city], rent_grouped.loc[city]]
+            values = [sale_grouped.get(city, 0), rent_grouped.get(city, 0)]
             total = sum(values)
 
             fig, ax = plt.subplots(figsize=self.figsize)
@@ -1,4 +1,5 @@
 from data_analysis.EDA.DataAnalysis import DataAnalysis
+from data_analysis.EDA.Aggregates import Aggregates
 import matplotlib.pyplot as plt
 import numpy as np
 
@@ -6,31 +7,32 @@ import numpy as np
 
 class PriceAnalysis(DataAnalysis):
     """ Price Analysis class used to generate media bar charts, price histograms, scatter and box plot comparisons """
-    def __init__(self, sale_df, rent_df, combined_df):
+    def __init__(self, sale_df, rent_df, combined_df, aggregates=None):
         super().__init__()
         self.inner_dir = self.output_dir / "price_analysis"
         self.inner_dir.mkdir(parents=True, exist_ok=True)
         self.sale_df = sale_df
         self.rent_df = rent_df
         self.df = combined_df
+        self.aggregates = aggregates or Aggregates(sale_df, rent_df)
 
-    def median_bar_charts_generate(self, df, title):
+    def median_bar_charts_generate(self, title):
         """
         Generates a bar chart of median apartment prices by city.
 
         Parameters:
-        - df: filtered dataframe (e.g. sale_df or rent_df)
-        - title: chart title (e.g. "Median Sale Price by City")
-        - filename: output filename
+        - title: "Sale" or "Rent", also used in the chart title and filename
         """
         median_dir = self.inner_dir / "median_bar_charts"
         median_dir.mkdir(parents=True, exist_ok=True)
 
-        # Compute medians
+        # Precomputed medians
+        city_stats = self.aggregates.city_stats[title]
         medians = {}
         for city in self.cities:
-            city_prices = df[df["city"] == city]["price"].values
-            medians[self.CITY_MAP.get(city, city)] = {"median": np.median(city_prices), "count": len(city_prices)}
+            count = city_stats["count"].get(city, 0)
+            median = city_stats["median_price"].get(city, np.nan)
+            medians[self.CITY_MAP.get(city, city)] = {"median": median, "count": count}
 
         # Sort cities by median
         sorted_items = sorted(medians.items(), key=lambda x: x[1]["median"])
@@ -82,8 +84,8 @@ class PriceAnalysis(DataAnalysis):
         histogram_dir.mkdir(parents=True, exist_ok=True)
 
         for city in self.cities:
-            sale_prices = self.sale_df[self.sale_df["city"] == city]["price"].values
-            rent_prices = self.rent_df[self.rent_df["city"] == city]["price"].values
+            sale_prices = self.aggregates.city_values("Sale", city, "price")
+            rent_prices = self.aggregates.city_values("Rent", city, "price")
 
             fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(14, 8), sharey=True)
 
@@ -134,8 +136,8 @@ class PriceAnalysis(DataAnalysis):
 
             self.save_fig(fig, histogram_dir / f"{english_city.lower()}.png")
 
-    def price_per_sqm_box_plots_generate(self, df, title):
-        """ Generates boxplot of price per sqm by city. """
+    def price_per_sqm_box_plots_generate(self, title):
+        """ Generates boxplot of price per sqm by city, title: "Sale" or "Rent" """
 
         boxplot_dir = self.inner_dir / "price_per_sqm_boxplots"
         boxplot_dir.mkdir(parents=True, exist_ok=True)
@@ -145,7 +147,7 @@ class PriceAnalysis(DataAnalysis):
         cities_used = []
 
         for city in self.cities:
-            values = df[df["city"] == city]["price_per_sqm"].values
+            values = self.aggregates.city_values(title, city, "price_per_sqm")
 
             if len(values) < 10:
                 continue
@@ -185,7 +187,7 @@ class PriceAnalysis(DataAnalysis):
             ax.scatter(i + 1, median, color="black", s=30, zorder=3)
 
         # Title
-        ax.set_title(f"Price Per m² by City for {title}\nListings: {len(df):,}", **self.styles["title"])
+        ax.set_title(f"Price Per m² by City for {title}\nListings: {len(self.aggregates.frames[title]):,}", **self.styles["title"])
 
         ax.set_xlabel("City", **self.styles["axis_title"])
         ax.set_ylabel("Price per m² (USD)", **self.styles["axis_title"])
@@ -246,15 +248,15 @@ class PriceAnalysis(DataAnalysis):
 
     def generate(self):
         # Median bar charts
-        self.median_bar_charts_generate(self.sale_df, "Sale")
-        self.median_bar_charts_generate(self.rent_df, "Rent")
+        self.median_bar_charts_generate("Sale")
+        self.median_bar_charts_generate("Rent")
 
         # Price Histograms
         self.price_histograms_generate()
 
         # Price Per SQM box plots
-        self.price_per_sqm_box_plots_generate(self.sale_df, "Sale")
-        self.price_per_sqm_box_plots_generate(self.rent_df, "Rent")
+        self.price_per_sqm_box_plots_generate("Sale")
+        self.price_per_sqm_box_plots_generate("Rent")
 
         # Feature vs Price scatter plots
         self.feature_vs_price_scatter_plots("area_m2")
@@ -1,44 +1,26 @@
 from data_analysis.EDA.DataAnalysis import DataAnalysis
+from data_analysis.EDA.Aggregates import Aggregates
 import matplotlib.pyplot as plt
-import pandas as pd
 
 
 
 class TimeAnalysis(DataAnalysis):
     """ Time Analysis class used to generate listings count and median price and price per sqm line charts """
-    def __init__(self, sale_df, rent_df, combined_df):
+    def __init__(self, sale_df, rent_df, combined_df, aggregates=None):
         super().__init__()
         self.inner_dir = self.output_dir / "time_analysis"
         self.inner_dir.mkdir(parents=True, exist_ok=True)
         self.sale_df = sale_df
         self.rent_df = rent_df
         self.df = combined_df
+        self.aggregates = aggregates or Aggregates(sale_df, rent_df)
 
     def listings_over_time_generate(self):
         """ Generates monthly listings trend chart: - Sale vs Rent comparison """
 
-        def prepare_monthly_counts(df):
-            df = df[df["upload_date"].notna()].copy()
-
-            df["upload_date"] = pd.to_datetime(df["upload_date"], errors="coerce")
-            df = df.dropna(subset=["upload_date"])
-
-            if df.empty:
-                return None
-
-            df["year_month"] = df["upload_date"].dt.to_period("M")
-
-            counts = df.groupby("year_month").size().sort_index()
-
-            if counts.empty:
-                return None
-
-            counts.index = counts.index.to_timestamp()
-            return counts
-
-        # Prepare data
-        sale_counts = prepare_monthly_counts(self.sale_df)
-        rent_counts = prepare_monthly_counts(self.rent_df)
+        # Precomputed monthly counts
+        sale_counts = self.aggregates.monthly_counts["Sale"]
+        rent_counts = self.aggregates.monthly_counts["Rent"]
 
         if sale_counts is None and rent_counts is None:
             return
@@ -74,13 +56,12 @@ class TimeAnalysis(DataAnalysis):
 
         self.save_fig(fig, self.inner_dir / "listings_over_time.png")
 
-    def median_feature_over_time_by_city_generate(self, df, title, feature):
+    def median_feature_over_time_by_city_generate(self, title, feature):
         """
         Generates monthly median trend line chart for a given feature (price or price_per_sqm),
         with separate lines for each city.
 
         Parameters:
-        - df: dataframe (sale_df or rent_df)
         - title: string (Sale or Rent)
         - feature: "price" or "price_per_sqm"
         """
@@ -88,41 +69,26 @@ class TimeAnalysis(DataAnalysis):
         time_dir = self.inner_dir / "price_trend"
         time_dir.mkdir(parents=True, exist_ok=True)
 
-        # Basic cleaning
-        df = df[df["upload_date"].notna() & df["city"].notna() & df[feature].notna() & (df[feature] > 0)].copy()
+        # Precomputed monthly medians per city (dated rows with a city and a positive feature value)
+        listings, city_stats = self.aggregates.monthly_city_stats[(title, feature)]
 
-        df["upload_date"] = pd.to_datetime(df["upload_date"], errors="coerce")
-        df = df.dropna(subset=["upload_date"])
-
-        if df.empty:
+        if not listings:
             return
 
-        # Create month column
-        df["year_month"] = df["upload_date"].dt.to_period("M")
-
         fig, ax = plt.subplots(figsize=self.figsize)
 
         # Track if anything is plotted
         plotted = False
 
         for city in self.cities:
-            city_df = df[df["city"] == city]
-
-            if len(city_df) < 20:
-                continue
-
-            # Group by month → median
-            monthly_median = (city_df.groupby("year_month")[feature].median().sort_index())
+            city_listings, monthly_median = city_stats.get(city, (0, None))
 
-            if monthly_median.empty:
+            if city_listings < 20:
                 continue
 
-            # Convert index
-            monthly_median.index = monthly_median.index.to_timestamp()
-
             # Plot
             ax.plot(monthly_median.index, monthly_median.values, marker="o", linewidth=2,
-                label=f"{self.CITY_MAP.get(city, city)} ({len(city_df):,})", color=self.city_colors.get(city, "#CCCCCC")
+                label=f"{self.CITY_MAP.get(city, city)} ({city_listings:,})", color=self.city_colors.get(city, "#CCCCCC")
             )
 
             plotted = True
@@ -133,7 +99,7 @@ class TimeAnalysis(DataAnalysis):
         # Title
         feature_label = "Price" if feature == "price" else "Price per m²"
 
-        ax.set_title(f"{title} Median {feature_label} Over Time by City\nListings: {len(df):,}", **self.styles["title"])
+        ax.set_title(f"{title} Median {feature_label} Over Time by City\nListings: {listings:,}", **self.styles["title"])
 
         ax.set_xlabel("Month", **self.styles["axis_title"])
         ax.set_ylabel(f"{feature_label} (USD)", **self.styles["axis_title"])
@@ -151,5 +117,5 @@ class TimeAnalysis(DataAnalysis):
         self.listings_over_time_generate()
 
         # Median price and price per sqm comparisons
-        self.median_feature_over_time_by_city_generate(self.sale_df, "Sale", "price_per_sqm")
-        self.median_feature_over_time_by_city_generate(self.rent_df, "Rent", "price")
+        self.median_feature_over_time_by_city_generate("Sale", "price_per_sqm")
+        self.median_feature_over_time_by_city_generate("Rent", "price")
@@ -1,8 +1,10 @@
 import pandas as pd
 
-from datastorage.postgresql.PostgresDatabase import PostgresDatabase
+from datastorage.get_database import get_database
+from config import schema
 from data_analysis.Preprocessing import Preprocessing
 
+from data_analysis.EDA.Aggregates import Aggregates
 from data_analysis.EDA.MarketOverview import MarketOverview
 from data_analysis.EDA.PriceAnalysis import PriceAnalysis
 from data_analysis.EDA.ApartmentCharacteristics import ApartmentCharacteristics
@@ -14,10 +16,12 @@ from data_analysis.EDA.TimeAnalysis import TimeAnalysis
 class RunEDA:
     """ Main class to Initialize all visualization objects and generate charts """
     def __init__(self):
-        postgres_db = PostgresDatabase()
+        postgres_db = get_database()
 
-        sale_df = postgres_db.get_apartments_by_transaction('იყიდება')
-        rent_df = postgres_db.get_apartments_by_transaction('ქირავდება თვიურად')
+        apartments = postgres_db.get_apartments_by_transactions(
+            ['იყიდება', 'ქირავდება თვიურად'], columns=schema.ANALYSIS_COLUMNS
+        )
+        sale_df, rent_df = apartments['იყიდება'], apartments['ქირავდება თვიურად']
 
         # preprocess once
         sale_df = Preprocessing(sale_df).run()
@@ -25,12 +29,15 @@ class RunEDA:
 
         combined_df = pd.concat([sale_df, rent_df])
 
+        # grouped statistics computed once, shared by all charts
+        aggregates = Aggregates(sale_df, rent_df)
+
         self.vis_objects = [
-            MarketOverview(sale_df, rent_df, combined_df),
-            PriceAnalysis(sale_df, rent_df, combined_df),
-            ApartmentCharacteristics(sale_df, rent_df, combined_df),
-            LocationInsights(sale_df, rent_df, combined_df),
-            TimeAnalysis(sale_df, rent_df, combined_df)
+            MarketOverview(sale_df, rent_df, combined_df, aggregates),
+            PriceAnalysis(sale_df, rent_df, combined_df, aggregates),
+            ApartmentCharacteristics(sale_df, rent_df, combined_df, aggregates),
+            LocationInsights(sale_df, rent_df, combined_df, aggregates),
+            TimeAnalysis(sale_df, rent_df, combined_df, aggregates)
         ]
 
     def run(self):
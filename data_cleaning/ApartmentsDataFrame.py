@@ -1,6 +1,8 @@
 import pandas as pd
 import os
-from config import paths
+from config import paths, schema
+from datastorage.parquet.ParquetRawStore import ParquetRawStore
+from scrapers.SeenUrlIndex import SeenUrlIndex
 
 
 class ApartmentsDataFrame:
@@ -28,7 +30,7 @@ class ApartmentsDataFrame:
             return None
 
         try:
-            df = pd.read_csv(path)
+            df = schema.read_raw_csv(path)
             if df.empty:
                 print(f"[WARN] File has no rows: {path}. Skipping.")
                 return None
@@ -61,43 +63,20 @@ class ApartmentsDataFrame:
         self.save_raw_data()
 
     def save_raw_data(self):
-        """Append current DataFrame to raw storage, add scrape date, and deduplicate by URL."""
-        path = paths.ALL_RAW_DATA_PATH
-
-        # Add timestamp to NEW data only
-        current_time = pd.Timestamp.now()
-        df_with_time = self.df.copy()
-
-        if "scraped_at" not in df_with_time.columns:
-            df_with_time["scraped_at"] = current_time
-
-        # Load existing data
-        if os.path.exists(path) and os.path.getsize(path) > 0:
-            try:
-                existing_df = pd.read_csv(path)
-            except Exception as e:
-                print(f"[WARN] Failed to read existing raw data: {e}. Starting fresh.")
-                existing_df = pd.DataFrame()
-        else:
-            existing_df = pd.DataFrame()
-
-        # Combine
-        combined_df = pd.concat([existing_df, df_with_time], ignore_index=True)
-        combined_df["scraped_at"] = pd.to_datetime(
-            combined_df["scraped_at"],
-            errors="coerce"
-        )
-        # Deduplicate by URL (keep latest scrape)
-        if "url" in combined_df.columns:
-            combined_df = combined_df.sort_values(by="scraped_at", ascending=True)
-            combined_df = combined_df.drop_duplicates(subset=["url"], keep="last")
-        else:
-            print("[WARN] 'url' column not found. Skipping deduplication.")
+        """Append current DataFrame to the partitioned raw store, add scrape date, and deduplicate by URL."""
+        raw_store = ParquetRawStore()
 
-        # Save
         try:
-            combined_df.to_csv(path, index=False)
-            print(f"[INFO] Raw data saved. Total records: {len(combined_df)}")
+            # One-time migration of the legacy combined CSV
+            if raw_store.is_empty():
+                raw_store.import_csv(paths.ALL_RAW_DATA_PATH)
+
+            # Only the new scrape is written, the URL index keeps the latest scrape of every URL
+            raw_store.append(self.df, scraped_at=pd.Timestamp.now())
+
+            # Listings are skipped by the next incremental scrape only once they are stored
+            if "url" in self.df.columns:
+                SeenUrlIndex().save(self.df["url"])
         except Exception as e:
             print(f"[ERROR] Failed to save raw data: {e}")
 
@@ -1,16 +1,17 @@
-import re
+import numpy as np
 import pandas as pd
 from data_cleaning.NormalizeDistricts import NormalizeDistricts
 from data_cleaning.utils.get_usd_exchange_rate import get_usd_exchange_rate
-from datetime import datetime, timedelta
-from config import paths
+from datetime import datetime
+from config import paths, schema
 
 
 
 class DataCleaning:
-    def __init__(self, apartments_df, currency_rate=None):
+    def __init__(self, apartments_df, currency_rate=None, fuzzy_street_threshold=None):
         self.apartments_df = apartments_df
         self.currency_rate = currency_rate or get_usd_exchange_rate()
+        self.fuzzy_street_threshold = fuzzy_street_threshold  # None disables fuzzy street → district matching
         self.geo_months = {
             'იან': 1, 'თებ': 2, 'მარ': 3, 'აპრ': 4, 'მაი': 5, 'ივნ': 6,
             'ივლ': 7, 'აგვ': 8, 'სექ': 9, 'ოქტ': 10, 'ნოე': 11, 'დეკ': 12
@@ -32,6 +33,22 @@ class DataCleaning:
         """ Prints the count of missing (null) values for each column in the dataset. """
         print("AMOUNT OF NULL VALUES IN APARTMENTS DATASET: \n", self.apartments_df.isnull().sum(), '\n')
 
+    @staticmethod
+    def __round_cents(values):
+        """ Rounds to 2 decimals exactly like Python's round in the former row-wise parsers ("12.345 $" → 12.35).
+            np.round scales by 100 first and rounds some half-cent values the other way (12.345 → 12.34), so the
+            values within float error of a half cent are rounded with Python's round, all others with np.round
+        """
+        floats = values.astype("Float64").to_numpy(dtype="float64", na_value=np.nan)
+        rounded = np.round(floats, 2)
+
+        scaled = floats * 100
+        near_half = np.abs(scaled - np.floor(scaled) - 0.5) <= np.abs(scaled) * 1e-12 + 1e-9
+        # tolist: Python floats, round() of a numpy float64 is numpy's rounding again
+        rounded[near_half] = [round(value, 2) for value in floats[near_half].tolist()]
+
+        return pd.Series(rounded, index=values.index, dtype="Float64")  # NaN → <NA>
+
     def _normalize_price(self):
         """
         Cleans price column:
@@ -42,30 +59,19 @@ class DataCleaning:
         - Zero / invalid / missing → pd.NA
         """
 
-        def parse_price(value):
-            if pd.isna(value):
-                return pd.NA
+        text = self.apartments_df["price"].astype("string").str.lower().str.replace(",", "", regex=False).str.strip()
 
-            price_str = str(value).lower().replace(",", "").strip()
+        is_usd = text.str.contains("$", regex=False).fillna(False)
+        is_gel = text.str.contains("₾", regex=False).fillna(False) & ~is_usd
 
-            try:
-                # USD
-                if "$" in price_str:
-                    number = round(float(price_str.replace("$", "").strip()), 2)
-                    return number if number > 0 else pd.NA
+        # Strip only the detected currency symbol, anything else left in the text makes the value invalid
+        number_text = text.where(~is_usd, text.str.replace("$", "", regex=False))
+        number_text = number_text.where(~is_gel, number_text.str.replace("₾", "", regex=False))
 
-                # GEL
-                if "₾" in price_str:
-                    number = round(float(price_str.replace("₾", "").strip()), 2)
-                    return round(number * self.currency_rate, 2) if number > 0 else pd.NA
+        number = self.__round_cents(pd.to_numeric(number_text.str.strip(), errors="coerce"))
+        price = number.where(~is_gel, self.__round_cents(number * self.currency_rate))
 
-                # No currency symbol -> keep as-is
-                return round(float(price_str), 2) if round(float(price_str), 2) > 0 else pd.NA
-
-            except ValueError:
-                return pd.NA
-
-        self.apartments_df["price"] = (self.apartments_df["price"].apply(parse_price).astype("Float64"))
+        self.apartments_df["price"] = price.where(number > 0, pd.NA).astype("Float64")
 
     def _normalize_area_m2(self):
         """
@@ -94,172 +100,109 @@ class DataCleaning:
         - Missing → computed from price / area_m2
         """
 
-        def parse_row(row):
-            value = row.get("price_per_sqm")
-
-            # Try to parse price_per_sqm directly
-            if pd.notna(value):
-                text = str(value).lower().replace(",", "").strip()
+        df = self.apartments_df
 
-                match = re.search(r"\d+(?:\.\d+)?", text)
-                if match:
-                    amount = round(float(match.group()), 2)
+        # Try to parse price_per_sqm directly
+        text = df["price_per_sqm"].astype("string").str.lower().str.replace(",", "", regex=False).str.strip()
+        amount = self.__round_cents(pd.to_numeric(text.str.extract(r"(\d+(?:\.\d+)?)", expand=False), errors="coerce"))
 
-                    # USD
-                    if "$" in text:
-                        return amount
+        is_usd = text.str.contains("$", regex=False).fillna(False) & amount.notna()
+        is_gel = text.str.contains("₾", regex=False).fillna(False) & amount.notna() & ~is_usd
 
-                    # GEL
-                    if "₾" in text:
-                        return round(amount * self.currency_rate, 2)
+        # Fallback: compute from price and area
+        price = pd.to_numeric(df["price"], errors="coerce").astype("Float64")
+        area = pd.to_numeric(df["area_m2"], errors="coerce").astype("Float64")
+        computed = self.__round_cents(price / area.where(area > 0))
+        computed = computed.where(computed > 0, pd.NA)
 
-            # Fallback: compute from price and area
-            price = row.get("price")
-            area = row.get("area_m2")
+        price_per_sqm = computed.where(~is_usd, amount)
+        price_per_sqm = price_per_sqm.where(~is_gel, self.__round_cents(amount * self.currency_rate))
 
-            if pd.notna(price) and pd.notna(area) and area > 0:
-                value = round(float(price) / float(area), 2)
-                return value if value > 0 else pd.NA
-
-            return pd.NA
-
-        self.apartments_df["price_per_sqm"] = (self.apartments_df.apply(parse_row, axis=1).astype("Float64"))
+        self.apartments_df["price_per_sqm"] = price_per_sqm.astype("Float64")
 
     def _normalize_bedrooms(self):
         """ Normalizes bedrooms column.
             Handles:"საძ. 1", "საძ1", "2". missing / invalid values → inferred from area_m2
         """
 
-        def extract_bedrooms(value):
-            if pd.isna(value):
-                return pd.NA
-
-            text = str(value).lower()
-
-            match = re.search(r'\d+', text)
-            if match:
-                return int(match.group())
-
-            return pd.NA
-
-        def infer_bedrooms(area):
-            if pd.isna(area):
-                return pd.NA
-
-            if area <= 50:
-                return 1
-            elif area <= 100:
-                return 2
-            elif area <= 150:
-                return 3
-            elif area <= 175:
-                return 4
-            elif area <= 200:
-                return 5
-            elif area <= 225:
-                return 6
-            else:
-                return 7
-
         # extract explicit bedroom values
-        self.apartments_df['bedrooms'] = self.apartments_df['bedrooms'].apply(extract_bedrooms).astype('Int64')
+        bedrooms = pd.to_numeric(
+            self.apartments_df['bedrooms'].astype('string').str.extract(r'(\d+)', expand=False)
+        ).astype('Int64')
 
         # infer missing bedrooms from area
-        self.apartments_df['bedrooms'] = self.apartments_df.apply(
-            lambda row: (
-                infer_bedrooms(row['area_m2'])
-                if pd.isna(row['bedrooms'])
-                else row['bedrooms']
-            ),
-            axis=1
+        inferred = pd.cut(
+            pd.to_numeric(self.apartments_df['area_m2'], errors='coerce'),
+            bins=[float('-inf'), 50, 100, 150, 175, 200, 225, float('inf')],
+            labels=[1, 2, 3, 4, 5, 6, 7]
         ).astype('Int64')
 
+        self.apartments_df['bedrooms'] = bedrooms.fillna(inferred).astype('Int64')
+
     def _normalize_floor(self):
         """ Normalizes floor column.
             Handles: "სართ. 3", "8/11", "5". missing / invalid values → pd.NA
         """
-
-        def extract_floor(value):
-            if pd.isna(value):
-                return pd.NA
-
-            text = str(value)
-            match = re.search(r'\d+', text)
-            if match:
-                return int(match.group())
-
-            return pd.NA
-
-        self.apartments_df['floor'] = self.apartments_df['floor'].apply(extract_floor).astype('Int64')
+        self.apartments_df['floor'] = pd.to_numeric(
+            self.apartments_df['floor'].astype('string').str.extract(r'(\d+)', expand=False)
+        ).astype('Int64')
 
     def _normalize_upload_date(self, now=None):
         """ Normalizes upload_date column.
             Handles: "1 წუთის წინ", "23 საათის წინ", "30 დეკ, 12:02", "02 იან 12:44", "01 იან 2026"
+            Every distinct raw value is parsed once, relative dates repeat a lot between rows.
         """
 
-        now = now or datetime.now()
+        now = pd.Timestamp(now or datetime.now())
 
-        def parse_date(value):
-            if pd.isna(value):
-                return pd.NA
-
-            # Already-normalized datetime (string or datetime)
-            parsed = pd.to_datetime(value, errors="coerce")
-            if pd.notna(parsed):
-                if parsed <= now:
-                    return parsed.floor("min")
-                else:
-                    # future timestamps are invalid → roll back one year
-                    return parsed.replace(year=parsed.year - 1).floor("min")
-
-            text = str(value).strip().lower()
-
-            try:
-                # Relative minutes: "1 წუთის წინ"
-                if 'წუთ' in text:
-                    minutes = int(re.search(r'\d+', text).group())
-                    return now - timedelta(minutes=minutes)
-
-                # Relative hours: "23 საათის წინ"
-                if 'საათ' in text:
-                    hours = int(re.search(r'\d+', text).group())
-                    return now - timedelta(hours=hours)
-
-                parts = text.replace(',', '').split()
-
-                # Full date with year: "01 იან 2026"
-                if len(parts) == 3 and parts[2].isdigit():
-                    day, geo_month, year = parts
-                    month = self.geo_months.get(geo_month[:3])
-                    if not month:
-                        return pd.NA
-                    return datetime(int(year), month, int(day), 12, 0)
-
-                # Date + time without year: "30 დეკ 12:02"
-                if len(parts) == 3 and ':' in parts[2]:
-                    day, geo_month, time_str = parts
-                    month = self.geo_months.get(geo_month[:3])
-                    if not month:
-                        return pd.NA
-
-                    hour, minute = map(int, time_str.split(':'))
-                    candidate = datetime(year=now.year, month=month, day=int(day), hour=hour, minute=minute)
-
-                    # Handles year rollover
-                    if candidate > now:
-                        candidate = candidate.replace(year=now.year - 1)
-
-                    return candidate
-
-            except Exception:
-                return pd.NA
+        codes, uniques = pd.factorize(self.apartments_df['upload_date'])
+        text = pd.Series(uniques, dtype=object).astype(str).str.strip().str.lower()
+        parsed = pd.Series(pd.NaT, index=text.index, dtype='datetime64[ns]')
 
-            return pd.NA
+        is_iso = text.str.match(r'^\d{4}-\d{2}-\d{2}')
+        is_minutes = ~is_iso & text.str.contains('წუთ', regex=False)
+        is_hours = ~is_iso & ~is_minutes & text.str.contains('საათ', regex=False)
 
-        self.apartments_df['upload_date'] = (
-            self.apartments_df['upload_date']
-            .apply(parse_date).astype('datetime64[ns]').dt.floor('min')
+        parts = text.str.replace(',', '', regex=False).str.extract(
+            r'^(?P<day>\d+)\s+(?P<month>\S+)\s+(?:(?P<year>\d+)|(?P<hour>\d+):(?P<minute>\d+))$'
         )
+        is_full_date = ~is_iso & ~is_minutes & ~is_hours & parts['year'].notna()
+        is_day_time = ~is_iso & ~is_minutes & ~is_hours & parts['hour'].notna()
+        is_other = ~(is_iso | is_minutes | is_hours | is_full_date | is_day_time)
+
+        # Already-normalized datetimes; future timestamps are invalid → roll back one year
+        iso = pd.to_datetime(text[is_iso], format='ISO8601', errors='coerce')
+        other = pd.to_datetime(text[is_other], format='mixed', errors='coerce')
+        dated = pd.concat([iso, other]).astype('datetime64[ns]')
+        parsed.loc[dated.index] = dated.where(dated <= now, dated - pd.DateOffset(years=1))
+
+        # Relative minutes / hours: "1 წუთის წინ", "23 საათის წინ"
+        amount = pd.to_numeric(text.str.extract(r'(\d+)', expand=False), errors='coerce')
+        parsed.loc[is_minutes] = now - pd.to_timedelta(amount[is_minutes], unit='min')
+        parsed.loc[is_hours] = now - pd.to_timedelta(amount[is_hours], unit='h')
+
+        components = pd.DataFrame({
+            'year': pd.to_numeric(parts['year'], errors='coerce'),
+            'month': parts['month'].str[:3].map(self.geo_months),
+            'day': pd.to_numeric(parts['day'], errors='coerce'),
+            'hour': pd.to_numeric(parts['hour'], errors='coerce').fillna(12),
+            'minute': pd.to_numeric(parts['minute'], errors='coerce').fillna(0),
+        })
+        # to_datetime carries overflowing hours / minutes into the next day instead of rejecting them
+        components = components.where((components['hour'] < 24) & (components['minute'] < 60))
+
+        # Full date with year: "01 იან 2026"
+        full_date = components[is_full_date]
+        parsed.loc[is_full_date] = pd.to_datetime(full_date, errors='coerce')
+
+        # Date + time without year: "30 დეკ 12:02", rolled back to the previous year when in the future
+        day_time = components[is_day_time].assign(year=now.year)
+        candidate = pd.to_datetime(day_time, errors='coerce')
+        day_time.loc[candidate > now, 'year'] = now.year - 1
+        parsed.loc[is_day_time] = pd.to_datetime(day_time, errors='coerce')
+
+        upload_date = pd.Series(parsed.array.take(codes, allow_fill=True), index=self.apartments_df.index)
+        self.apartments_df['upload_date'] = upload_date.astype('datetime64[ns]').dt.floor('min')
 
     def _normalize_transaction_type(self):
         """ Extracts transaction type from description.
@@ -309,7 +252,7 @@ class DataCleaning:
         if self.apartments_df.empty:
             print(f"No data to write After Performing Data Cleaning")
             return
-        self.apartments_df.to_csv(path, index=False, na_rep='<NA>')
+        schema.write_processed_csv(self.apartments_df, path)
 
     def normalize(self):
         self.__get_shape()
@@ -328,7 +271,7 @@ class DataCleaning:
         self._normalize_transaction_type()
         self._normalize_source()
 
-        normalize_districts = NormalizeDistricts(self.apartments_df)
+        normalize_districts = NormalizeDistricts(self.apartments_df, fuzzy_street_threshold=self.fuzzy_street_threshold)
         normalize_districts.normalize_non_tbilisi_districts()
         normalize_districts.normalize_tbilisi_districts()
         self.apartments_df = normalize_districts.apartments_df
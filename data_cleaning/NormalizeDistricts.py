@@ -1,34 +1,58 @@
+import hashlib
 import json
+import os
+import numpy as np
 import pandas as pd
 import re
 from config import paths
+from data_cleaning.utils.DistrictMatcher import DistrictMatcher
+from data_cleaning.utils.TrigramIndex import TrigramIndex
 
 
 
 class NormalizeDistricts:
-    def __init__(self, apartments_df):
+    __STREET_TOKENS = [
+        "ქ.", "ქუჩა", "გამზ.", "გამზირი", "ჩიხ.", "ჩიხი", "შეს.", "შესახვევი", "მოედანი",
+        "პროსპექტ", "პლ.", "დაღმ.", "ხეივ.", "ხეივანი", "კვარტ.", "კვარტალი", "გზატკეცილი",
+        "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"
+    ]
+
+    __TOKEN_CANONICAL_MAP = {
+        "ქ.": "ქუჩა",
+        "გამზ.": "გამზირი",
+        "ჩიხ.": "ჩიხი",
+        "შეს.": "შესახვევი",
+        "კვარტ.": "კვარტალი",
+        "ხეივ.": "ხეივანი",
+        "დაღმ.": "დაღმართი",
+    }
+
+    __STREET_TOKEN_PATTERN = "|".join(sorted(map(re.escape, __STREET_TOKENS), key=len, reverse=True))
+
+    # Street normalization regexes, compiled once
+    __STREET_TOKEN_RE = re.compile(rf"({__STREET_TOKEN_PATTERN})")
+    __TOKEN_HOUSE_NUMBER_RE = re.compile(rf"({__STREET_TOKEN_PATTERN})\s*\d+[^\s]*$")
+    __HOUSE_NUMBER_RE = re.compile(r"\s+\d+[^\s]*$")
+    __TRAILING_PUNCTUATION_RE = re.compile(r"[,.;]+$")
+    __WHITESPACE_RE = re.compile(r"\s+")
+
+    # Part of the street map cache key with the rules above: bump it whenever the logic of __normalize_street or
+    # __street_base_name changes, so cached maps built by the previous logic are rebuilt
+    STREET_MAPS_CACHE_VERSION = 1
+
+    def __init__(self, apartments_df, fuzzy_street_threshold=None):
+        """
+            # fuzzy_street_threshold: minimum trigram similarity (0-1) for the optional fuzzy street pass,
+            # None disables the pass.
+        """
         self.apartments_df = apartments_df
-
-        self.__STREET_TOKENS = [
-            "ქ.", "ქუჩა", "გამზ.", "გამზირი", "ჩიხ.", "ჩიხი", "შეს.", "შესახვევი", "მოედანი",
-            "პროსპექტ", "პლ.", "დაღმ.", "ხეივ.", "ხეივანი", "კვარტ.", "კვარტალი", "გზატკეცილი",
-            "I", "II", "III", "IV", "V", "VI", "VII", "VIII", "IX", "X"
-        ]
-
-        self.__TOKEN_CANONICAL_MAP = {
-            "ქ.": "ქუჩა",
-            "გამზ.": "გამზირი",
-            "ჩიხ.": "ჩიხი",
-            "შეს.": "შესახვევი",
-            "კვარტ.": "კვარტალი",
-            "ხეივ.": "ხეივანი",
-            "დაღმ.": "დაღმართი",
-        }
-
-        self.__STREET_TOKEN_PATTERN = "|".join(sorted(map(re.escape, self.__STREET_TOKENS), key=len, reverse=True))
+        self.fuzzy_street_threshold = fuzzy_street_threshold
 
         self.INVALID_DISTRICT_VALUES = {"", "n.a", "N/A", "თბილისი", "ქუთაისი", "ბათუმი"}
 
+        self.__district_matchers = {}  # Compiled matchers, built once per city / variant map
+        self.__street_trigram_indexes = {}  # Fuzzy street lookups, built once per city
+
     def __normalize_street(self, street):
         """
             # Normalize street names for deterministic matching.
@@ -46,32 +70,28 @@ class NormalizeDistricts:
                 s = s.replace(variant, canonical)
 
         # 2. Remove trailing house numbers after tokens
-        s = re.sub(rf"({self.__STREET_TOKEN_PATTERN})\s*\d+[^\s]*$", r"\1", s)
+        s = self.__TOKEN_HOUSE_NUMBER_RE.sub(r"\1", s)
 
         # 3. Remove bare trailing numbers
-        s = re.sub(r"\s+\d+[^\s]*$", "", s)
+        s = self.__HOUSE_NUMBER_RE.sub("", s)
 
         # 4. Remove trailing punctuation (safe after previous changes)
-        s = re.sub(r"[,.;]+$", "", s)
+        s = self.__TRAILING_PUNCTUATION_RE.sub("", s)
 
         # 5. Normalize whitespace
-        s = re.sub(r"\s+", " ", s)
+        s = self.__WHITESPACE_RE.sub(" ", s)
 
         return s.strip().replace(" ", "")
 
-    def __extract_district_from_street(self, street_address, district_names):
+    def __get_district_matcher(self, key, variants):
         """
-            # Extract district name by direct substring match from street text.
-            # Returns the first matched canonical district or None.
+            # Returns the compiled district matcher for key, building it on first use.
+            # key: (text column the matcher scans, city)
         """
-        if not isinstance(street_address, str):
-            return None
+        if key not in self.__district_matchers:
+            self.__district_matchers[key] = DistrictMatcher(variants)
 
-        for district in district_names:
-            if district in street_address:
-                return district
-
-        return None
+        return self.__district_matchers[key]
 
     def __street_base_name(self, street_norm):
         """
@@ -83,10 +103,68 @@ class NormalizeDistricts:
             return None
 
         # Remove street tokens even when concatenated
-        base = re.sub(rf"({self.__STREET_TOKEN_PATTERN})", "", street_norm)
+        base = self.__STREET_TOKEN_RE.sub("", street_norm)
 
         return base if base else None
 
+    def __build_street_maps(self, city_map):
+        """
+            # Build normalized street → district and base street name → district maps for one city.
+        """
+        normalized_map = {
+            street_norm: district
+            for street_norm, district in ((self.__normalize_street(street), district) for street, district in city_map.items())
+            if street_norm
+        }
+
+        base_map = {
+            base: district
+            for base, district in ((self.__street_base_name(norm), district) for norm, district in normalized_map.items())
+            if base
+        }
+
+        return {"normalized": normalized_map, "base": base_map}
+
+    def __load_street_maps(self, street_districts, source_bytes):
+        """
+            # Return {city: {"normalized": ..., "base": ...}} for the street → district JSON.
+            # The maps are cached on disk, keyed by the hash of the JSON file, the normalization token map and
+            # regexes and STREET_MAPS_CACHE_VERSION, so they are only rebuilt when one of them changes.
+        """
+        rules = [
+            self.STREET_MAPS_CACHE_VERSION,
+            self.__STREET_TOKEN_PATTERN,
+            self.__TOKEN_CANONICAL_MAP,
+            [regex.pattern for regex in (
+                self.__STREET_TOKEN_RE, self.__TOKEN_HOUSE_NUMBER_RE, self.__HOUSE_NUMBER_RE,
+                self.__TRAILING_PUNCTUATION_RE, self.__WHITESPACE_RE,
+            )],
+        ]
+        cache_key = hashlib.sha256(source_bytes + json.dumps(rules).encode("utf-8")).hexdigest()
+
+        cache_path = paths.STREET_MAPS_CACHE_PATH
+        if cache_path.exists():
+            try:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    cache = json.load(f)
+                if cache.get("key") == cache_key:
+                    return cache["cities"]
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Ignoring unreadable street map cache '{cache_path}': {e}")
+
+        street_maps = {city: self.__build_street_maps(city_map) for city, city_map in street_districts.items()}
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"key": cache_key, "cities": street_maps}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"[WARN] Could not write street map cache '{cache_path}': {e}")
+
+        return street_maps
+
     def _is_unresolved(self, s: pd.Series):
         """
             # Identify unresolved district values (missing or placeholder values).
@@ -97,7 +175,7 @@ class NormalizeDistricts:
                 .str.strip().str.lower().isin({v.lower() for v in self.INVALID_DISTRICT_VALUES})
         )
 
-    def __normalize_districts_single_city(self, df, city_map):
+    def __normalize_districts_single_city(self, df, city, city_map, street_maps):
         """
         Normalize district names for a single city using street-based matching.
 
@@ -108,9 +186,10 @@ class NormalizeDistricts:
         - Does not modify row order or row count
 
         Strategy (applied sequentially):
-        1) Extract district by scanning street text for known district names
+        1) Extract district by scanning street text for known district names (longest name wins)
         2) Match fully normalized street names against a street → district map
         3) Match token-agnostic base street names as a fallback
+        4) Optional: match normalized street names by trigram similarity (fuzzy_street_threshold)
 
         Each step:
         - Recomputes the unresolved mask
@@ -120,6 +199,7 @@ class NormalizeDistricts:
         Input assumptions:
         - df contains rows for a single city
         - city_map maps street names to canonical district names
+        - street_maps holds the normalized / base street name maps built from city_map
         - Helper methods (__normalize_street, __street_base_name, etc.) are deterministic
 
         Output guarantees:
@@ -128,37 +208,52 @@ class NormalizeDistricts:
         - Temporary helper columns are removed before returning
         """
         df = df.copy()
+        resolved_per_pass = {}
 
+        # Step 1: Extract district from street address (longest district name found in the text wins)
+        district_matcher = self.__get_district_matcher(("street", city), list(dict.fromkeys(city_map.values())))
 
-        # Step 1: Extract district from street address
-        district_names = set(city_map.values())
+        mask = self._is_unresolved(df["district_name"])
+        unresolved_before = int(mask.sum())
+        df.loc[mask, "district_name"] = district_matcher.find_series(df.loc[mask, "street_address"])
 
+        # Street addresses repeat heavily, normalize each distinct unresolved address once and map back by code
         mask = self._is_unresolved(df["district_name"])
-        df.loc[mask, "district_name"] = df.loc[mask, "street_address"].apply(
-            lambda s: self.__extract_district_from_street(s, district_names)
-        )
+        resolved_per_pass["street text"] = unresolved_before - int(mask.sum())
+        codes = np.full(len(df), -1)  # code -1 (missing or already resolved) → None
+        codes[mask.to_numpy()], streets = pd.factorize(df.loc[mask, "street_address"])
+        street_norms = [self.__normalize_street(street) for street in streets]
+        street_bases = [self.__street_base_name(street_norm) for street_norm in street_norms]
 
         # Step 2: Directly compare normalized streets
-        normalized_map = {
-            self.__normalize_street(street): district
-            for street, district in city_map.items()
-            if self.__normalize_street(street)
-        }
+        df["street_norm"] = np.array(street_norms + [None], dtype=object)[codes]
+        df.loc[mask, "district_name"] = df.loc[mask, "street_norm"].map(street_maps["normalized"])
 
-        df["street_norm"] = df["street_address"].apply(self.__normalize_street)
-        mask = self._is_unresolved(df["district_name"])
-        df.loc[mask, "district_name"] = df.loc[mask, "street_norm"].map(normalized_map)
+        # Step 3: token-agnostic base name match
+        df["street_base"] = np.array(street_bases + [None], dtype=object)[codes]
+        unresolved_before, mask = int(mask.sum()), self._is_unresolved(df["district_name"])
+        resolved_per_pass["normalized street"] = unresolved_before - int(mask.sum())
+        df.loc[mask, "district_name"] = df.loc[mask, "street_base"].map(street_maps["base"])
 
-        # Step 3: token-agnostic base name match (NEW)
-        base_map = {
-            self.__street_base_name(norm): district
-            for norm, district in normalized_map.items()
-            if self.__street_base_name(norm)
-        }
+        unresolved_before, mask = int(mask.sum()), self._is_unresolved(df["district_name"])
+        resolved_per_pass["base name"] = unresolved_before - int(mask.sum())
 
-        df["street_base"] = df["street_norm"].apply(self.__street_base_name)
-        mask = self._is_unresolved(df["district_name"])
-        df.loc[mask, "district_name"] = df.loc[mask, "street_base"].map(base_map)
+        # Step 4 (optional): closest normalized street by trigram similarity
+        if self.fuzzy_street_threshold is not None:
+            if city not in self.__street_trigram_indexes:
+                self.__street_trigram_indexes[city] = TrigramIndex(street_maps["normalized"])
+
+            trigram_index = self.__street_trigram_indexes[city]
+            df.loc[mask, "district_name"] = trigram_index.lookup_series(
+                df.loc[mask, "street_norm"], self.fuzzy_street_threshold
+            )
+
+            unresolved_before, mask = int(mask.sum()), self._is_unresolved(df["district_name"])
+            resolved_per_pass["fuzzy street"] = unresolved_before - int(mask.sum())
+
+        print(f"[INFO] {city} districts resolved per pass: "
+              + ", ".join(f"{name} {count}" for name, count in resolved_per_pass.items())
+              + f", unresolved {int(mask.sum())}")
 
         df.drop(columns=["street_norm", "street_base"], inplace=True)
 
@@ -178,6 +273,7 @@ class NormalizeDistricts:
             1) Extract district from street text
             2) Match normalized street names
             3) Match token-agnostic base street names
+            4) Optional: fuzzy match of normalized street names (fuzzy_street_threshold)
         - Each pass only operates on unresolved district_name values
 
         Missing-value policy:
@@ -191,9 +287,10 @@ class NormalizeDistricts:
         """
         df = self.apartments_df.copy()
 
-        # load street → district mapping
-        with open(paths.STREET_TO_DISTRICT_JSON_PATH, "r", encoding="utf-8") as f:
-            street_districts = json.load(f)
+        # load street → district mapping and its normalized lookup maps
+        source_bytes = paths.STREET_TO_DISTRICT_JSON_PATH.read_bytes()
+        street_districts = json.loads(source_bytes)
+        street_maps = self.__load_street_maps(street_districts, source_bytes)
 
         result = []
 
@@ -204,7 +301,7 @@ class NormalizeDistricts:
                 result.append(city_df.copy())
                 continue
 
-            city_df = self.__normalize_districts_single_city(city_df, city_map)
+            city_df = self.__normalize_districts_single_city(city_df, city, city_map, street_maps[city])
             result.append(city_df)
 
         df_out = pd.concat(result).sort_index()  # Recombine all cities and preserve original row order
@@ -242,15 +339,8 @@ class NormalizeDistricts:
         mask = is_tbilisi & invalid_district
         subset = df.loc[mask, "description"].fillna("")  # Work only on relevant rows
 
-        # Normalize using exact matching
-        def extract_district(description):
-            if not isinstance(description, str):
-                return None
-            for variant in sorted(tbilisi_districts, key=len, reverse=True):
-                if variant in description:
-                    return tbilisi_districts[variant]
-            return None
-
-        df.loc[mask, "district_name"] = subset.apply(extract_district)
+        # Normalize using exact matching, the longest variant found in the description wins
+        district_matcher = self.__get_district_matcher(("description", "თბილისი"), tbilisi_districts)
+        df.loc[mask, "district_name"] = district_matcher.find_series(subset)
 
         self.apartments_df = df
@@ -0,0 +1,61 @@
+import re
+import numpy as np
+import pandas as pd
+
+
+
+class DistrictMatcher:
+    """
+        # Multi-pattern substring matcher over district name variants.
+        # Variants are compiled once into a single trie-shaped regex, so a text is scanned in one pass
+        # instead of one `in` check per variant.
+        # Longest variant wins; variants of equal length keep their insertion order.
+    """
+    def __init__(self, variants):
+        """ variants: dict variant → canonical district, or an iterable of districts matched as themselves """
+        if not isinstance(variants, dict):
+            variants = {variant: variant for variant in variants}
+
+        ordered = sorted((variant for variant in variants if variant), key=len, reverse=True)
+
+        self.canonical = {variant: variants[variant] for variant in ordered}
+        self.rank = {variant: rank for rank, variant in enumerate(ordered)}
+        self.pattern = re.compile(f"(?=({self.__trie_pattern(ordered)}))") if ordered else None
+
+    @staticmethod
+    def __trie_pattern(variants):
+        """ Builds an alternation where every branch prefers the longest continuation (longest match per position) """
+        trie = {}
+        for variant in variants:
+            node = trie
+            for char in variant:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        def to_pattern(node):
+            is_terminal = "" in node
+            branches = [re.escape(char) + to_pattern(child) for char, child in sorted(node.items()) if char]
+
+            if not branches:
+                return ""
+            if len(branches) == 1 and not is_terminal:
+                return branches[0]
+
+            group = f"(?:{'|'.join(branches)})"
+            return f"{group}?" if is_terminal else group
+
+        return to_pattern(trie)
+
+    def find(self, text):
+        """ Returns the canonical district of the longest variant found in text, or None """
+        if self.pattern is None or not isinstance(text, str):
+            return None
+
+        best = min(self.pattern.findall(text), key=self.rank.__getitem__, default=None)
+        return self.canonical[best] if best is not None else None
+
+    def find_series(self, texts: pd.Series):
+        """ Vectorized find: every distinct text is scanned once and mapped back to the rows """
+        codes, uniques = pd.factorize(texts)
+        found = np.array([self.find(text) for text in uniques] + [None], dtype=object)  # code -1 (missing) → None
+        return pd.Series(found[codes], index=texts.index, dtype=object)
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+
+
+
+class TrigramIndex:
+    """
+        # Character-trigram inverted index over lookup keys for fuzzy matching.
+        # Similarity is the Jaccard index of the trigram sets (shared / union), candidates are only the keys
+        # sharing at least one trigram with the query, found through the posting lists.
+    """
+    def __init__(self, keys):
+        """ keys: dict key → value returned on a match """
+        self.keys = [key for key in keys if key]
+        self.values = np.array([keys[key] for key in self.keys], dtype=object)
+        self.key_sizes = np.array([len(self.trigrams(key)) for key in self.keys])
+
+        postings = {}
+        for key_id, key in enumerate(self.keys):
+            for trigram in self.trigrams(key):
+                postings.setdefault(trigram, []).append(key_id)
+
+        self.postings = {trigram: np.array(key_ids) for trigram, key_ids in postings.items()}
+
+    @staticmethod
+    def trigrams(text):
+        """ Trigram set of text, padded so that the start and the end of short strings still count """
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def lookup(self, text, threshold):
+        """ Returns (value, similarity) of the most similar key with similarity >= threshold, or (None, 0.0) """
+        if not self.keys or not isinstance(text, str) or not text:
+            return None, 0.0
+
+        query = self.trigrams(text)
+        candidate_lists = [self.postings[trigram] for trigram in query if trigram in self.postings]
+        if not candidate_lists:
+            return None, 0.0
+
+        shared = np.bincount(np.concatenate(candidate_lists), minlength=len(self.keys))
+        similarity = shared / (self.key_sizes + len(query) - shared)
+
+        best = int(similarity.argmax())  # ties → first key in insertion order
+        if similarity[best] < threshold:
+            return None, 0.0
+
+        return self.values[best], float(similarity[best])
+
+    def lookup_series(self, texts: pd.Series, threshold):
+        """ Bulk lookup: every distinct text is queried once and mapped back to the rows (no match → None) """
+        codes, uniques = pd.factorize(texts)
+        found = np.array([self.lookup(text, threshold)[0] for text in uniques] + [None], dtype=object)
+        return pd.Series(found[codes], index=texts.index, dtype=object)
@@ -0,0 +1,151 @@
+import argparse, hashlib, json, os, zlib
+from datetime import datetime
+from pathlib import Path
+from config import paths
+
+
+class BackupStore:
+    """
+    Snapshot store for the apartments CSV backups, kept as compressed content-addressed chunks:
+        <backups_dir>/chunks/<id[:2]>/<id>             zlib compressed chunk, id = sha256 of its bytes
+        <backups_dir>/snapshots/<YYYYmmdd_HHMMSS>.json  manifest: ordered chunk ids, size and sha256 of the file
+
+    Chunk boundaries are content-defined on line ends (a line whose crc32 matches the boundary mask closes
+    the chunk), so an appended or edited region only produces new chunks around it and consecutive
+    snapshots share every unchanged chunk. The store stays close to the compressed size of one dataset.
+    """
+    TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+    MIN_CHUNK_SIZE = 64 << 10
+    MAX_CHUNK_SIZE = 8 << 20
+    BOUNDARY_MASK = 0x3FF  # ~1 boundary every 1024 lines once MIN_CHUNK_SIZE is reached
+
+    def __init__(self, backups_dir=paths.APARTMENTS_CSV_BACKUPS_DIR):
+        self.backups_dir = backups_dir
+        self.chunks_dir = backups_dir / "chunks"
+        self.snapshots_dir = backups_dir / "snapshots"
+
+    @staticmethod
+    def __write_atomic(path, data):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+
+    def __chunk_path(self, chunk_id):
+        return self.chunks_dir / chunk_id[:2] / chunk_id
+
+    def __snapshot_path(self, timestamp):
+        return self.snapshots_dir / f"{timestamp}.json"
+
+    def __iter_chunks(self, file):
+        """ Splits a binary file into content-defined chunks of whole lines """
+        lines, size = [], 0
+        for line in file:
+            lines.append(line)
+            size += len(line)
+            if size >= self.MAX_CHUNK_SIZE or (size >= self.MIN_CHUNK_SIZE and zlib.crc32(line) & self.BOUNDARY_MASK == 0):
+                yield b"".join(lines)
+                lines, size = [], 0
+
+        if lines:
+            yield b"".join(lines)
+
+    def snapshot(self, file_path, timestamp=None):
+        """ Stores file_path as a snapshot, writing only the chunks not already in the store. Returns the snapshot timestamp """
+        timestamp = timestamp or datetime.now().strftime(self.TIMESTAMP_FORMAT)
+        file_hash = hashlib.sha256()
+        chunk_ids, size, new_chunks = [], 0, 0
+
+        with open(file_path, "rb") as file:
+            for chunk in self.__iter_chunks(file):
+                chunk_id = hashlib.sha256(chunk).hexdigest()
+                chunk_path = self.__chunk_path(chunk_id)
+                if not chunk_path.exists():
+                    self.__write_atomic(chunk_path, zlib.compress(chunk, 6))
+                    new_chunks += 1
+
+                file_hash.update(chunk)
+                chunk_ids.append(chunk_id)
+                size += len(chunk)
+
+        manifest = {"source": file_path.name, "size": size, "sha256": file_hash.hexdigest(), "chunks": chunk_ids}
+        self.__write_atomic(self.__snapshot_path(timestamp), json.dumps(manifest).encode())
+
+        print(f"[INFO] Backup {timestamp}: {len(chunk_ids)} chunks, {new_chunks} new.")
+        return timestamp
+
+    def list_snapshots(self):
+        """ Snapshot timestamps, oldest first """
+        return sorted(path.stem for path in self.snapshots_dir.glob("*.json"))
+
+    def resolve(self, timestamp):
+        """ The snapshot taken at timestamp, or the latest one taken before it """
+        earlier = [snapshot for snapshot in self.list_snapshots() if snapshot <= timestamp]
+        if not earlier:
+            raise FileNotFoundError(f"No backup snapshot at or before {timestamp}")
+        return earlier[-1]
+
+    def restore(self, timestamp, target_path):
+        """ Rebuilds the snapshot at (or latest before) timestamp into target_path, checking its sha256. Returns the snapshot timestamp """
+        timestamp = self.resolve(timestamp)
+        manifest = json.loads(self.__snapshot_path(timestamp).read_text())
+
+        file_hash = hashlib.sha256()
+        tmp_path = target_path.with_suffix(".restore.tmp")
+        with open(tmp_path, "wb") as target:
+            for chunk_id in manifest["chunks"]:
+                chunk = zlib.decompress(self.__chunk_path(chunk_id).read_bytes())
+                file_hash.update(chunk)
+                target.write(chunk)
+
+        if file_hash.hexdigest() != manifest["sha256"]:
+            tmp_path.unlink()
+            raise ValueError(f"Backup snapshot {timestamp} is corrupted (sha256 mismatch)")
+
+        os.replace(tmp_path, target_path)
+        print(f"[INFO] Restored backup {timestamp} to {target_path}.")
+        return timestamp
+
+    def cleanup(self, keep_last=40):
+        """ Removes all but the last keep_last snapshots and the chunks no remaining snapshot references """
+        snapshots = self.list_snapshots()
+        for timestamp in snapshots[:-keep_last]:
+            self.__snapshot_path(timestamp).unlink()
+
+        referenced = set()
+        for timestamp in snapshots[-keep_last:]:
+            referenced.update(json.loads(self.__snapshot_path(timestamp).read_text())["chunks"])
+
+        removed = 0
+        for chunk_path in self.chunks_dir.glob("*/*"):
+            if chunk_path.name not in referenced:
+                chunk_path.unlink()
+                removed += 1
+
+        if removed:
+            print(f"[INFO] Backup cleanup: {removed} unreferenced chunks removed.")
+
+    def import_legacy_backups(self):
+        """ Moves the old full-copy backups (apartments_<timestamp>.csv) into the store """
+        for legacy_path in sorted(self.backups_dir.glob("apartments_*.csv")):
+            self.snapshot(legacy_path, timestamp=legacy_path.stem.removeprefix("apartments_"))
+            legacy_path.unlink()
+
+
+if __name__ == "__main__":
+    """ python -m datastorage.csv.BackupStore list | restore <YYYYmmdd_HHMMSS> [--output path] """
+    parser = argparse.ArgumentParser(description="Apartments CSV backups")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="list backup snapshots")
+    restore_parser = commands.add_parser("restore", help="rebuild the snapshot at (or latest before) a timestamp")
+    restore_parser.add_argument("timestamp", help="YYYYmmdd_HHMMSS")
+    restore_parser.add_argument("--output", type=Path, default=paths.APARTMENTS_CSV_PATH)
+    args = parser.parse_args()
+
+    store = BackupStore()
+    if args.command == "list":
+        for snapshot_timestamp in store.list_snapshots():
+            print(snapshot_timestamp)
+    else:
+        store.restore(args.timestamp, args.output)
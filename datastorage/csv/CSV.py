@@ -1,58 +1,191 @@
+import os
+import numpy as np
 import pandas as pd
-from config import paths
-from datetime import datetime
+from config import paths, schema
+from datastorage.csv.BackupStore import BackupStore
 
 
 class CSV:
     def __init__(self):
         self.csv_path = paths.APARTMENTS_CSV_PATH
-        self.backups_dir = paths.APARTMENTS_CSV_BACKUPS_DIR
+        self.url_index_path = paths.APARTMENTS_CSV_URL_INDEX_PATH
+        self.backup_store = BackupStore(paths.APARTMENTS_CSV_BACKUPS_DIR)
 
     def backup(self):
-        """ Create a timestamped backup of the current apartments CSV before any modification. """
+        """ Snapshot the current apartments CSV into the backup store before any modification. """
         if not self.csv_path.exists():
             return  # nothing to back up
 
-        self.backups_dir.mkdir(parents=True, exist_ok=True)
+        self.backup_store.import_legacy_backups()
+        self.backup_store.snapshot(self.csv_path)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backups_dir / f"apartments_{timestamp}.csv"
+    def cleanup_old_backups(self, keep_last=40):
+        """ Remove old apartments CSV snapshots and the chunks only they used """
+        self.backup_store.cleanup(keep_last=keep_last)
 
-        df = pd.read_csv(self.csv_path)
-        df.to_csv(backup_path, index=False)
+    @staticmethod
+    def __hash_rows(df):
+        """ 64-bit hashes of the url and of the whole row, used to detect new and changed listings """
+        url_hashes = pd.util.hash_pandas_object(df["url"], index=False).to_numpy()
+        row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return url_hashes, row_hashes
 
-    def cleanup_old_backups(self, keep_last=40):
-        """ Remove old apartments CSV backups"""
-        backups = sorted(self.backups_dir.glob("apartments_*.csv"))
-        for old in backups[:-keep_last]:
-            old.unlink()
+    @staticmethod
+    def __record_ends(path, start=0):
+        """
+        Byte offsets just past every CSV record from start. Newlines inside quoted values (descriptions)
+        are skipped: a newline ends a record only when an even number of quotes precedes it.
+        """
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = np.frombuffer(f.read(), dtype=np.uint8)
 
-    def deduplicate_and_write(self, write_from_path=paths.APARTMENTS_PROCESSED_PATH):
-        """ Deduplicate and write apartments CSV """
-        self.backup()
-        self.cleanup_old_backups()
-        # Load new cleaned data
-        new_df = pd.read_csv(write_from_path)
+        quotes = np.flatnonzero(data == ord('"'))
+        newlines = np.flatnonzero(data == ord("\n"))
+        outside_quotes = np.searchsorted(quotes, newlines) % 2 == 0
+
+        return newlines[outside_quotes] + 1 + start
+
+    def __file_signature(self):
+        stat = self.csv_path.stat()
+        return np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+
+    def __save_url_index(self, index):
+        """ Persists url / row hashes and byte end offset of every CSV row (in file order) with the CSV size and mtime """
+        tmp_path = self.url_index_path.with_suffix(".tmp.npz")
+        np.savez(tmp_path, **index, signature=self.__file_signature())
+        os.replace(tmp_path, self.url_index_path)
+
+    def __build_url_index(self, df):
+        """ Index of the CSV that was just written from df """
+        record_ends = self.__record_ends(self.csv_path)
+        url_hashes, row_hashes = self.__hash_rows(df)
+        if len(record_ends) != len(df) + 1:
+            raise ValueError(f"{len(record_ends) - 1} CSV records found for {len(df)} rows")
+
+        return {"url_hashes": url_hashes, "row_hashes": row_hashes, "row_ends": record_ends[1:], "header_end": record_ends[:1]}
+
+    def __load_url_index(self, columns):
+        """ Loads the url index, rebuilding it from the CSV when it is missing or the CSV changed outside this class """
+        if self.url_index_path.exists():
+            with np.load(self.url_index_path) as index:
+                if np.array_equal(index["signature"], self.__file_signature()):
+                    return {name: index[name] for name in ["url_hashes", "row_hashes", "row_ends", "header_end"]}
+
+        print("[INFO] Building apartments CSV url index.")
+        index = self.__build_url_index(schema.read_processed_csv(self.csv_path)[columns])
+        self.__save_url_index(index)
+        return index
+
+    def __write_full(self, df):
+        """ Rewrites the whole CSV and its url index """
+        schema.write_processed_csv(df, self.csv_path)
+        self.__save_url_index(self.__build_url_index(df))
+
+    def __append_rows(self, path, df, index):
+        """ Appends df to the CSV at path and extends index with its rows """
+        appended_from = path.stat().st_size
+        schema.write_processed_csv(df, path, mode="a")
+
+        url_hashes, row_hashes = self.__hash_rows(df)
+        return {
+            "url_hashes": np.concatenate([index["url_hashes"], url_hashes]),
+            "row_hashes": np.concatenate([index["row_hashes"], row_hashes]),
+            "row_ends": np.concatenate([index["row_ends"], self.__record_ends(path, appended_from)]),
+            "header_end": index["header_end"],
+        }
+
+    def __merge_incremental(self, new_df):
+        """
+        Merges new rows into the existing CSV without parsing it:
+        - new URLs are appended to the end of the file
+        - URLs whose row changed are cut out of the file by byte offset and appended (same rows as
+          drop_duplicates(keep="last")); unchanged URLs keep their position
+        Returns the number of rows in the CSV.
+        """
+        columns = list(pd.read_csv(self.csv_path, nrows=0).columns)
+        if not set(new_df.columns) <= set(columns):
+            print("[WARN] New columns in apartments data, rewriting the whole CSV.")
+            return self.__merge_full(new_df)
 
-        # Load existing data if it exists
+        new_df = schema.apply_dtypes(new_df.reindex(columns=columns), schema.PROCESSED_DTYPES)
+        index = self.__load_url_index(columns)
+        url_hashes, row_hashes = index["url_hashes"], index["row_hashes"]
+        new_url_hashes, new_row_hashes = self.__hash_rows(new_df)
+
+        # Position of every new url among the stored ones (-1 when new), the last occurrence wins
+        is_last = ~pd.Index(url_hashes).duplicated(keep="last")
+        positions = pd.Index(url_hashes[is_last]).get_indexer(new_url_hashes)
+
+        is_new = positions < 0
+        is_changed = ~is_new & (row_hashes[is_last][positions] != new_row_hashes)
+        print(f"CSV | new: {int(is_new.sum())}, changed: {int(is_changed.sum())}, unchanged: {int((~is_new & ~is_changed).sum())}")
+
+        if not is_changed.any():
+            if is_new.any():
+                self.__save_url_index(self.__append_rows(self.csv_path, new_df[is_new], index))
+            return len(url_hashes) + int(is_new.sum())
+
+        # Changed rows: copy the byte ranges of all other rows to a new file, then append the new versions
+        keep = ~np.isin(url_hashes, new_url_hashes[is_changed])
+        row_starts = np.concatenate([index["header_end"], index["row_ends"][:-1]])
+
+        # Runs of consecutive kept rows become single copies
+        run_edges = np.flatnonzero(np.diff(np.concatenate([[False], keep, [False]]).astype(np.int8)))
+        run_starts, run_stops = run_edges[::2], run_edges[1::2]
+
+        tmp_path = self.csv_path.with_suffix(".tmp")
+        with open(self.csv_path, "rb") as src, open(tmp_path, "wb") as dst:
+            dst.write(src.read(int(index["header_end"][0])))
+            for first, stop in zip(run_starts, run_stops):
+                src.seek(int(row_starts[first]))
+                dst.write(src.read(int(index["row_ends"][stop - 1] - row_starts[first])))
+
+        kept_lengths = index["row_ends"][keep] - row_starts[keep]
+        kept_index = {
+            "url_hashes": url_hashes[keep],
+            "row_hashes": row_hashes[keep],
+            "row_ends": index["header_end"][0] + np.cumsum(kept_lengths),
+            "header_end": index["header_end"],
+        }
+
+        appended = is_new | is_changed
+        index = self.__append_rows(tmp_path, new_df[appended], kept_index)
+        os.replace(tmp_path, self.csv_path)
+        self.__save_url_index(index)
+        return len(index["url_hashes"])
+
+    def __merge_full(self, new_df):
+        """ Loads the whole CSV, deduplicates by url (latest wins) and rewrites it. Returns the number of rows """
         if self.csv_path.exists():
-            old_df = pd.read_csv(self.csv_path)
-            before_len = len(old_df)
-            df = pd.concat([old_df, new_df], ignore_index=True)
+            old_df = schema.read_processed_csv(self.csv_path)
+            df = schema.apply_dtypes(pd.concat([old_df, new_df], ignore_index=True), schema.PROCESSED_DTYPES)
         else:
-            before_len = 0
             df = new_df
 
         # Deduplicate
         df = df.dropna(subset="url")
         df = df.drop_duplicates(subset="url", keep="last")
 
-        after_len = len(df)
+        self.__write_full(df)
+        return len(df)
 
-        # Reporting
-        print(f"CSV | apartments rows: {after_len}")
-        if after_len == before_len:
-            return
+    def deduplicate_and_write(self, write_from_path=paths.APARTMENTS_PROCESSED_PATH, incremental=True):
+        """
+        Deduplicate and write apartments CSV.
+        incremental: merge through the persistent url index (append new, rewrite only when rows changed),
+        otherwise load, deduplicate and rewrite the whole file.
+        """
+        self.backup()
+        self.cleanup_old_backups()
+        # Load new cleaned data
+        new_df = schema.read_processed_csv(write_from_path)
+        new_df = new_df.dropna(subset="url").drop_duplicates(subset="url", keep="last")
+
+        if incremental and self.csv_path.exists():
+            rows = self.__merge_incremental(new_df)
+        else:
+            rows = self.__merge_full(new_df)
 
-        # Write back
-        df.to_csv(self.csv_path, index=False)
+        # Reporting
+        print(f"CSV | apartments rows: {rows}")
@@ -0,0 +1,170 @@
+from config import paths, schema
+from datastorage.split_sql_steps import split_sql_steps
+import duckdb
+import pandas as pd
+import re, time
+
+
+class DuckDBDatabase:
+    """
+    Local embedded warehouse with the PostgresDatabase interface (settings.STORAGE_BACKEND = "duckdb").
+    Same star schema (sql/01_DDL.sql), dimension defaults (postgresql 03) and view (postgresql 07) in a single
+    DuckDB file: no server, queries and group-bys run vectorized in-process.
+    """
+    def __init__(self, database_path=paths.DUCKDB_DATABASE_PATH):
+        self.database_path = database_path
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.__create_schema()
+
+    def __connect(self):
+        return duckdb.connect(str(self.database_path))
+
+    def __run_sql_file(self, conn, path):
+        """ Execute a SQL script in one transaction, step by step with timings """
+        with open(path, "r", encoding="utf-8") as f:
+            steps = split_sql_steps(f.read())
+
+        conn.execute("BEGIN")
+        for name, sql in steps:
+            start = time.perf_counter()
+            conn.execute(sql)
+            print(f"DuckDB | {path.name} | {name}: {time.perf_counter() - start:.2f}s")
+        conn.execute("COMMIT")
+
+    def __create_schema(self):
+        """ Star schema, default dimension rows and the apartments view, all idempotent """
+        with self.__connect() as conn:
+            conn.execute(paths.DUCKDB_DDL_01_PATH.read_text(encoding="utf-8"))
+            conn.execute(paths.DML_INIT_DIMENSIONS_03_PATH.read_text(encoding="utf-8"))
+
+            # 07_VIEWS.sql also holds the PostgreSQL materialized view, only the plain view is reused here
+            views = paths.VIEWS_07_PATH.read_text(encoding="utf-8")
+            conn.execute(re.search(r"CREATE OR REPLACE VIEW dw\.all_apartments_view AS.*?;", views, re.DOTALL).group(0))
+
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dw.all_apartments_mv AS SELECT * FROM dw.all_apartments_view"
+            )
+
+    @staticmethod
+    def __build_apartments_query(columns=None, transaction_types=None, cities=None, start_date=None, end_date=None,
+                                 limit=None, sample_percent=None):
+        """ Same query as PostgresDatabase.__build_apartments_query with DuckDB parameters and sampling. Returns (query, params) """
+        columns = list(columns) if columns is not None else schema.PROCESSED_COLUMNS
+        unknown = [column for column in columns if column not in schema.PROCESSED_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown apartment columns: {unknown}")
+
+        select_list = ", ".join(f'"{column}"' for column in columns)
+
+        conditions, params = [], {}
+        if transaction_types is not None:
+            conditions.append("list_contains($transaction_types, transaction_type)")
+            params["transaction_types"] = list(transaction_types)
+        if cities is not None:
+            conditions.append("list_contains($cities, city)")
+            params["cities"] = list(cities)
+        if start_date is not None:
+            conditions.append("upload_date >= $start_date")
+            params["start_date"] = pd.Timestamp(start_date).to_pydatetime()
+        if end_date is not None:
+            conditions.append("upload_date < $end_date")
+            params["end_date"] = pd.Timestamp(end_date).to_pydatetime()
+
+        query = f"SELECT {select_list} FROM dw.all_apartments_mv"
+        if sample_percent is not None:
+            query += f" TABLESAMPLE {float(sample_percent)}% (system)"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+
+        return query, params
+
+    def iter_apartments(self, columns=None, transaction_types=None, cities=None, start_date=None, end_date=None,
+                        limit=None, sample_percent=None, chunksize=100_000):
+        """ Streams apartments as DataFrames of about chunksize rows, same arguments and dtypes as PostgresDatabase.iter_apartments """
+        query, params = self.__build_apartments_query(
+            columns, transaction_types, cities, start_date, end_date, limit, sample_percent
+        )
+        vectors_per_chunk = max(1, -(-chunksize // duckdb.__standard_vector_size__))
+
+        with self.__connect() as conn:
+            result = conn.execute(query, params)
+            while True:
+                chunk = result.fetch_df_chunk(vectors_per_chunk)
+                if chunk.empty:
+                    break
+
+                yield schema.apply_dtypes(chunk, schema.PROCESSED_DTYPES)
+
+    def get_apartments(self, columns=None, transaction_types=None, cities=None, start_date=None, end_date=None,
+                       limit=None, sample_percent=None, chunksize=100_000):
+        """ Loads the apartments selected by iter_apartments into one DataFrame """
+        chunks = list(self.iter_apartments(
+            columns, transaction_types, cities, start_date, end_date, limit, sample_percent, chunksize
+        ))
+        if not chunks:
+            empty = pd.DataFrame(columns=list(columns) if columns is not None else schema.PROCESSED_COLUMNS)
+            return schema.apply_dtypes(empty, schema.PROCESSED_DTYPES)
+
+        # the concat mixes the categories of the chunks, cast again
+        return schema.apply_dtypes(pd.concat(chunks, ignore_index=True), schema.PROCESSED_DTYPES)
+
+    def get_all_apartments(self):
+        """ Reads all apartments data from dw.all_apartments_mv """
+        return self.get_apartments()
+
+    def get_apartments_by_transaction(self, transaction_type, columns=None):
+        """ Gets apartment data by transaction type """
+        return self.get_apartments_by_transactions([transaction_type], columns)[transaction_type]
+
+    def get_apartments_by_transactions(self, transaction_types, columns=None):
+        """ Gets apartment data of several transaction types in one scan, returns {transaction_type: DataFrame} """
+        if columns is not None and "transaction_type" not in columns:
+            columns = [*columns, "transaction_type"]
+
+        df = self.get_apartments(columns, transaction_types=transaction_types)
+
+        return {
+            transaction_type: df[df["transaction_type"] == transaction_type].reset_index(drop=True)
+            for transaction_type in transaction_types
+        }
+
+    def refresh_materialized_view(self):
+        """ Rebuilds dw.all_apartments_mv (DuckDB has no materialized views, it is a table). Every rebuild is a full
+            rewrite ordered by (transaction_type, upload_date), so the row group min/max prune the reader filters
+        """
+        start = time.perf_counter()
+        with self.__connect() as conn:
+            conn.execute("""
+                         CREATE OR REPLACE TABLE dw.all_apartments_mv AS
+                         SELECT *
+                         FROM dw.all_apartments_view
+                         ORDER BY transaction_type, upload_date
+                         """)
+        print(f"DuckDB | all_apartments_mv refreshed: {time.perf_counter() - start:.2f}s")
+
+    @staticmethod
+    def print_pool_metrics():
+        """ Embedded database: no connection pool to report """
+
+    def database_insertion(self, write_from_path=paths.APARTMENTS_PROCESSED_PATH):
+        """ Main method to insert the data written in the csv file to the database """
+        with self.__connect() as conn:
+            # 1. Load to staging: the processed CSV read as text, like the PostgreSQL staging table.
+            #    Every schema NA marker is NULL, as for schema.read_processed_csv
+            conn.execute(
+                "CREATE OR REPLACE TABLE sa.apartments AS "
+                "SELECT * FROM read_csv($path, header = true, all_varchar = true, nullstr = $na_values, quote = '\"', escape = '\"')",
+                {"path": str(write_from_path), "na_values": schema.NA_VALUES}
+            )
+
+            # 2. Run DML
+            self.__run_sql_file(conn, paths.DUCKDB_DML_ETL_FROM_STAGING_04_PATH)
+
+            # 3. Fetch fact table row count
+            fact_count = conn.execute("SELECT COUNT(*) FROM dw.fct_apartments").fetchone()[0]
+            print(f"DuckDB | fct_apartments rows: {fact_count}")
+
+        # 4. Refresh the denormalized table read by EDA and model training
+        self.refresh_materialized_view()
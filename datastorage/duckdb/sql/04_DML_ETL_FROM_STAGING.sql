@@ -0,0 +1,130 @@
+-- =====================================
+-- 04_DML_ETL_FROM_STAGING.sql (DuckDB)
+-- =====================================
+
+-- Same load as datastorage/postgresql/sql/04_DML_ETL_FROM_STAGING.sql, from sa.apartments (the processed CSV read
+-- as text by DuckDBDatabase). New dimension rows are inserted with NOT EXISTS instead of ON CONFLICT so that
+-- repeated keys within the batch are skipped too, the fact load joins the dimensions directly (hash joins).
+
+-- STEP: type staging rows
+CREATE OR REPLACE TEMP TABLE tmp_apartments AS
+SELECT
+    sa.url,
+    COALESCE(NULLIF(sa.street_address, ''), 'n.a') AS street_address,
+    COALESCE(NULLIF(sa.description, ''), 'n.a')    AS description,
+    COALESCE(NULLIF(sa.district_name, ''), 'n.a')  AS district_name,
+    sa.upload_date::TIMESTAMP                      AS upload_ts,
+
+    COALESCE(dc.city_surr_id, -1)                  AS city_surr_id,
+    COALESCE(dtt.transaction_type_surr_id, -1)     AS transaction_type_surr_id,
+    COALESCE(ds.source_surr_id, -1)                AS source_surr_id,
+
+    sa.price::DECIMAL(12,2)                        AS price,
+    sa.price_per_sqm::DECIMAL(10,2)                AS price_per_sqm,
+    sa.area_m2::DECIMAL(8,2)                       AS area_m2,
+    COALESCE(FLOOR(sa.bedrooms::DOUBLE)::INT, -1)  AS bedrooms,
+    COALESCE(FLOOR(sa.floor::DOUBLE)::INT, -1)     AS floor
+FROM sa.apartments sa
+LEFT JOIN dw.dim_cities dc
+    ON sa.city = dc.city_name
+LEFT JOIN dw.dim_transaction_types dtt
+    ON sa.transaction_type = dtt.transaction_type
+LEFT JOIN dw.dim_sources ds
+    ON sa.source = ds.source_name;
+
+-- STEP: insert dim_apartments
+INSERT INTO dw.dim_apartments (street_address, description, url)
+SELECT DISTINCT ON (t.url) t.street_address, t.description, t.url
+FROM tmp_apartments t
+WHERE t.url IS NOT NULL
+  AND NOT EXISTS (SELECT 1 FROM dw.dim_apartments da WHERE da.url = t.url);
+
+-- STEP: insert dim_districts
+INSERT INTO dw.dim_districts (city_surr_id, district_name)
+SELECT DISTINCT t.city_surr_id, t.district_name
+FROM tmp_apartments t
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM dw.dim_districts dd
+    WHERE dd.city_surr_id = t.city_surr_id
+      AND dd.district_name = t.district_name
+);
+
+-- STEP: insert dim_dates
+INSERT INTO dw.dim_dates (
+    date_dt,
+    date_year,
+    date_month,
+    date_day,
+    date_hour,
+    date_minute,
+    date_day_of_week
+)
+SELECT
+    dt,
+    EXTRACT(YEAR FROM dt)::INT,
+    EXTRACT(MONTH FROM dt)::INT,
+    EXTRACT(DAY FROM dt)::INT,
+    EXTRACT(HOUR FROM dt)::INT,
+    EXTRACT(MINUTE FROM dt)::INT,
+    EXTRACT(ISODOW FROM dt)::SMALLINT
+FROM (
+    SELECT DISTINCT upload_ts AS dt
+    FROM tmp_apartments
+    WHERE upload_ts IS NOT NULL
+) d
+WHERE NOT EXISTS (SELECT 1 FROM dw.dim_dates ddt WHERE ddt.date_dt = d.dt);
+
+-- STEP: load fct_apartments
+-- One fact row per apartment, as in PostgreSQL
+INSERT INTO dw.fct_apartments (
+    date_surr_id,
+    city_surr_id,
+    district_surr_id,
+    transaction_type_surr_id,
+    source_surr_id,
+    apartment_surr_id,
+    upload_ts,
+    price,
+    price_per_sqm,
+    area_m2,
+    bedrooms,
+    floor
+)
+SELECT DISTINCT ON (apartment_surr_id) *
+FROM (
+    SELECT
+        COALESCE(ddt.date_surr_id, -1)      AS date_surr_id,
+        t.city_surr_id,
+        COALESCE(dd.district_surr_id, -1)   AS district_surr_id,
+        t.transaction_type_surr_id,
+        t.source_surr_id,
+        COALESCE(da.apartment_surr_id, -1)  AS apartment_surr_id,
+        t.upload_ts,
+        t.price,
+        t.price_per_sqm,
+        t.area_m2,
+        t.bedrooms,
+        t.floor
+    FROM tmp_apartments t
+    LEFT JOIN dw.dim_apartments da
+        ON da.url = t.url
+    LEFT JOIN dw.dim_districts dd
+        ON dd.city_surr_id = t.city_surr_id
+       AND dd.district_name = t.district_name
+    LEFT JOIN dw.dim_dates ddt
+        ON ddt.date_dt = t.upload_ts
+    WHERE
+        t.price IS NOT NULL
+        AND t.price_per_sqm IS NOT NULL
+        AND t.area_m2 IS NOT NULL
+) batch
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM dw.fct_apartments fa
+    WHERE fa.apartment_surr_id = batch.apartment_surr_id
+);
+
+-- STEP: clean staging
+DROP TABLE tmp_apartments;
+DELETE FROM sa.apartments;
@@ -0,0 +1,14 @@
+from config import settings
+
+
+def get_database():
+    """ Storage backend selected by settings.STORAGE_BACKEND: PostgresDatabase (default) or the local DuckDBDatabase """
+    if settings.STORAGE_BACKEND == "duckdb":
+        from datastorage.duckdb.DuckDBDatabase import DuckDBDatabase
+        return DuckDBDatabase()
+
+    if settings.STORAGE_BACKEND == "postgresql":
+        from datastorage.postgresql.PostgresDatabase import PostgresDatabase
+        return PostgresDatabase()
+
+    raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
@@ -0,0 +1,180 @@
+import os, uuid
+import pandas as pd
+from config import paths
+
+
+class ParquetRawStore:
+    """
+    Append-only raw scrape history stored as Parquet files partitioned by scrape date and source:
+        <store_dir>/scrape_date=YYYY-MM-DD/source=<source>/part-<time>-<id>.parquet
+
+    A URL → latest partition file index keeps "latest scrape per URL" semantics without rewriting
+    history: a nightly append writes only the new batch and its index part, whatever the size of the store.
+    Rows superseded by a later scrape of the same URL stay on disk and are skipped by the reader.
+
+    The index is the compacted url_index.parquet plus the append-only parts of the later batches:
+        <store_dir>/url_index/part-<time>-<id>.parquet
+    Once COMPACT_EVERY parts accumulate they are merged into url_index.parquet.
+    """
+    COMPACT_EVERY = 30
+
+    def __init__(self, store_dir=paths.RAW_STORE_DIR, index_path=paths.RAW_STORE_URL_INDEX_PATH):
+        self.store_dir = store_dir
+        self.index_path = index_path
+        self.index_parts_dir = index_path.with_suffix("")
+
+    @staticmethod
+    def source_of(urls: pd.Series):
+        """ Partition value per URL, same source names as DataCleaning._normalize_source """
+        urls = urls.astype("string")
+        source = pd.Series("unknown", index=urls.index, dtype="string")
+        source = source.mask(urls.str.contains("ss.ge", regex=False).fillna(False), "home.ss.ge")
+        source = source.mask(urls.str.contains("livo.ge", regex=False).fillna(False), "livo.ge")
+        source = source.mask(urls.str.contains("myhome.ge", regex=False).fillna(False), "myhome.ge")
+        return source
+
+    def __index_parts(self):
+        """ Index parts not compacted yet, oldest first """
+        return sorted(self.index_parts_dir.glob("part-*.parquet"))
+
+    def is_empty(self):
+        return not self.index_path.exists() and not self.__index_parts()
+
+    def load_index(self):
+        """ URL → (scraped_at, file) of the latest scrape of every URL in the store """
+        return self.__load_index(self.__index_parts())
+
+    def __load_index(self, parts):
+        frames = [pd.read_parquet(path) for path in [self.index_path, *parts] if path.exists()]
+        if not frames:
+            return pd.DataFrame({
+                "url": pd.Series(dtype="string"), "scraped_at": pd.Series(dtype="datetime64[ns]"), "file": pd.Series(dtype="string")
+            })
+
+        # A URL points at the partition holding its latest scrape (same rule as the old all_data.csv dedup)
+        index_df = pd.concat(frames, ignore_index=True)
+        return (index_df.sort_values("scraped_at", kind="stable")
+                .drop_duplicates(subset=["url"], keep="last")
+                .reset_index(drop=True))
+
+    def __compact_index(self):
+        """ Merges the index parts into url_index.parquet. A crash before the parts are removed only leaves duplicates """
+        parts = self.__index_parts()
+        if len(parts) < self.COMPACT_EVERY:
+            return
+
+        index_df = self.__load_index(parts)
+        tmp_path = self.index_path.with_suffix(".tmp")
+        index_df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.index_path)
+
+        for path in parts:
+            path.unlink()
+        print(f"[INFO] Raw store: compacted {len(parts)} index parts, {len(index_df)} URLs total.")
+
+    def append(self, df, scraped_at=None):
+        """
+        Writes a scrape batch into its partitions and points the URL index at the new rows.
+        Rows without a url are skipped, the last row wins for URLs repeated within the batch.
+        Returns the number of rows written.
+        """
+        if df.empty or "url" not in df.columns:
+            print("[WARN] Nothing to store: empty batch or missing 'url' column.")
+            return 0
+
+        batch = df.dropna(subset=["url"]).drop_duplicates(subset=["url"], keep="last").copy()
+        if "scraped_at" not in batch.columns:
+            batch["scraped_at"] = scraped_at or pd.Timestamp.now()
+
+        # Raw values are scraped text, store them as strings so mixed types never break the Parquet schema
+        for column in batch.columns.drop("scraped_at"):
+            batch[column] = batch[column].astype("string")
+        batch["scraped_at"] = pd.to_datetime(batch["scraped_at"], errors="coerce").fillna(pd.Timestamp.now())
+
+        partitions = pd.DataFrame({
+            "scrape_date": batch["scraped_at"].dt.strftime("%Y-%m-%d"),
+            "source": self.source_of(batch["url"]),
+        })
+
+        written = []
+        part_name = f"part-{pd.Timestamp.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet"
+        for (scrape_date, source), rows in batch.groupby([partitions["scrape_date"], partitions["source"]], sort=False):
+            relative_path = f"scrape_date={scrape_date}/source={source}/{part_name}"
+            file_path = self.store_dir / relative_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            rows.to_parquet(file_path, index=False)
+
+            written.append(pd.DataFrame({
+                "url": rows["url"], "scraped_at": rows["scraped_at"], "file": relative_path
+            }))
+
+        # Written after the partitions: an interrupted append leaves only unindexed rows, which the reader skips
+        self.index_parts_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_parts_dir / f"{part_name}.tmp"
+        pd.concat(written, ignore_index=True).to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, self.index_parts_dir / part_name)
+
+        print(f"[INFO] Raw store: {len(batch)} rows written to {len(written)} partitions.")
+        self.__compact_index()
+        return len(batch)
+
+    def read(self, columns=None, start_date=None, end_date=None, latest_only=True):
+        """
+        Loads raw rows, reading only the needed partitions and columns.
+
+        columns: columns to load (None loads all), url and scraped_at are always included
+        start_date / end_date: inclusive scrape date range used to prune partitions
+        latest_only: keep only the latest scrape of every URL (the old all_data.csv content)
+        """
+        start = pd.Timestamp(start_date).strftime("%Y-%m-%d") if start_date is not None else None
+        end = pd.Timestamp(end_date).strftime("%Y-%m-%d") if end_date is not None else None
+
+        if columns is not None:
+            columns = list(dict.fromkeys(["url", "scraped_at", *columns]))
+
+        files = []
+        for date_dir in sorted(self.store_dir.glob("scrape_date=*")):
+            scrape_date = date_dir.name.split("=", 1)[1]
+            if (start and scrape_date < start) or (end and scrape_date > end):
+                continue
+            files.extend(sorted(date_dir.glob("source=*/*.parquet")))
+
+        if latest_only:
+            index_df = self.load_index()
+            latest_files = set(index_df["file"].unique())
+            files = [file for file in files if file.relative_to(self.store_dir).as_posix() in latest_files]
+
+        if not files:
+            return pd.DataFrame(columns=columns or [])
+
+        frames = []
+        for file in files:
+            frame = pd.read_parquet(file, columns=columns)
+            frame["file"] = file.relative_to(self.store_dir).as_posix()
+            frames.append(frame)
+
+        df = pd.concat(frames, ignore_index=True)
+
+        if latest_only:
+            index_df = index_df[index_df["file"].isin(df["file"].unique())]
+            df = df.merge(index_df[["url", "file"]], on=["url", "file"], how="inner")
+
+        return df.drop(columns="file").sort_values("scraped_at", kind="stable").reset_index(drop=True)
+
+    def import_csv(self, csv_path=paths.ALL_RAW_DATA_PATH, chunksize=200_000):
+        """ One-time migration of the legacy all_data.csv into the store, partitioned by each row's scraped_at """
+        if not self.is_empty():
+            print(f"[INFO] Raw store already initialized, skipping import of {csv_path}.")
+            return 0
+
+        if not os.path.exists(csv_path) or os.path.getsize(csv_path) == 0:
+            return 0
+
+        imported = 0
+        for chunk in pd.read_csv(csv_path, dtype="string", chunksize=chunksize):
+            if "scraped_at" in chunk.columns:
+                chunk["scraped_at"] = pd.to_datetime(chunk["scraped_at"], errors="coerce")
+            imported += self.append(chunk)
+
+        print(f"[INFO] Imported {imported} rows from {csv_path} into the raw store.")
+        return imported
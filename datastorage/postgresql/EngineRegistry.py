@@ -0,0 +1,128 @@
+import threading, time
+from sqlalchemy import create_engine, event
+from sqlalchemy.pool import QueuePool
+from config import settings
+
+
+class TimedQueuePool(QueuePool):
+    """ QueuePool measuring how long every checkout waited for a connection """
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class PoolMetrics:
+    """ Checkout counters of one pool, fed by pool events """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.connections_created = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.held_total = 0.0
+        self.age_total = 0.0
+        self.age_max = 0.0
+
+    def record_wait(self, seconds):
+        with self.lock:
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def attach(self, engine):
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            connection_record.info["created_at"] = time.monotonic()
+            with self.lock:
+                self.connections_created += 1
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            now = time.monotonic()
+            connection_record.info["checked_out_at"] = now
+            age = now - connection_record.info.get("created_at", now)
+            with self.lock:
+                self.checkouts += 1
+                self.age_total += age
+                self.age_max = max(self.age_max, age)
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            checked_out_at = connection_record.info.pop("checked_out_at", None)
+            if checked_out_at is not None:
+                with self.lock:
+                    self.held_total += time.monotonic() - checked_out_at
+
+    def summary(self):
+        with self.lock:
+            checkouts = max(self.checkouts, 1)
+            return {
+                "checkouts": self.checkouts,
+                "connections_created": self.connections_created,
+                "wait_total_s": round(self.wait_total, 3),
+                "wait_max_s": round(self.wait_max, 3),
+                "held_avg_s": round(self.held_total / checkouts, 3),
+                "connection_age_avg_s": round(self.age_total / checkouts, 1),
+                "connection_age_max_s": round(self.age_max, 1),
+            }
+
+
+class EngineRegistry:
+    """
+    Process-wide SQLAlchemy engines, one per database URL.
+    Every PostgresDatabase (pipeline, EDA, training) shares the same connection pool instead of creating its own engine.
+    """
+    _engines = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get_engine(cls, db_url):
+        with cls._lock:
+            if db_url not in cls._engines:
+                cls._engines[db_url] = cls.__create_engine(db_url)
+            return cls._engines[db_url]
+
+    @staticmethod
+    def __create_engine(db_url):
+        connect_args = {}
+        if settings.POSTGRES_STATEMENT_TIMEOUT_MS and db_url.startswith("postgresql"):
+            connect_args["options"] = f"-c statement_timeout={settings.POSTGRES_STATEMENT_TIMEOUT_MS}"
+
+        engine = create_engine(
+            db_url,
+            poolclass=TimedQueuePool,
+            pool_size=settings.POSTGRES_POOL_SIZE,
+            max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+            pool_timeout=settings.POSTGRES_POOL_TIMEOUT_S,
+            pool_recycle=settings.POSTGRES_POOL_RECYCLE_S,
+            pool_pre_ping=True,  # drop connections closed by the server before handing them out
+            connect_args=connect_args,
+        )
+        engine.pool.metrics = PoolMetrics()
+        engine.pool.metrics.attach(engine)
+        return engine
+
+    @classmethod
+    def pool_metrics(cls):
+        """ {database url (without password): pool metrics and status} of every engine created in this process """
+        with cls._lock:
+            engines = dict(cls._engines)
+
+        return {
+            engine.url.render_as_string(hide_password=True): {**engine.pool.metrics.summary(), "status": engine.pool.status()}
+            for engine in engines.values()
+        }
+
+    @classmethod
+    def dispose_all(cls):
+        """ Closes every pooled connection (e.g. after a fork) """
+        with cls._lock:
+            for engine in cls._engines.values():
+                engine.dispose()
@@ -1,14 +1,27 @@
-from config import paths, settings
-from sqlalchemy import create_engine, text
+from config import paths, settings, schema
+from datastorage.postgresql.EngineRegistry import EngineRegistry
+from datastorage.split_sql_steps import split_sql_steps
+from sqlalchemy import text
 import pandas as pd
+import io, time
 
 
 class PostgresDatabase:
+    # The pooled connections carry settings.POSTGRES_STATEMENT_TIMEOUT_MS for the read path. The load statements
+    # (COPY, ETL script, materialized view refresh) scale with the full history, each of their transactions lifts it
+    NO_STATEMENT_TIMEOUT = "SET LOCAL statement_timeout = 0"
+
     def __init__(self):
         db_url = settings.DATABASE_URL
         if not db_url:
             raise RuntimeError("DATABASE_URL not set")
-        self.engine = create_engine(db_url)
+        self.engine = EngineRegistry.get_engine(db_url)  # shared pool, see config.settings POSTGRES_*
+
+    @staticmethod
+    def print_pool_metrics():
+        """ Prints checkouts, wait time and connection age of the connection pools used by this process """
+        for db_url, metrics in EngineRegistry.pool_metrics().items():
+            print(f"PostgreSQL | pool {db_url}: {metrics}")
 
     def __load_to_staging(self, df):
         """ Append processed data into sa.apartments """
@@ -22,11 +35,47 @@ class PostgresDatabase:
             chunksize=1000
         )
 
+    def __copy_to_staging(self, frames):
+        """
+        Streams processed DataFrames (e.g. the blocks of schema.iter_processed_csv) into sa.apartments with
+        COPY FROM STDIN, all in one transaction. No INSERT statements: Postgres parses the CSV itself.
+        Each block is written back with its missing values as schema.NA_REP, the COPY NULL marker, so every schema
+        NA token ('', 'N/A', 'NA', ...) is NULL in staging as on the INSERT path. Returns the number of rows.
+        """
+        connection = self.engine.raw_connection()
+        rows = 0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(self.NO_STATEMENT_TIMEOUT)
+                for df in frames:
+                    column_list = ", ".join('"' + column.replace('"', '""') + '"' for column in df.columns)
+                    copy_sql = f"COPY sa.apartments ({column_list}) FROM STDIN WITH (FORMAT csv, HEADER true, NULL '{schema.NA_REP}')"
+
+                    buffer = io.StringIO()
+                    schema.write_processed_csv(df, buffer)
+                    buffer.seek(0)
+                    cursor.copy_expert(copy_sql, buffer, size=1 << 20)
+                    rows += cursor.rowcount
+            connection.commit()
+        except Exception:
+            connection.rollback()  # COPY is all or nothing, staging is left as it was
+            raise
+        finally:
+            connection.close()
+
+        return rows
+
     def __run_sql_file(self, path):
-        """ Execute a SQL script (DDL/DML/etc) """
+        """ Execute a SQL script (DDL/DML/etc) in one transaction, step by step with timings """
+        with open(path, "r", encoding="utf-8") as f:
+            steps = split_sql_steps(f.read())
+
         with self.engine.begin() as conn:
-            with open(path, "r", encoding="utf-8") as f:
-                conn.execute(text(f.read()))
+            conn.execute(text(self.NO_STATEMENT_TIMEOUT))
+            for name, sql in steps:
+                start = time.perf_counter()
+                conn.execute(text(sql))
+                print(f"PostgreSQL | {path.name} | {name}: {time.perf_counter() - start:.2f}s")
 
     def _fetch_one(self, query):
         """ Execute a SQL query and return the result """
@@ -34,31 +83,141 @@ class PostgresDatabase:
             result = conn.execute(text(query))
             return result.scalar()
 
+    @staticmethod
+    def __build_apartments_query(columns=None, transaction_types=None, cities=None, start_date=None, end_date=None,
+                                 limit=None, sample_percent=None):
+        """
+        SELECT over dw.all_apartments_mv with the column list and filters pushed into SQL.
+        Column names are checked against schema.PROCESSED_COLUMNS, every value is a bound parameter.
+        Returns (query, params).
+        """
+        columns = list(columns) if columns is not None else schema.PROCESSED_COLUMNS
+        unknown = [column for column in columns if column not in schema.PROCESSED_COLUMNS]
+        if unknown:
+            raise ValueError(f"Unknown apartment columns: {unknown}")
+
+        select_list = ", ".join(f'"{column}"' for column in columns)
+        sample = " TABLESAMPLE SYSTEM (:sample_percent)" if sample_percent is not None else ""
+
+        conditions, params = [], {}
+        if transaction_types is not None:
+            conditions.append("transaction_type = ANY(:transaction_types)")
+            params["transaction_types"] = list(transaction_types)
+        if cities is not None:
+            conditions.append("city = ANY(:cities)")
+            params["cities"] = list(cities)
+        if start_date is not None:
+            conditions.append("upload_date >= :start_date")
+            params["start_date"] = pd.Timestamp(start_date).to_pydatetime()
+        if end_date is not None:
+            conditions.append("upload_date < :end_date")
+            params["end_date"] = pd.Timestamp(end_date).to_pydatetime()
+        if sample_percent is not None:
+            params["sample_percent"] = float(sample_percent)
+
+        query = f"SELECT {select_list} FROM dw.all_apartments_mv{sample}"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        if limit is not None:
+            query += " LIMIT :limit"
+            params["limit"] = int(limit)
+
+        return text(query), params
+
+    def iter_apartments(self, columns=None, transaction_types=None, cities=None, start_date=None, end_date=None,
+                        limit=None, sample_percent=None, chunksize=100_000):
+        """
+        Streams apartments from dw.all_apartments_mv as DataFrames of up to chunksize rows, through a server-side cursor.
+        Every chunk has the schema.PROCESSED_DTYPES of its columns, whatever NULLs it holds.
+
+        columns: columns to load (None loads all, see schema.ANALYSIS_COLUMNS for the EDA / training set)
+        transaction_types / cities: keep only these values
+        start_date / end_date: upload_date range [start_date, end_date)
+        limit: maximum number of rows
+        sample_percent: TABLESAMPLE SYSTEM percentage of the view pages to read
+        """
+        query, params = self.__build_apartments_query(
+            columns, transaction_types, cities, start_date, end_date, limit, sample_percent
+        )
+        columns = list(columns) if columns is not None else schema.PROCESSED_COLUMNS
+        parse_dates = [column for column in schema.PROCESSED_DATE_COLUMNS if column in columns]
+
+        with self.engine.connect().execution_options(stream_results=True, max_row_buffer=chunksize) as conn:
+            for chunk in pd.read_sql(query, conn, params=params, parse_dates=parse_dates, chunksize=chunksize):
+                # read_sql infers the dtypes per chunk: int or float / object for an all NULL column, Decimal prices
+                yield schema.apply_dtypes(chunk, schema.PROCESSED_DTYPES)
+
+    def get_apartments(self, columns=None, transaction_types=None, cities=None, start_date=None, end_date=None,
+                       limit=None, sample_percent=None, chunksize=100_000):
+        """ Loads the apartments selected by iter_apartments into one DataFrame """
+        chunks = list(self.iter_apartments(
+            columns, transaction_types, cities, start_date, end_date, limit, sample_percent, chunksize
+        ))
+        if not chunks:
+            empty = pd.DataFrame(columns=list(columns) if columns is not None else schema.PROCESSED_COLUMNS)
+            return schema.apply_dtypes(empty, schema.PROCESSED_DTYPES)
+
+        # the concat mixes the categories of the chunks, cast again
+        return schema.apply_dtypes(pd.concat(chunks, ignore_index=True), schema.PROCESSED_DTYPES)
+
     def get_all_apartments(self):
-        """ Calls dw.all_apartments VIEW to get all apartments data from postgresql database """
-        query = """SELECT * FROM dw.all_apartments_view"""
-        return pd.read_sql(query, self.engine, parse_dates=["upload_date"])
+        """ Reads all apartments data from the dw.all_apartments_mv materialized view """
+        return self.get_apartments()
 
-    def get_apartments_by_transaction(self, transaction_type):
+    def get_apartments_by_transaction(self, transaction_type, columns=None):
         """ Gets apartment data by transaction type """
-        query = text("""
-                     SELECT *
-                     FROM dw.all_apartments_view
-                     WHERE transaction_type = :transaction_type
-                     """)
-
-        return pd.read_sql(
-            query,
-            self.engine,
-            params={"transaction_type": transaction_type},
-            parse_dates=["upload_date"]
+        return self.get_apartments_by_transactions([transaction_type], columns)[transaction_type]
+
+    def get_apartments_by_transactions(self, transaction_types, columns=None):
+        """ Gets apartment data of several transaction types in one indexed scan, returns {transaction_type: DataFrame} """
+        if columns is not None and "transaction_type" not in columns:
+            columns = [*columns, "transaction_type"]
+
+        df = self.get_apartments(columns, transaction_types=transaction_types)
+
+        return {
+            transaction_type: df[df["transaction_type"] == transaction_type].reset_index(drop=True)
+            for transaction_type in transaction_types
+        }
+
+    def __ensure_materialized_view(self):
+        """ Creates dw.all_apartments_mv and its indexes (07_VIEWS.sql) when the view or its unique index is missing.
+            Returns True when the view was (re)built, it is then already up to date
+        """
+        exists = self._fetch_one(
+            "SELECT COUNT(*) FROM pg_indexes "
+            "WHERE schemaname = 'dw' AND indexname = 'uq_all_apartments_mv_apartment_fct_surr_id'"
         )
+        if exists:
+            return False
+
+        print("PostgreSQL | all_apartments_mv missing or outdated, running 07_VIEWS.sql")
+        self.__run_sql_file(paths.VIEWS_07_PATH)
+        return True
+
+    def refresh_materialized_view(self):
+        """ Recomputes dw.all_apartments_mv (and its indexes) from the fact and dimension tables.
+            CONCURRENTLY: the view stays readable by the API / EDA while it is rebuilt
+        """
+        if self.__ensure_materialized_view():
+            return
+
+        start = time.perf_counter()
+        with self.engine.begin() as conn:
+            conn.execute(text(self.NO_STATEMENT_TIMEOUT))
+            conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY dw.all_apartments_mv"))
+        print(f"PostgreSQL | all_apartments_mv refreshed: {time.perf_counter() - start:.2f}s")
 
     def database_insertion(self, write_from_path=paths.APARTMENTS_PROCESSED_PATH):
         """ Main method to insert the data written in the csv file to the database """
-        # 1. Load to staging
-        df = pd.read_csv(write_from_path)
-        self.__load_to_staging(df)
+        # 1. Load to staging (COPY, or INSERTs when the driver / file does not support it)
+        try:
+            rows = self.__copy_to_staging(schema.iter_processed_csv(write_from_path))
+            print(f"PostgreSQL | staging rows copied: {rows}")
+        except Exception as e:
+            print(f"[WARN] COPY into sa.apartments failed, loading with INSERTs instead: {e}")
+            df = schema.read_processed_csv(write_from_path)
+            self.__load_to_staging(df)
 
         # 2. Run DML
         self.__run_sql_file(paths.DML_ETL_FROM_STAGING_04_PATH)
@@ -66,3 +225,6 @@ class PostgresDatabase:
         # 3. Fetch fact table row count
         fact_count = self._fetch_one("SELECT COUNT(*) FROM dw.fct_apartments")
         print(f"PostgreSQL | fct_apartments rows: {fact_count}")
+
+        # 4. Refresh the denormalized view read by EDA and model training
+        self.refresh_materialized_view()
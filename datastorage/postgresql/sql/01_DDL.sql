@@ -2,6 +2,15 @@
 -- 01_DDL.sql
 -- =====================================
 
+-- UNIQUE NULLS NOT DISTINCT on dw.fct_apartments needs PostgreSQL 15 or newer
+DO $$
+BEGIN
+    IF current_setting('server_version_num')::INT < 150000 THEN
+        RAISE EXCEPTION 'PostgreSQL 15 or newer is required, the server is %', current_setting('server_version');
+    END IF;
+END;
+$$;
+
 /* 1. Create DW schema */
 CREATE SCHEMA IF NOT EXISTS dw;
 
@@ -77,14 +86,25 @@ CREATE TABLE IF NOT EXISTS dw.dim_apartments (
 );
 
 -- 7. FCT_APARTMENTS
+-- Range-partitioned by upload month (upload_ts is dim_dates.date_dt denormalized into the fact table), so
+-- time-windowed queries only read the matching monthly partitions. Listings without an upload date have a NULL
+-- upload_ts and land in the DEFAULT partition. Monthly partitions are created by dw.ensure_fct_apartments_partition.
+-- A unique constraint on a partitioned table must include the partition key, so there is no PRIMARY KEY and the
+-- apartment is unique together with its upload_ts: UNIQUE NULLS NOT DISTINCT (apartment_surr_id, upload_ts), also
+-- for the NULL upload_ts of the DEFAULT partition (PostgreSQL 15+). Concurrent loads or manual inserts of the same
+-- fact fail (the ETL skips them with ON CONFLICT). The constraint cannot see across partitions: the same apartment
+-- with two different upload dates is only kept out by the ETL (04) NOT EXISTS check. Ids come from the sequence.
+CREATE SEQUENCE IF NOT EXISTS dw.fct_apartments_surr_id_seq AS BIGINT;
+
 CREATE TABLE IF NOT EXISTS dw.fct_apartments (
-    apartment_fct_surr_id BIGINT GENERATED BY DEFAULT AS IDENTITY NOT NULL,
+    apartment_fct_surr_id BIGINT NOT NULL DEFAULT nextval('dw.fct_apartments_surr_id_seq'),
     date_surr_id BIGINT NOT NULL,
     city_surr_id BIGINT NOT NULL,
     district_surr_id BIGINT NOT NULL,
     source_surr_id BIGINT NOT NULL,
     transaction_type_surr_id BIGINT NOT NULL,
     apartment_surr_id BIGINT NOT NULL,
+    upload_ts TIMESTAMP,
 
     price DECIMAL(12,2) NOT NULL,
     price_per_sqm DECIMAL(10,2) NOT NULL,
@@ -92,8 +112,6 @@ CREATE TABLE IF NOT EXISTS dw.fct_apartments (
     bedrooms INT NOT NULL,
     floor INT NOT NULL,
 
-    CONSTRAINT pk_fct_apartments PRIMARY KEY (apartment_fct_surr_id),
-
     CONSTRAINT fk_fct_date
         FOREIGN KEY (date_surr_id)
         REFERENCES dw.dim_dates (date_surr_id),
@@ -118,10 +136,60 @@ CREATE TABLE IF NOT EXISTS dw.fct_apartments (
         FOREIGN KEY (apartment_surr_id)
         REFERENCES dw.dim_apartments (apartment_surr_id),
 
-    CONSTRAINT uq_dim_apartment_date_surr_id UNIQUE (apartment_surr_id),
+    CONSTRAINT uq_fct_apartments_apartment_upload_ts UNIQUE NULLS NOT DISTINCT (apartment_surr_id, upload_ts),
+
     CONSTRAINT ck_price_non_negative CHECK (price >= 0),
     CONSTRAINT ck_price_per_sqm_non_negative CHECK (price_per_sqm >= 0),
     CONSTRAINT ck_area_non_negative CHECK (area_m2 >= 0),
     CONSTRAINT ck_bedrooms_valid CHECK (bedrooms >= -1),
     CONSTRAINT ck_floor_valid CHECK (floor >= -1)
-);
+) PARTITION BY RANGE (upload_ts);
+
+-- A fact table created before the partitioning (a heap without upload_ts) is left as it is until
+-- 08_MIGRATION_PARTITION_FCT_APARTMENTS.sql replaces it: the statements below only apply to the partitioned table
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'dw.fct_apartments'::regclass) THEN
+        RAISE NOTICE 'dw.fct_apartments is not partitioned yet, run 08_MIGRATION_PARTITION_FCT_APARTMENTS.sql';
+        RETURN;
+    END IF;
+
+    ALTER SEQUENCE dw.fct_apartments_surr_id_seq OWNED BY dw.fct_apartments.apartment_fct_surr_id;
+
+    CREATE TABLE IF NOT EXISTS dw.fct_apartments_default PARTITION OF dw.fct_apartments DEFAULT;
+
+    -- Indexes are created on every partition
+    CREATE INDEX IF NOT EXISTS brin_fct_apartments_upload_ts
+        ON dw.fct_apartments USING BRIN (upload_ts);
+
+    CREATE INDEX IF NOT EXISTS idx_fct_apartments_transaction_type_city
+        ON dw.fct_apartments (transaction_type_surr_id, city_surr_id);
+
+    -- Fact tables created before the unique constraint: add it, its index also serves the ETL apartment lookups
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_fct_apartments_apartment_upload_ts'
+    ) THEN
+        ALTER TABLE dw.fct_apartments
+            ADD CONSTRAINT uq_fct_apartments_apartment_upload_ts UNIQUE NULLS NOT DISTINCT (apartment_surr_id, upload_ts);
+    END IF;
+
+    DROP INDEX IF EXISTS dw.idx_fct_apartments_apartment_surr_id;
+END;
+$$;
+
+-- Creates the monthly partition holding month_start if it does not exist yet
+CREATE OR REPLACE FUNCTION dw.ensure_fct_apartments_partition(month_start TIMESTAMP)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    partition_start TIMESTAMP := date_trunc('month', month_start);
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS dw.%I PARTITION OF dw.fct_apartments FOR VALUES FROM (%L) TO (%L)',
+        'fct_apartments_' || to_char(partition_start, 'YYYY_MM'),
+        partition_start,
+        partition_start + INTERVAL '1 month'
+    );
+END;
+$$;
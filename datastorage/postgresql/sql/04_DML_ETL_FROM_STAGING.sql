@@ -1,81 +1,166 @@
 -- =====================================
--- 04_DML_ETL_INIT_DIMENSIONS.sql
+-- 04_DML_ETL_FROM_STAGING.sql
 -- =====================================
 
--- INSERT FROM STAGING TABLE TO DIMENSION TABLES
+-- Runs as ONE transaction (PostgresDatabase.__run_sql_file), every "-- STEP:" block is executed and timed separately.
+-- Staging rows are typed and keyed once into a temp table, dimensions are upserted from their distinct keys
+-- and the resolved surrogate ids are kept in small keyed mapping tables, so the fact load is a single insert
+-- joining staging to the mappings only. Temp tables are dropped at commit.
 
--- LOAD DIM_APARTMENTS
-BEGIN;
-
-INSERT INTO dw.dim_apartments (
-    street_address,
-    description,
-    url
-)
-SELECT DISTINCT
-    COALESCE(NULLIF(street_address, ''), 'n.a') AS street_address,
-    COALESCE(NULLIF(description, ''), 'n.a') AS description,
-    url
-FROM sa.apartments
-WHERE url IS NOT NULL
-ON CONFLICT (url) DO NOTHING
-RETURNING *;
-
-COMMIT;
+-- STEP: type staging rows
+CREATE TEMP TABLE tmp_apartments ON COMMIT DROP AS
+SELECT
+    sa.url,
+    COALESCE(NULLIF(sa.street_address, ''), 'n.a') AS street_address,
+    COALESCE(NULLIF(sa.description, ''), 'n.a')    AS description,
+    COALESCE(NULLIF(sa.district_name, ''), 'n.a')  AS district_name,
+    sa.upload_date::timestamp                      AS upload_ts,
 
--- LOAD DIM_DISTRICTS
-BEGIN;
+    COALESCE(dc.city_surr_id, -1)                  AS city_surr_id,
+    COALESCE(dtt.transaction_type_surr_id, -1)     AS transaction_type_surr_id,
+    COALESCE(ds.source_surr_id, -1)                AS source_surr_id,
 
-INSERT INTO dw.dim_districts (
-    city_surr_id,
-    district_name
-)
-SELECT DISTINCT
-    COALESCE(dc.city_surr_id, -1) AS city_surr_id,
-    COALESCE(NULLIF(sa.district_name, ''), 'n.a') AS district_name
+    sa.price::DECIMAL(12,2)                        AS price,
+    sa.price_per_sqm::DECIMAL(10,2)                AS price_per_sqm,
+    sa.area_m2::DECIMAL(8,2)                       AS area_m2,
+    COALESCE(FLOOR(sa.bedrooms::NUMERIC)::INT, -1) AS bedrooms,
+    COALESCE(FLOOR(sa.floor::NUMERIC)::INT, -1)    AS floor
 FROM sa.apartments sa
+-- Small static dimensions, resolved once here
 LEFT JOIN dw.dim_cities dc
     ON sa.city = dc.city_name
-ON CONFLICT (city_surr_id, district_name) DO NOTHING
-RETURNING *;
-
-COMMIT;
-
--- LOAD DIM_DATES
-BEGIN;
-
-INSERT INTO dw.dim_dates (
-    date_dt,
-    date_year,
-    date_month,
-    date_day,
-    date_hour,
-    date_minute,
-    date_day_of_week
+LEFT JOIN dw.dim_transaction_types dtt
+    ON sa.transaction_type = dtt.transaction_type
+LEFT JOIN dw.dim_sources ds
+    ON sa.source = ds.source_name;
+
+-- Temp tables are never auto-analyzed
+ANALYZE tmp_apartments;
+
+-- STEP: create mapping tables
+CREATE TEMP TABLE tmp_apartment_ids (
+    url               TEXT PRIMARY KEY,
+    apartment_surr_id BIGINT NOT NULL
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE tmp_district_ids (
+    city_surr_id      BIGINT NOT NULL,
+    district_name     TEXT NOT NULL,
+    district_surr_id  BIGINT NOT NULL,
+    PRIMARY KEY (city_surr_id, district_name)
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE tmp_date_ids (
+    date_dt           TIMESTAMP PRIMARY KEY,
+    date_surr_id      BIGINT NOT NULL
+) ON COMMIT DROP;
+
+-- STEP: upsert dim_apartments
+-- New rows come back through RETURNING, existing ones through the url key (the statement snapshot does not see
+-- the rows it inserts, so both sides are disjoint)
+WITH apartment_keys AS (
+    SELECT DISTINCT street_address, description, url
+    FROM tmp_apartments
+    WHERE url IS NOT NULL
+),
+inserted AS (
+    INSERT INTO dw.dim_apartments (
+        street_address,
+        description,
+        url
+    )
+    SELECT street_address, description, url
+    FROM apartment_keys
+    ON CONFLICT (url) DO NOTHING
+    RETURNING url, apartment_surr_id
+)
+INSERT INTO tmp_apartment_ids (url, apartment_surr_id)
+SELECT url, apartment_surr_id
+FROM inserted
+UNION ALL
+SELECT da.url, da.apartment_surr_id
+FROM dw.dim_apartments da
+JOIN (SELECT DISTINCT url FROM apartment_keys) k
+    ON k.url = da.url;
+
+-- STEP: upsert dim_districts
+WITH district_keys AS (
+    SELECT DISTINCT city_surr_id, district_name
+    FROM tmp_apartments
+),
+inserted AS (
+    INSERT INTO dw.dim_districts (
+        city_surr_id,
+        district_name
+    )
+    SELECT city_surr_id, district_name
+    FROM district_keys
+    ON CONFLICT (city_surr_id, district_name) DO NOTHING
+    RETURNING city_surr_id, district_name, district_surr_id
+)
+INSERT INTO tmp_district_ids (city_surr_id, district_name, district_surr_id)
+SELECT city_surr_id, district_name, district_surr_id
+FROM inserted
+UNION ALL
+SELECT dd.city_surr_id, dd.district_name, dd.district_surr_id
+FROM dw.dim_districts dd
+JOIN district_keys k
+    ON k.city_surr_id = dd.city_surr_id
+   AND k.district_name = dd.district_name;
+
+-- STEP: upsert dim_dates
+WITH date_keys AS (
+    SELECT DISTINCT upload_ts AS dt
+    FROM tmp_apartments
+    WHERE upload_ts IS NOT NULL
+),
+inserted AS (
+    INSERT INTO dw.dim_dates (
+        date_dt,
+        date_year,
+        date_month,
+        date_day,
+        date_hour,
+        date_minute,
+        date_day_of_week
+    )
+    SELECT
+        dt,
+        EXTRACT(YEAR FROM dt)::int,
+        EXTRACT(MONTH FROM dt)::int,
+        EXTRACT(DAY FROM dt)::int,
+        EXTRACT(HOUR FROM dt)::int,
+        EXTRACT(MINUTE FROM dt)::int,
+        EXTRACT(ISODOW FROM dt)::smallint
+    FROM date_keys
+    ON CONFLICT (date_dt) DO NOTHING
+    RETURNING date_dt, date_surr_id
 )
-SELECT DISTINCT
-    dt AS date_dt,
-    EXTRACT(YEAR FROM dt)::int,
-    EXTRACT(MONTH FROM dt)::int,
-    EXTRACT(DAY FROM dt)::int,
-    EXTRACT(HOUR FROM dt)::int,
-    EXTRACT(MINUTE FROM dt)::int,
-    EXTRACT(ISODOW FROM dt)::smallint
+INSERT INTO tmp_date_ids (date_dt, date_surr_id)
+SELECT date_dt, date_surr_id
+FROM inserted
+UNION ALL
+SELECT ddt.date_dt, ddt.date_surr_id
+FROM dw.dim_dates ddt
+JOIN date_keys k
+    ON k.dt = ddt.date_dt;
+
+ANALYZE tmp_apartment_ids;
+ANALYZE tmp_district_ids;
+ANALYZE tmp_date_ids;
+
+-- STEP: ensure fct_apartments partitions
+SELECT dw.ensure_fct_apartments_partition(upload_month)
 FROM (
-    SELECT upload_date::timestamp AS dt
-    FROM sa.apartments
-    WHERE upload_date IS NOT NULL
-) s
-ON CONFLICT (date_dt) DO NOTHING
-RETURNING *;
-
-COMMIT;
-
--- INSERT FROM STAGING TABLE TO FACT TABLE
-
--- LOAD FCT_APARTMENTS
-BEGIN;
-
+    SELECT DISTINCT date_trunc('month', upload_ts) AS upload_month
+    FROM tmp_apartments
+    WHERE upload_ts IS NOT NULL
+) m;
+
+-- STEP: load fct_apartments
+-- One fact row per apartment: apartments already in the fact table are skipped (NOT EXISTS, across partitions), as
+-- are repeats within the batch (DISTINCT ON). ON CONFLICT skips the rows a concurrent load inserted meanwhile
+-- (unique (apartment_surr_id, upload_ts) constraint)
 INSERT INTO dw.fct_apartments (
     date_surr_id,
     city_surr_id,
@@ -83,56 +168,47 @@ INSERT INTO dw.fct_apartments (
     transaction_type_surr_id,
     source_surr_id,
     apartment_surr_id,
+    upload_ts,
     price,
     price_per_sqm,
     area_m2,
     bedrooms,
     floor
 )
-SELECT
-    COALESCE(ddt.date_surr_id, -1)                 AS date_surr_id,
-    COALESCE(dc.city_surr_id, -1)                  AS city_surr_id,
-    COALESCE(dd.district_surr_id, -1)              AS district_surr_id,
-    COALESCE(dtt.transaction_type_surr_id, -1)    AS transaction_type_surr_id,
-    COALESCE(ds.source_surr_id, -1)                AS source_surr_id,
-    COALESCE(da.apartment_surr_id, -1)             AS apartment_surr_id,
-
-    sa.price::DECIMAL(12,2)         AS price,
-    sa.price_per_sqm::DECIMAL(10,2) AS price_per_sqm,
-    sa.area_m2::DECIMAL(8,2)        AS area_m2,
-    COALESCE(FLOOR(sa.bedrooms::NUMERIC)::INT, -1) AS bedrooms,
-    COALESCE(FLOOR(sa.floor::NUMERIC)::INT, -1)    AS floor
-
-FROM sa.apartments sa
--- Apartment
-LEFT JOIN dw.dim_apartments da
-    ON sa.url = da.url
--- City
-LEFT JOIN dw.dim_cities dc
-    ON sa.city = dc.city_name
--- District (city-dependent)
-LEFT JOIN dw.dim_districts dd
-    ON dd.city_surr_id = COALESCE(dc.city_surr_id, -1)
-   AND dd.district_name = COALESCE(NULLIF(sa.district_name, ''), 'n.a')
--- Transaction type
-LEFT JOIN dw.dim_transaction_types dtt
-    ON sa.transaction_type = dtt.transaction_type
--- Source
-LEFT JOIN dw.dim_sources ds
-    ON sa.source = ds.source_name
--- Date
-LEFT JOIN dw.dim_dates ddt
-    ON sa.upload_date::timestamp = ddt.date_dt
-
-WHERE
-    sa.price IS NOT NULL
-    AND sa.price_per_sqm IS NOT NULL
-    AND sa.area_m2 IS NOT NULL
-ON CONFLICT DO NOTHING;
-
-COMMIT;
+SELECT DISTINCT ON (apartment_surr_id) *
+FROM (
+    SELECT
+        COALESCE(di.date_surr_id, -1)       AS date_surr_id,
+        t.city_surr_id,
+        COALESCE(dsi.district_surr_id, -1)  AS district_surr_id,
+        t.transaction_type_surr_id,
+        t.source_surr_id,
+        COALESCE(ai.apartment_surr_id, -1)  AS apartment_surr_id,
+        t.upload_ts,
+        t.price,
+        t.price_per_sqm,
+        t.area_m2,
+        t.bedrooms,
+        t.floor
+    FROM tmp_apartments t
+    LEFT JOIN tmp_apartment_ids ai
+        ON ai.url = t.url
+    LEFT JOIN tmp_district_ids dsi
+        ON dsi.city_surr_id = t.city_surr_id
+       AND dsi.district_name = t.district_name
+    LEFT JOIN tmp_date_ids di
+        ON di.date_dt = t.upload_ts
+    WHERE
+        t.price IS NOT NULL
+        AND t.price_per_sqm IS NOT NULL
+        AND t.area_m2 IS NOT NULL
+) batch
+WHERE NOT EXISTS (
+    SELECT 1
+    FROM dw.fct_apartments fa
+    WHERE fa.apartment_surr_id = batch.apartment_surr_id
+)
+ON CONFLICT (apartment_surr_id, upload_ts) DO NOTHING;
 
--- CLEAN STAGING AFTER SUCCESSFUL LOAD
-BEGIN;
+-- STEP: clean staging
 TRUNCATE TABLE sa.apartments;
-COMMIT;
\ No newline at end of file
@@ -13,10 +13,12 @@ SELECT
     NULLIF(dd.district_name, 'n.a')          AS district_name,
     NULLIF(da.street_address, 'n.a')         AS street_address,
 
-    NULLIF(ddt.date_dt, '1900-01-01 00:00:00') AS upload_date,
+    fa.upload_ts                             AS upload_date,  -- partition key, filters on it prune partitions
 
     NULLIF(dtt.transaction_type, 'n.a')      AS transaction_type,
-    NULLIF(ds.source_name, 'n.a')             AS source
+    NULLIF(ds.source_name, 'n.a')             AS source,
+
+    fa.apartment_fct_surr_id                 AS apartment_fct_surr_id  -- row key of the materialized view
 
 FROM dw.fct_apartments fa
 JOIN dw.dim_cities dc
@@ -25,9 +27,44 @@ JOIN dw.dim_apartments da
     ON fa.apartment_surr_id = da.apartment_surr_id
 JOIN dw.dim_districts dd
     ON fa.district_surr_id = dd.district_surr_id
-JOIN dw.dim_dates ddt
-    ON fa.date_surr_id = ddt.date_surr_id
 JOIN dw.dim_transaction_types dtt
     ON fa.transaction_type_surr_id = dtt.transaction_type_surr_id
 JOIN dw.dim_sources ds
     ON fa.source_surr_id = ds.source_surr_id;
+
+
+-- Denormalized copy of the view for the readers (EDA, model training): the dimension joins run once per load,
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY dw.all_apartments_mv runs at the end of PostgresDatabase.database_insertion,
+-- which also runs this script when the view or its unique index is missing.
+-- No physical row order is kept (a concurrent refresh applies a diff), readers filter through the indexes below.
+
+-- A view created before apartment_fct_surr_id was added cannot get the unique index, it is rebuilt
+DO $$
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_matviews WHERE schemaname = 'dw' AND matviewname = 'all_apartments_mv')
+       AND NOT EXISTS (
+           SELECT 1
+           FROM pg_attribute
+           WHERE attrelid = 'dw.all_apartments_mv'::regclass
+             AND attname = 'apartment_fct_surr_id'
+             AND NOT attisdropped
+       ) THEN
+        DROP MATERIALIZED VIEW dw.all_apartments_mv;
+    END IF;
+END;
+$$;
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS dw.all_apartments_mv AS
+SELECT *
+FROM dw.all_apartments_view
+WITH DATA;
+
+-- Required by REFRESH ... CONCURRENTLY, which rebuilds the view without blocking its readers
+CREATE UNIQUE INDEX IF NOT EXISTS uq_all_apartments_mv_apartment_fct_surr_id
+    ON dw.all_apartments_mv (apartment_fct_surr_id);
+
+CREATE INDEX IF NOT EXISTS idx_all_apartments_mv_transaction_type_upload_date
+    ON dw.all_apartments_mv (transaction_type, upload_date);
+
+CREATE INDEX IF NOT EXISTS idx_all_apartments_mv_city_district_name
+    ON dw.all_apartments_mv (city, district_name);
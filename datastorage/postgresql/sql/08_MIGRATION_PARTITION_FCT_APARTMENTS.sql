@@ -0,0 +1,156 @@
+-- =====================================
+-- 08_MIGRATION_PARTITION_FCT_APARTMENTS.sql
+-- =====================================
+
+-- One-time migration of an existing dw.fct_apartments heap to the monthly range-partitioned table of 01_DDL.sql.
+-- Fresh databases get the partitioned table from 01_DDL.sql directly and do not need this script.
+-- The views are dropped here because they depend on the old table: run 07_VIEWS.sql again afterwards (the next
+-- PostgresDatabase.database_insertion also recreates them).
+
+-- UNIQUE NULLS NOT DISTINCT on dw.fct_apartments needs PostgreSQL 15 or newer
+DO $$
+BEGIN
+    IF current_setting('server_version_num')::INT < 150000 THEN
+        RAISE EXCEPTION 'PostgreSQL 15 or newer is required, the server is %', current_setting('server_version');
+    END IF;
+END;
+$$;
+
+BEGIN;
+
+DROP MATERIALIZED VIEW IF EXISTS dw.all_apartments_mv;
+DROP VIEW IF EXISTS dw.all_apartments_view;
+
+ALTER TABLE dw.fct_apartments RENAME TO fct_apartments_unpartitioned;
+
+-- Partitioned fact table (same definition as 01_DDL.sql)
+CREATE SEQUENCE IF NOT EXISTS dw.fct_apartments_surr_id_seq AS BIGINT;
+
+CREATE TABLE dw.fct_apartments (
+    apartment_fct_surr_id BIGINT NOT NULL DEFAULT nextval('dw.fct_apartments_surr_id_seq'),
+    date_surr_id BIGINT NOT NULL,
+    city_surr_id BIGINT NOT NULL,
+    district_surr_id BIGINT NOT NULL,
+    source_surr_id BIGINT NOT NULL,
+    transaction_type_surr_id BIGINT NOT NULL,
+    apartment_surr_id BIGINT NOT NULL,
+    upload_ts TIMESTAMP,
+
+    price DECIMAL(12,2) NOT NULL,
+    price_per_sqm DECIMAL(10,2) NOT NULL,
+    area_m2 DECIMAL(8,2) NOT NULL,
+    bedrooms INT NOT NULL,
+    floor INT NOT NULL,
+
+    CONSTRAINT fk_fct_date
+        FOREIGN KEY (date_surr_id)
+        REFERENCES dw.dim_dates (date_surr_id),
+
+    CONSTRAINT fk_fct_city
+        FOREIGN KEY (city_surr_id)
+        REFERENCES dw.dim_cities (city_surr_id),
+
+    CONSTRAINT fk_fct_district
+        FOREIGN KEY (district_surr_id)
+        REFERENCES dw.dim_districts (district_surr_id),
+
+    CONSTRAINT fk_fct_source
+        FOREIGN KEY (source_surr_id)
+        REFERENCES dw.dim_sources (source_surr_id),
+
+    CONSTRAINT fk_fct_transaction_type
+        FOREIGN KEY (transaction_type_surr_id)
+        REFERENCES dw.dim_transaction_types (transaction_type_surr_id),
+
+    CONSTRAINT fk_fct_apartment
+        FOREIGN KEY (apartment_surr_id)
+        REFERENCES dw.dim_apartments (apartment_surr_id),
+
+    CONSTRAINT uq_fct_apartments_apartment_upload_ts UNIQUE NULLS NOT DISTINCT (apartment_surr_id, upload_ts),
+
+    CONSTRAINT ck_price_non_negative CHECK (price >= 0),
+    CONSTRAINT ck_price_per_sqm_non_negative CHECK (price_per_sqm >= 0),
+    CONSTRAINT ck_area_non_negative CHECK (area_m2 >= 0),
+    CONSTRAINT ck_bedrooms_valid CHECK (bedrooms >= -1),
+    CONSTRAINT ck_floor_valid CHECK (floor >= -1)
+) PARTITION BY RANGE (upload_ts);
+
+ALTER SEQUENCE dw.fct_apartments_surr_id_seq OWNED BY dw.fct_apartments.apartment_fct_surr_id;
+
+CREATE TABLE dw.fct_apartments_default PARTITION OF dw.fct_apartments DEFAULT;
+
+CREATE OR REPLACE FUNCTION dw.ensure_fct_apartments_partition(month_start TIMESTAMP)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    partition_start TIMESTAMP := date_trunc('month', month_start);
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS dw.%I PARTITION OF dw.fct_apartments FOR VALUES FROM (%L) TO (%L)',
+        'fct_apartments_' || to_char(partition_start, 'YYYY_MM'),
+        partition_start,
+        partition_start + INTERVAL '1 month'
+    );
+END;
+$$;
+
+-- Monthly partitions for the existing upload dates
+SELECT dw.ensure_fct_apartments_partition(upload_month)
+FROM (
+    SELECT DISTINCT date_trunc('month', ddt.date_dt) AS upload_month
+    FROM dw.fct_apartments_unpartitioned fa
+    JOIN dw.dim_dates ddt
+        ON fa.date_surr_id = ddt.date_surr_id
+    WHERE fa.date_surr_id <> -1
+) m;
+
+-- Copy the rows, upload_ts denormalized from dim_dates (unknown date -1 → NULL, DEFAULT partition)
+INSERT INTO dw.fct_apartments (
+    apartment_fct_surr_id,
+    date_surr_id,
+    city_surr_id,
+    district_surr_id,
+    source_surr_id,
+    transaction_type_surr_id,
+    apartment_surr_id,
+    upload_ts,
+    price,
+    price_per_sqm,
+    area_m2,
+    bedrooms,
+    floor
+)
+SELECT
+    fa.apartment_fct_surr_id,
+    fa.date_surr_id,
+    fa.city_surr_id,
+    fa.district_surr_id,
+    fa.source_surr_id,
+    fa.transaction_type_surr_id,
+    fa.apartment_surr_id,
+    CASE WHEN fa.date_surr_id = -1 THEN NULL ELSE ddt.date_dt END AS upload_ts,
+    fa.price,
+    fa.price_per_sqm,
+    fa.area_m2,
+    fa.bedrooms,
+    fa.floor
+FROM dw.fct_apartments_unpartitioned fa
+LEFT JOIN dw.dim_dates ddt
+    ON fa.date_surr_id = ddt.date_surr_id;
+
+SELECT setval('dw.fct_apartments_surr_id_seq', COALESCE(MAX(apartment_fct_surr_id), 0) + 1, false)
+FROM dw.fct_apartments;
+
+-- Indexes after the bulk copy (created on every partition), apartment lookups use the unique constraint index
+CREATE INDEX brin_fct_apartments_upload_ts
+    ON dw.fct_apartments USING BRIN (upload_ts);
+
+CREATE INDEX idx_fct_apartments_transaction_type_city
+    ON dw.fct_apartments (transaction_type_surr_id, city_surr_id);
+
+DROP TABLE dw.fct_apartments_unpartitioned;
+
+COMMIT;
+
+ANALYZE dw.fct_apartments;
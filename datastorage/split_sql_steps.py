@@ -0,0 +1,14 @@
+import re
+
+
+def split_sql_steps(script):
+    """
+    Splits a SQL script on its '-- STEP: <name>' markers into (name, sql), a script without markers is one step.
+    Shared by PostgresDatabase and DuckDBDatabase to run and time their scripts step by step
+    """
+    steps = []
+    for i, block in enumerate(re.split(r"^--\s*STEP:\s*", script, flags=re.MULTILINE)):
+        name, _, sql = block.partition("\n") if i else ("script", "", block)
+        if any(line.strip() and not line.strip().startswith("--") for line in sql.splitlines()):
+            steps.append((name.strip(), sql))
+    return steps
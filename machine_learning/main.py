@@ -1,7 +1,10 @@
 from machine_learning.model_training.ModelTrainingManager import ModelTrainingManager
+from datastorage.get_database import get_database
 
 
 
 if __name__ == "__main__":
     model_training_manager = ModelTrainingManager()
     model_training_manager.run()
+
+    get_database().print_pool_metrics()
@@ -1,22 +1,24 @@
-from datastorage.postgresql.PostgresDatabase import PostgresDatabase
+from datastorage.get_database import get_database
 from machine_learning.model_training.models.HistGradientBoostingTraining import HistGradientBoostingTraining
 from machine_learning.model_training.models.LinearRegressionTraining import LinearRegressionTraining
 from machine_learning.model_training.models.RandomForestTraining import RandomForestTraining
 from machine_learning.model_training.models.DecisionTreeTraining import DecisionTreeTraining
 from machine_learning.pipeline.Preprocessing import Preprocessing
 from machine_learning.pipeline.InferenceLimits import InferenceLimits
-from config import paths
+from config import paths, schema
 import pandas as pd
 
 
 
 class ModelTrainingManager:
     def __init__(self):
-        postgres_db = PostgresDatabase()  # Initialize database connection and load apartment datasets
+        postgres_db = get_database()  # Initialize database connection and load apartment datasets
 
-        # Load sale and rent apartment data separately
-        self.sale_df = postgres_db.get_apartments_by_transaction('იყიდება')
-        self.rent_df = postgres_db.get_apartments_by_transaction('ქირავდება თვიურად')
+        # Load sale and rent apartment data in one query
+        apartments = postgres_db.get_apartments_by_transactions(
+            ['იყიდება', 'ქირავდება თვიურად'], columns=schema.ANALYSIS_COLUMNS
+        )
+        self.sale_df, self.rent_df = apartments['იყიდება'], apartments['ქირავდება თვიურად']
 
     def __time_split(self, df):
         """Split dataset into train, validation and test sets based on upload_date (70-15-15)"""
@@ -1,4 +1,4 @@
-from datastorage.postgresql.PostgresDatabase import PostgresDatabase
+from datastorage.get_database import get_database
 from scrapers.MyHomeScraper import MyHomeScraper
 from scrapers.LivoScraper import LivoScraper
 from scrapers.SSHomeScraper import SSHomeScraper
@@ -13,15 +13,15 @@ from concurrent.futures import ThreadPoolExecutor
 if __name__ == "__main__":
     """ Main pipeline to scrape the data, perform data cleaning, save data in database and perform EDA """
 
-    # Step 1: Scraping the data
+    # Step 1: Scraping the data (listings already captured in previous runs are skipped)
     def run_myhome():
-        MyHomeScraper().scraper(deal_types=[1,2])
+        MyHomeScraper().scraper(deal_types=[1,2], incremental=True)
 
     def run_livo():
-        LivoScraper().scraper(deal_types=[1,2])
+        LivoScraper().scraper(deal_types=[1,2], incremental=True, early_stop=True)  # Livo pages are sorted by date
 
     def run_sshome():
-        SSHomeScraper().scraper(deal_types=[1])
+        SSHomeScraper().scraper(deal_types=[1], incremental=True)
 
     with ThreadPoolExecutor(max_workers=3) as executor:
         for future in [executor.submit(run_myhome), executor.submit(run_sshome), executor.submit(run_livo)]:
@@ -34,8 +34,8 @@ if __name__ == "__main__":
     data_cleaning.write_to_csv()
 
     # Step 3: Save data in the datastorage
-    postgresql_database = PostgresDatabase()
-    postgresql_database.database_insertion()
+    database = get_database()  # PostgreSQL, or the local DuckDB file with STORAGE_BACKEND=duckdb
+    database.database_insertion()
 
     csv = CSV()
     csv.deduplicate_and_write()
@@ -43,3 +43,5 @@ if __name__ == "__main__":
     # Step 4: Data Analysis
     run_eda = RunEDA()
     run_eda.run()
+
+    database.print_pool_metrics()
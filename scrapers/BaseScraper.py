@@ -1,22 +1,39 @@
-import csv, os, random
+import os, queue, random, threading
+from datetime import date
+import requests
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import StaleElementReferenceException, TimeoutException, WebDriverException
+from scrapers.SeenUrlIndex import RunSeenUrls, SeenUrlIndex
+from scrapers.HttpFetcher import HttpFetcher
+from scrapers.StreamingCsvSink import StreamingCsvSink
+from config import schema
 
 
 class BaseScraper(ABC):
     def __init__(self):
-        self.headers = ['url', 'city', 'price', 'price_per_sqm', 'description', 'district_name',
-                        'street_address', 'area_m2', 'bedrooms', 'floor', 'upload_date']
+        self.headers = list(schema.RAW_COLUMNS)
         self.main_url = ''
         self.city_id_dict = None
         self.number_of_pages_to_scrape = None
+        self.number_of_drivers = 1  # Concurrent headless browsers per site
         self.raw_apartments_csv_path = ''
 
+        # 'javascript' - all listing cards of a page are extracted by one execute_script call
+        # 'webdriver' - every field is read with separate WebDriver calls (used as a fallback)
+        self.extraction_mode = 'javascript'
+        self.listing_extraction_script = None  # JS returning extract_listing-shaped objects for arguments[0]
+
+        # 'selenium' - pages are rendered in headless Edge
+        # 'http' - server-rendered pages are downloaded with keep-alive HTTP sessions and parsed by parse_html
+        self.fetch_backend = 'selenium'
+        self.http_concurrency = 8  # Concurrent HTTP sessions per site
+
     @abstractmethod
     def get_url(self, city_id, page, deal_type):
         """ Returns the url for the specific website for the given city, page and deal type """
@@ -28,48 +45,251 @@ class BaseScraper(ABC):
         raise NotImplementedError("Subclasses must implement get_listings function")
 
     @abstractmethod
+    def extract_listing(self, apartment):
+        """ Reads the raw fields of a listing card with WebDriver calls.
+            Returns the same dict shape as listing_extraction_script, or {'error': message}
+        """
+        raise NotImplementedError("Subclasses must implement extract_listing function")
+
+    @abstractmethod
+    def build_record(self, raw, city_name, page):
+        """ Main logic to parse the raw listing fields into a record. Implemented by each subclass specifically """
+        raise NotImplementedError("Subclasses must implement build_record function")
+
     def parse_listing(self, apartment, city_name, page):
-        """ Main logic to parse the listing. Implemented by each subclass specifically """
-        raise NotImplementedError("Subclasses must implement parse_listing function")
+        """ Parses a single listing card element using WebDriver calls """
+        return self.parse_raw_listing(self.extract_listing(apartment), city_name, page)
+
+    def parse_raw_listing(self, raw, city_name, page):
+        """ Builds a record from raw listing fields, skipping cards that failed to load """
+        if not raw or raw.get('error'):
+            self.skip_listing_message(city_name, page, raw.get('error') if raw else "Listing didn't load")
+            return None
+
+        return self.build_record(raw, city_name, page)
+
+    def extract_listings_js(self, driver, listings, city_name, page):
+        """ Extracts raw fields of all listing cards in a single execute_script round trip.
+            Cards the script found incomplete (still rendering) are read again by extract_listing, which waits for them.
+            Returns None when the page should be parsed with WebDriver calls instead.
+        """
+        if self.extraction_mode != 'javascript' or not self.listing_extraction_script:
+            return None
+
+        try:
+            raw_listings = driver.execute_script(self.listing_extraction_script, listings)
+        except WebDriverException as e:
+            print(f"{self.main_url} - City: {city_name}, Page: {page} — JS extraction failed, using WebDriver: {e}")
+            return None
 
-    def scraper(self, deal_types):
-        """ Main scraping template method, used for every child class """
-        driver = self.configure_driver()
-        data = []
+        if not isinstance(raw_listings, list) or len(raw_listings) != len(listings):
+            print(f"{self.main_url} - City: {city_name}, Page: {page} — JS extraction returned unexpected result, using WebDriver")
+            return None
+
+        # The script checks every card once, the WebDriver path gives a late card time to render its fields
+        for i, raw in enumerate(raw_listings):
+            if not raw or raw.get('error'):
+                try:
+                    raw_listings[i] = self.extract_listing(listings[i])
+                except WebDriverException as e:
+                    raw_listings[i] = {'error': str(e)}
 
-        for deal_type in deal_types:
-            for city_name, city_id in self.city_id_dict.items():
-                for page in range(2, self.number_of_pages_to_scrape + 1):
-                    url = self.get_url(city_id, page, deal_type)
+        return raw_listings
+
+    def parse_html(self, html, page_url):
+        """ Parses a server-rendered listings page into extract_listing-shaped raw listings.
+            Only needed by scrapers that support the 'http' fetch backend.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support the 'http' fetch backend")
+
+    def open_client(self, fetch_backend):
+        """ Opens the page client of one scraping worker: an Edge driver or a keep-alive HTTP session """
+        if fetch_backend == 'http':
+            return HttpFetcher(user_agent=self._get_random_user_agent())
+
+        return self.configure_driver()
+
+    def scraper(self, deal_types, incremental=False, early_stop=False, number_of_drivers=None, fetch_backend=None,
+                resume=True, flush_every=None):
+        """ Main scraping template method, used for every child class.
+            Pages are put in a shared work queue and fetched by a pool of workers, each owning one client:
+            fetch_backend='selenium' - headless Edge drivers (number_of_drivers, defaults to self.number_of_drivers)
+            fetch_backend='http' - plain HTTP sessions for server-rendered pages (self.http_concurrency workers)
+            incremental - skips listings whose url is already in the seen URL index (the raw store) or was
+                          scraped earlier in this run. The index is extended only once the records reach the raw store.
+            early_stop - (with incremental) stops paging a city once a page contains only known listings.
+                         Only meaningful for websites whose pages are sorted by upload date.
+            Records are streamed to the raw CSV (every flush_every records, or after every page by default).
+            resume - continues an interrupted run of the same day and parameters from its checkpoint (with its
+                     early stop pages) instead of starting over. A checkpoint of any other run is ignored.
+                     With incremental, the listings already written by the interrupted run count as seen.
+            Raises RuntimeError when pages are left unscraped (e.g. no driver could be started), the checkpoint
+            is then kept so the next run resumes them.
+        """
+        fetch_backend = fetch_backend or self.fetch_backend
+        if fetch_backend == 'http':
+            number_of_workers = self.http_concurrency
+        else:
+            number_of_workers = number_of_drivers or self.number_of_drivers
 
+        tasks = [
+            (deal_type, city_name, city_id, page)
+            for deal_type in deal_types
+            for city_name, city_id in self.city_id_dict.items()
+            for page in range(2, self.number_of_pages_to_scrape + 1)
+        ]
+        run = {
+            "date": date.today().isoformat(),
+            "deal_types": list(deal_types),
+            "cities": list(self.city_id_dict),
+            "pages": self.number_of_pages_to_scrape,
+            "incremental": incremental,
+            "early_stop": early_stop,
+        }
+        sink = StreamingCsvSink(self.raw_apartments_csv_path, self.headers, flush_every=flush_every)
+        state = sink.open(resume=resume, run=run)
+        seen_urls = RunSeenUrls(SeenUrlIndex(), sink.written_values("url")) if incremental else None
+
+        work_queue = queue.Queue()
+        for task in tasks:
+            if not sink.is_completed(task):
+                work_queue.put(task)
+
+        # (deal_type, city_name) -> first page that contained only known listings, kept in the checkpoint
+        stop_pages = {(deal_type, city_name): page for deal_type, city_name, page in state.get("stop_pages", [])}
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                client = self.open_client(fetch_backend)
+            except WebDriverException as e:
+                print(f"{self.main_url} - Failed to start a driver: {e}")
+                return
+
+            try:
+                while True:
                     try:
-                        driver.get(url)
-                    except TimeoutException:
-                        print(f"{self.main_url} - City: {city_name}, Page: {page} — Page load timeout")
-                        continue
-                    except WebDriverException as e:
-                        print(f"{self.main_url} - City: {city_name}, Page: {page} — WebDriver error: {e}")
+                        task = work_queue.get_nowait()
+                    except queue.Empty:
+                        return
+
+                    deal_type, city_name, city_id, page = task
+                    with lock:
+                        stop_page = stop_pages.get((deal_type, city_name))
+                    if stop_page is not None and page > stop_page:
+                        sink.write_page(task, [])  # done, past the early stop page
                         continue
 
-                    print(f"{self.main_url} - City: {city_name}, Page: {page}, Deal Type: {deal_type if deal_type else 'all'}")
+                    if fetch_backend == 'http':
+                        records, only_known = self.fetch_page(client, deal_type, city_name, city_id, page, seen_urls)
+                    else:
+                        records, only_known = self.scrape_page(client, deal_type, city_name, city_id, page, seen_urls)
+
+                    # Stop page and records are checkpointed together, under the lock so states are saved in order
+                    with lock:
+                        page_state = None
+                        if early_stop and only_known:
+                            print(f"{self.main_url} - City: {city_name}, Page: {page} — Only known listings, stopping early")
+                            stop_pages[(deal_type, city_name)] = min(page, stop_pages.get((deal_type, city_name), page))
+                            page_state = {"stop_pages": [[*key, value] for key, value in stop_pages.items()]}
+
+                        sink.write_page(task, records, state=page_state)
+            finally:
+                client.quit()
+
+        with ThreadPoolExecutor(max_workers=number_of_workers) as executor:
+            for future in [executor.submit(worker) for _ in range(number_of_workers)]:
+                future.result()
+
+        sink.flush()  # buffered pages count as completed once written
+        remaining = [task for task in tasks if not sink.is_completed(task)]
+        complete = work_queue.empty() and not remaining
+
+        records_written = sink.close(complete=complete)
+        print(f"{self.main_url} - {records_written} records written to '{self.raw_apartments_csv_path}'")
+
+        if not complete:
+            raise RuntimeError(
+                f"{self.main_url} - {len(remaining)} of {len(tasks)} pages were not scraped, "
+                f"checkpoint kept at '{sink.checkpoint_path}' to resume them"
+            )
+
+    def scrape_page(self, driver, deal_type, city_name, city_id, page, seen_urls=None):
+        """ Loads a single listings page in the browser and parses its listings.
+            Returns (records, only_known) where only_known is True when every listing was already seen.
+        """
+        url = self.get_url(city_id, page, deal_type)
+
+        try:
+            driver.get(url)
+        except TimeoutException:
+            print(f"{self.main_url} - City: {city_name}, Page: {page} — Page load timeout")
+            return [], False
+        except WebDriverException as e:
+            print(f"{self.main_url} - City: {city_name}, Page: {page} — WebDriver error: {e}")
+            return [], False
+
+        print(f"{self.main_url} - City: {city_name}, Page: {page}, Deal Type: {deal_type if deal_type else 'all'}")
 
-                    listings = self.get_listings(driver)
-                    if not listings:
-                        print(f"{self.main_url} - Skipping Page: {page} — Failed to load listings")
+        listings = self.get_listings(driver)
+        if not listings:
+            print(f"{self.main_url} - Skipping Page: {page} — Failed to load listings")
+            return [], False
+
+        raw_listings = self.extract_listings_js(driver, listings, city_name, page)
+        return self.collect_records(listings, raw_listings, city_name, page, seen_urls)
+
+    def fetch_page(self, fetcher, deal_type, city_name, city_id, page, seen_urls=None):
+        """ Downloads a single server-rendered listings page and parses its listings without a browser.
+            Returns (records, only_known) like scrape_page.
+        """
+        url = self.get_url(city_id, page, deal_type)
+
+        try:
+            html = fetcher.get(url)
+        except requests.RequestException as e:
+            print(f"{self.main_url} - City: {city_name}, Page: {page} — HTTP error: {e}")
+            return [], False
+
+        print(f"{self.main_url} - City: {city_name}, Page: {page}, Deal Type: {deal_type if deal_type else 'all'}")
+
+        raw_listings = self.parse_html(html, url)
+        if not raw_listings:
+            print(f"{self.main_url} - Skipping Page: {page} — Failed to load listings")
+            return [], False
+
+        return self.collect_records([None] * len(raw_listings), raw_listings, city_name, page, seen_urls)
+
+    def collect_records(self, listings, raw_listings, city_name, page, seen_urls=None):
+        """ Builds records from listing elements, or from their raw fields when those were already extracted """
+        records = []
+        known_count = 0
+        for i, a in enumerate(listings):
+            try:
+                raw = raw_listings[i] if raw_listings is not None else None
+
+                if seen_urls is not None:
+                    href = raw.get('url') if raw else a.get_attribute('href')
+                    if href and href in seen_urls:
+                        known_count += 1
                         continue
 
-                    for a in listings:
-                        try:
-                            record = self.parse_listing(a, city_name, page)
-                            if record:
-                                data.append(record)
-                        except StaleElementReferenceException:
-                            self.skip_listing_message(city_name, page, "stale")
-                        except Exception as e:
-                            self.skip_listing_message(city_name, page, str(e))
+                if raw_listings is not None:
+                    record = self.parse_raw_listing(raw, city_name, page)
+                else:
+                    record = self.parse_listing(a, city_name, page)
 
-        self.write_to_csv(data)
-        driver.quit()
+                # The check above is not atomic: a worker scraping another page may have taken the url meanwhile
+                if record and seen_urls is not None and not seen_urls.add(record['url']):
+                    known_count += 1
+                elif record:
+                    records.append(record)
+            except StaleElementReferenceException:
+                self.skip_listing_message(city_name, page, "stale")
+            except Exception as e:
+                self.skip_listing_message(city_name, page, str(e))
+
+        return records, known_count == len(listings)
 
     def skip_listing_message(self, city_name, page_counter, error_msg=''):
         print(f"{self.main_url} - {city_name} - Page: {page_counter}: Skipping Listing: {error_msg}")
@@ -166,19 +386,6 @@ class BaseScraper(ABC):
             print(f"{self.main_url} - Failed: to load {min_count} <a> tags for '{substr}' within {timeout}s")
             return []
 
-    def write_to_csv(self, data):
-        """ Writes the list of dictionaries' data to a csv file """
-        if data:
-            with open(self.raw_apartments_csv_path, mode='w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=self.headers)
-                writer.writeheader()
-                writer.writerows(data)
-
-            print(f"{self.main_url} - Data written to '{self.raw_apartments_csv_path}'")
-
-        else:
-            print(f"{self.main_url} - No data to write.")
-
     @staticmethod
     def _get_random_user_agent():
         """ User agents to use when scraping data """
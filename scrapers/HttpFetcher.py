@@ -0,0 +1,33 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpFetcher:
+    """ Keep-alive HTTP client used instead of a browser for server-rendered pages (one per scraping worker) """
+    def __init__(self, user_agent, timeout=30, retries=2, pool_size=4):
+        self.timeout = timeout
+
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": user_agent,
+            "Accept": "text/html,application/xhtml+xml",
+            "Accept-Language": "ka,en;q=0.8",
+        })
+
+    def get(self, url):
+        """ Returns the page html. Raises requests.RequestException on network or HTTP errors """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        if "charset" not in response.headers.get("Content-Type", "").lower():
+            response.encoding = "utf-8"  # requests would assume ISO-8859-1 and garble Georgian text
+        return response.text
+
+    def quit(self):
+        """ Closes pooled connections (same name as WebDriver.quit so workers can treat clients alike) """
+        self.session.close()
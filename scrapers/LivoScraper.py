@@ -4,13 +4,55 @@ from scrapers.BaseScraper import BaseScraper
 from config import paths
 
 
+# Same shape as LivoScraper.extract_listing, for all listing cards (arguments[0]) in one round trip
+LISTING_EXTRACTION_SCRIPT = """
+function childDivs(el) {
+    return Array.from(el.children).filter(function (child) { return child.tagName === 'DIV'; });
+}
+
+return Array.from(arguments[0], function (a) {
+    var child = childDivs(a)[0];
+    var divs = child ? childDivs(child) : [];
+    if (divs.length < 2) {
+        return {error: "Outer Div didn't load"};
+    }
+
+    var innerDiv = childDivs(divs[1]);
+    if (innerDiv.length < 4) {
+        return {error: "Inner Div didn't load"};
+    }
+
+    var span = Array.from(divs[1].children).filter(function (el) { return el.tagName === 'SPAN'; })[0];
+    if (!span) {
+        return {error: "Description didn't load"};
+    }
+
+    var features = childDivs(innerDiv[2]).map(function (div) {
+        var path = div.querySelector('svg path');
+        return {text: div.innerText, icon: path ? path.getAttribute('d') : null};
+    });
+
+    return {
+        url: a.href,
+        price: innerDiv[0].innerText,
+        description: span.innerText,
+        street_address: innerDiv[1].innerText,
+        features: features,
+        district_upload_date: childDivs(innerDiv[3]).map(function (div) { return div.innerText; })
+    };
+});
+"""
+
+
 class LivoScraper(BaseScraper):
     def __init__(self):
         super().__init__()
         self.main_url = "https://livo.ge/"
         self.city_id_dict = {'თბილისი': 1, "ქუთაისი": 96, 'ბათუმი': 15}  # Cities with ids on this website
         self.number_of_pages_to_scrape = 10
+        self.number_of_drivers = 3  # Long-running site, pages are fetched by 3 concurrent browsers
         self.raw_apartments_csv_path = paths.LIVO_APARTMENTS_RAW_PATH
+        self.listing_extraction_script = LISTING_EXTRACTION_SCRIPT
         self.month_abbreviations = ['იან', 'თებ', 'მარ', 'აპრ', 'მაი', 'ივნ','ივლ','აგვ', 'სექ', 'ოქტ', 'ნოე', 'დეკ']
 
     def get_url(self, city_id, page, deal_type):
@@ -24,65 +66,81 @@ class LivoScraper(BaseScraper):
         """ Gets the listings by substring: 'udzravi-qoneba' """
         return self.wait_for_links(driver, 'udzravi-qoneba', selector='a')
 
-    def parse_listing(self, apartment, city_name, page):
+    def extract_listing(self, apartment):
         child = apartment.find_element(By.XPATH, './div')  # Get child div of the <a> tag
         divs = child.find_elements(By.XPATH, './div')
 
         if len(divs) < 2:
-            self.skip_listing_message(city_name, page, "Outer Div didn't load")
-            return None
+            return {'error': "Outer Div didn't load"}
 
         # 1. div for price, price_per_sqm, description, street_address
         inner_div = divs[1].find_elements(By.XPATH, './div')
         if len(inner_div) < 4:
-            self.skip_listing_message(city_name, page, "Inner Div didn't load")
-            return None
+            return {'error': "Inner Div didn't load"}
+
+        # area_m2, bedrooms and floor, each identified by its text or svg icon
+        features = []
+        for child_div in inner_div[2].find_elements(By.XPATH, './div'):
+            txt = child_div.text
+            icon = None
+
+            if 'მ²' not in txt:
+                try:
+                    icon = child_div.find_element(By.XPATH, ".//*[name()='svg']//*[name()='path']").get_attribute('d')
+                except:
+                    pass
+
+            features.append({'text': txt, 'icon': icon})
 
-        price_div = inner_div[0].text.strip().split('\n')
+        return {
+            'url': apartment.get_attribute('href'),
+            'price': inner_div[0].text,
+            'description': divs[1].find_element(By.XPATH, './span').text,
+            'street_address': inner_div[1].text,
+            'features': features,
+            'district_upload_date': [div.text for div in inner_div[3].find_elements(By.XPATH, './div')]
+        }
+
+    def build_record(self, raw, city_name, page):
+        price_div = raw['price'].strip().split('\n')
         price_parts = [p.strip() for p in price_div if p.strip()]  # ['234,527 ₾', '4,181/მ²', '₾', '$']
 
         price = price_parts[0]  # '234,527 ₾'
         currency_label = "₾" if "₾" in price else "$"
         price_per_sqm = price_parts[1] + f" {currency_label}"  # '4,181/მ²'
 
-        description = divs[1].find_element(By.XPATH, './span').text.strip()  # იყიდება 3 ოთახიანი ბინა დიდუბეში
-        street_address = inner_div[1].text.strip()  # მირიან მეფის ქ.
-
-        area_m2_floor_bedroom = inner_div[2].find_elements(By.XPATH, './div')
+        description = raw['description'].strip()  # იყიდება 3 ოთახიანი ბინა დიდუბეში
+        street_address = raw['street_address'].strip()  # მირიან მეფის ქ.
 
         area_m2, floor, bedrooms = pd.NA, pd.NA, pd.NA
 
-        for child_div in area_m2_floor_bedroom:
-            txt = child_div.text.strip()
+        for feature in raw['features']:
+            txt = feature['text'].strip()
 
             if 'მ²' in txt:
                 area_m2 = txt
                 continue
 
-            try:
-                path_d = child_div.find_element(By.XPATH, ".//*[name()='svg']//*[name()='path']").get_attribute('d')
-
-                # Bedrooms icon
-                if path_d.startswith('M14.118 6.25V3.318'):
-                    bedrooms = txt
+            path_d = feature['icon'] or ''
 
-                # Floor icon
-                elif path_d.startswith('M13.134 1C14.164 1'):
-                    floor = txt
+            # Bedrooms icon
+            if path_d.startswith('M14.118 6.25V3.318'):
+                bedrooms = txt
 
-            except:
-                pass
+            # Floor icon
+            elif path_d.startswith('M13.134 1C14.164 1'):
+                floor = txt
 
-        district_upload_date = inner_div[3].find_elements(By.XPATH, './div')
-        district_name = district_upload_date[0].text.strip() if city_name != "თბილისი" else pd.NA  # ვაკე-საბურთალო
-        upload_date = district_upload_date[1].text.strip()  # 24 თებ. 19:24
+        district_upload_date = raw['district_upload_date']
+        district_name = district_upload_date[0].strip() if city_name != "თბილისი" else pd.NA  # ვაკე-საბურთალო
+        upload_date = district_upload_date[1].strip()  # 24 თებ. 19:24
 
         if pd.isna(price) or pd.isna(street_address) or pd.isna(area_m2):
             self.skip_listing_message(city_name, page, "Data is not given")
             return None
 
         return {
-            'url': apartment.get_attribute('href'),
+            'url': raw['url'],
             'city': city_name,
             'price': price,
             'price_per_sqm': price_per_sqm,
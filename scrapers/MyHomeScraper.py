@@ -6,13 +6,37 @@ from selenium.common.exceptions import TimeoutException
 from config import paths
 
 
+# Same shape as MyHomeScraper.extract_listing, for all listing cards (arguments[0]) in one round trip
+LISTING_EXTRACTION_SCRIPT = """
+return Array.from(arguments[0], function (a) {
+    var blocks = a.querySelectorAll(':scope > div:nth-of-type(2) > div');
+    if (blocks.length <= 4) {
+        return {error: 'expected 5 div elements to load.'};
+    }
+
+    var features = Array.from(blocks[3].querySelectorAll(':scope > div'), function (div) {
+        var path = div.querySelector('svg path');
+        return {text: div.innerText, icon: path ? path.getAttribute('d') : null};
+    });
+
+    return {
+        url: a.href,
+        blocks: Array.from(blocks).slice(0, 5).map(function (div) { return div.innerText; }),
+        features: features
+    };
+});
+"""
+
+
 class MyHomeScraper(BaseScraper):
     def __init__(self):
         super().__init__()
         self.main_url = "https://www.myhome.ge/"
         self.city_id_dict = {'თბილისი': 1, "ქუთაისი": 96, 'ბათუმი': 15}  # Cities with ids on this website
         self.number_of_pages_to_scrape = 5
+        self.number_of_drivers = 3  # Long-running site, pages are fetched by 3 concurrent browsers
         self.raw_apartments_csv_path = paths.MYHOME_APARTMENTS_RAW_PATH
+        self.listing_extraction_script = LISTING_EXTRACTION_SCRIPT
 
     def get_url(self, city_id, page, deal_type):
         """ URL for apartment listings (not including houses, hotels or other real estate types)"""
@@ -22,7 +46,7 @@ class MyHomeScraper(BaseScraper):
         """ Gets the listings by substring: 'pr' """
         return self.wait_for_links(driver, 'pr')
 
-    def parse_listing(self, apartment, city_name, page):
+    def extract_listing(self, apartment):
         try:
             # Wait up to 5 seconds to return 5 div elements
             WebDriverWait(apartment, 1).until(
@@ -31,11 +55,33 @@ class MyHomeScraper(BaseScraper):
             data_div = apartment.find_elements(By.XPATH, "./div[2]/div")
 
         except TimeoutException:
-            self.skip_listing_message(city_name, page, 'expected 5 div elements to load.')
-            return None
+            return {'error': 'expected 5 div elements to load.'}
+
+        # The div 3 contains area_m2, bedrooms and floor, each identified by its text or svg icon
+        features = []
+        for child_div in data_div[3].find_elements(By.XPATH, "./div"):
+            txt = child_div.text
+            icon = None
+
+            if 'მ²' not in txt:
+                try:
+                    icon = child_div.find_element(By.XPATH, ".//*[name()='svg']//*[name()='path']").get_attribute('d')
+                except:
+                    pass
+
+            features.append({'text': txt, 'icon': icon})
+
+        return {
+            'url': apartment.get_attribute('href'),
+            'blocks': [div.text for div in data_div[:5]],
+            'features': features
+        }
+
+    def build_record(self, raw, city_name, page):
+        data_div = raw['blocks']
 
         # The div 0 contains data about price and price_per_sqm
-        price_data = data_div[0].text.splitlines()
+        price_data = data_div[0].splitlines()
         price = price_data[0] + price_data[1] if len(price_data) > 1 else pd.NA
 
         if '₾' in price:
@@ -44,39 +90,35 @@ class MyHomeScraper(BaseScraper):
             price_per_sqm = price_data[2] + '$' if len(price_data) > 2 and 'მ²' in price_data[2] else pd.NA
 
         # The div 1 contains data about the description
-        description_text = data_div[1].text.strip()
+        description_text = data_div[1].strip()
         description = description_text if description_text else pd.NA
 
         # The div 2 contains data about the street address
-        street_address_text = data_div[2].text.strip()
+        street_address_text = data_div[2].strip()
         street_address = street_address_text if street_address_text else pd.NA
 
         # The div 3 contains data about the area_m2 and floor
         area_m2, floor, bedrooms = pd.NA, pd.NA, pd.NA
 
-        for child_div in data_div[3].find_elements(By.XPATH, "./div"):
-            txt = child_div.text.replace('\n', ' ').strip()
+        for feature in raw['features']:
+            txt = feature['text'].replace('\n', ' ').strip()
 
             if 'მ²' in txt:
                 area_m2 = txt
                 continue
 
-            try:
-                path_d = child_div.find_element(By.XPATH, ".//*[name()='svg']//*[name()='path']").get_attribute('d')
-
-                # Bedrooms icon
-                if path_d.startswith('M14.1176 5.25056V2.31853C14.1176'):
-                    bedrooms = txt
+            path_d = feature['icon'] or ''
 
-                # Floor icon
-                elif path_d.startswith('M4 1H10C11.6569 1'):
-                    floor = txt
+            # Bedrooms icon
+            if path_d.startswith('M14.1176 5.25056V2.31853C14.1176'):
+                bedrooms = txt
 
-            except:
-                pass
+            # Floor icon
+            elif path_d.startswith('M4 1H10C11.6569 1'):
+                floor = txt
 
         # The div 4 contains data about the district_name and upload_date
-        district_upload_data = data_div[4].text.splitlines()
+        district_upload_data = data_div[4].splitlines()
         district_name = district_upload_data[0] if district_upload_data else pd.NA
         upload_date = district_upload_data[1] if len(district_upload_data) > 1 else pd.NA
 
@@ -85,7 +127,7 @@ class MyHomeScraper(BaseScraper):
             return None
 
         return {
-                'url': apartment.get_attribute('href'),
+                'url': raw['url'],
                 'city': city_name,
                 'price': price,
                 'price_per_sqm': price_per_sqm,
@@ -1,10 +1,42 @@
 import pandas as pd
 import re
+from urllib.parse import urljoin
+from bs4 import BeautifulSoup
 from selenium.webdriver.common.by import By
 from scrapers.BaseScraper import BaseScraper
 from config import paths
 
 
+# Same shape as SSHomeScraper.extract_listing, for all listing cards (arguments[0]) in one round trip
+LISTING_EXTRACTION_SCRIPT = """
+function textOf(el) {
+    return el ? el.innerText : null;
+}
+
+return Array.from(arguments[0], function (a) {
+    function find(className) {
+        return a.querySelector('.' + className);
+    }
+
+    function parentTextOf(className) {
+        var span = find(className);
+        return span ? textOf(span.parentElement) : null;
+    }
+
+    return {
+        url: a.href || null,
+        price: textOf(find('listing-detailed-item-price')),
+        description: textOf(find('listing-detailed-item-title')),
+        street_address: textOf(find('listing-detailed-item-address')),
+        area_m2: parentTextOf('icon-crop_free'),
+        bedrooms: parentTextOf('icon-bed'),
+        floor: parentTextOf('icon-stairs'),
+        upload_date: textOf(find('create-date'))
+    };
+});
+"""
+
+
 class SSHomeScraper(BaseScraper):
     def __init__(self):
         super().__init__()
@@ -12,6 +44,7 @@ class SSHomeScraper(BaseScraper):
         self.city_id_dict = {'თბილისი': 95, "ქუთაისი": 97, 'ბათუმი': 96}  # Cities with ids on this website
         self.number_of_pages_to_scrape = 10
         self.raw_apartments_csv_path = paths.SSHOME_APARTMENTS_RAW_PATH
+        self.listing_extraction_script = LISTING_EXTRACTION_SCRIPT
 
     def get_url(self, city_id, page, deal_type):
         """ URL for apartment listings (not including houses, hotels or other real estate types) """
@@ -38,35 +71,71 @@ class SSHomeScraper(BaseScraper):
         except Exception as e:
             return []
 
-    def parse_listing(self, apartment, city_name, page):
-        href = str(apartment.get_attribute('href'))
-        if not href or self.main_url not in href:
-            self.skip_listing_message(city_name, page, "href didn't load")
-            return None
+    def parse_html(self, html, page_url):
+        """ Listing cards are server-rendered, so the page can be parsed without a browser (fetch_backend='http') """
+        soup = BeautifulSoup(html, "html.parser")
+
+        grid = soup.select_one(".listing-container .top-grid-lard div")
+        if grid is None:
+            return []
+
+        def text_of(element):
+            return element.get_text(" ", strip=True) if element else None
 
-        price_span = self.safe_find_element(apartment, By.CLASS_NAME, 'listing-detailed-item-price')
-        price = price_span.text.strip() if price_span else pd.NA
+        def parent_text_of(card, class_name):
+            span = card.find(class_=class_name)
+            return text_of(span.parent if span else None)
 
-        desc_h2 = self.safe_find_element(apartment, By.CLASS_NAME, 'listing-detailed-item-title')
-        description = desc_h2.text.strip() if desc_h2 else pd.NA
+        raw_listings = []
+        for card in grid.select("a[href]"):
+            raw_listings.append({
+                'url': urljoin(page_url, card["href"]),
+                'price': text_of(card.find(class_='listing-detailed-item-price')),
+                'description': text_of(card.find(class_='listing-detailed-item-title')),
+                'street_address': text_of(card.find(class_='listing-detailed-item-address')),
+                'area_m2': parent_text_of(card, "icon-crop_free"),
+                'bedrooms': parent_text_of(card, "icon-bed"),
+                'floor': parent_text_of(card, "icon-stairs"),
+                'upload_date': text_of(card.find(class_='create-date'))
+            })
 
-        addr_span = self.safe_find_element(apartment, By.CLASS_NAME, 'listing-detailed-item-address')
-        street_address = addr_span.text.strip() if addr_span else pd.NA
+        return raw_listings
 
-        area_span = self.safe_find_element(apartment, By.CLASS_NAME, "icon-crop_free")
-        area_span_parent = self.safe_find_element(area_span, By.XPATH, './..') if area_span else None
-        area_m2 = area_span_parent.text.strip() if area_span_parent else pd.NA
+    def extract_listing(self, apartment):
+        def text_of(element):
+            return element.text if element else None
 
-        bedroom_span = self.safe_find_element(apartment, By.CLASS_NAME, "icon-bed")
-        bedroom_parent = self.safe_find_element(bedroom_span, By.XPATH, './..') if bedroom_span else None
-        bedrooms = bedroom_parent.text.strip() if bedroom_parent else pd.NA
+        def parent_text_of(class_name):
+            span = self.safe_find_element(apartment, By.CLASS_NAME, class_name)
+            return text_of(self.safe_find_element(span, By.XPATH, './..') if span else None)
+
+        return {
+            'url': str(apartment.get_attribute('href')),
+            'price': text_of(self.safe_find_element(apartment, By.CLASS_NAME, 'listing-detailed-item-price')),
+            'description': text_of(self.safe_find_element(apartment, By.CLASS_NAME, 'listing-detailed-item-title')),
+            'street_address': text_of(self.safe_find_element(apartment, By.CLASS_NAME, 'listing-detailed-item-address')),
+            'area_m2': parent_text_of("icon-crop_free"),
+            'bedrooms': parent_text_of("icon-bed"),
+            'floor': parent_text_of("icon-stairs"),
+            'upload_date': text_of(self.safe_find_element(apartment, By.CLASS_NAME, 'create-date'))
+        }
+
+    def build_record(self, raw, city_name, page):
+        href = raw['url']
+        if not href or self.main_url not in href:
+            self.skip_listing_message(city_name, page, "href didn't load")
+            return None
 
-        floor_span = self.safe_find_element(apartment, By.CLASS_NAME, "icon-stairs")
-        floor_span_parent = self.safe_find_element(floor_span, By.XPATH, './..') if floor_span else None
-        floor = floor_span_parent.text.strip() if floor_span_parent else pd.NA
+        def clean(value):
+            return value.strip() if value is not None else pd.NA
 
-        create_date = self.safe_find_element(apartment, By.CLASS_NAME, 'create-date')
-        upload_date = create_date.text.strip() if create_date else pd.NA
+        price = clean(raw['price'])
+        description = clean(raw['description'])
+        street_address = clean(raw['street_address'])
+        area_m2 = clean(raw['area_m2'])
+        bedrooms = clean(raw['bedrooms'])
+        floor = clean(raw['floor'])
+        upload_date = clean(raw['upload_date'])
 
         if pd.isna(price) or not re.search(r"[$₾]", price) or pd.isna(street_address) or pd.isna(area_m2):
             self.skip_listing_message(city_name, page, "Data is not given")
@@ -0,0 +1,92 @@
+import os, threading
+import pandas as pd
+from config import paths
+from datastorage.parquet.ParquetRawStore import ParquetRawStore
+
+
+class SeenUrlIndex:
+    """
+    Singleton set of already scraped listing URLs, shared by all scrapers and persisted to a text file.
+    The file only holds URLs whose records reached the raw store (save() is called by ApartmentsDataFrame after
+    the raw store append): a scrape lost before that point is scraped again on the next run. The URLs of the run
+    in progress are tracked by RunSeenUrls.
+    """
+
+    _instance = None
+    _lock = threading.RLock()
+
+    def __new__(cls, index_path=paths.SEEN_URLS_PATH, raw_data_path=paths.ALL_RAW_DATA_PATH):
+        """ Ensures the index is loaded only once, even when scrapers start in parallel threads """
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = super(SeenUrlIndex, cls).__new__(cls)
+                cls._instance.init_index(index_path, raw_data_path)
+        return cls._instance
+
+    def init_index(self, index_path, raw_data_path):
+        """ Loads the index file. On the first run it is bootstrapped from the raw store URL index (or the legacy raw CSV) """
+        self.index_path = index_path
+        self.urls = set()
+
+        if os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                self.urls = {line.strip() for line in f if line.strip()}
+
+        elif not ParquetRawStore().is_empty():
+            try:
+                self.save(ParquetRawStore().load_index()["url"])
+            except Exception as e:
+                print(f"[WARN] Failed to bootstrap seen URLs from the raw store: {e}. Starting empty.")
+
+        elif os.path.exists(raw_data_path) and os.path.getsize(raw_data_path) > 0:
+            try:
+                self.save(pd.read_csv(raw_data_path, usecols=["url"])["url"])
+            except Exception as e:
+                print(f"[WARN] Failed to bootstrap seen URLs from {raw_data_path}: {e}. Starting empty.")
+
+        print(f"[INFO] Seen URL index loaded with {len(self.urls)} URLs.")
+
+    def __contains__(self, url):
+        return url in self.urls
+
+    def __len__(self):
+        return len(self.urls)
+
+    def save(self, urls):
+        """ Appends the URLs written to the raw store that are not in the index file yet """
+        with self._lock:
+            new_urls = [url for url in dict.fromkeys(urls) if pd.notna(url) and url and url not in self.urls]
+            if not new_urls:
+                return
+
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(self.index_path, mode="a", encoding="utf-8") as f:
+                f.writelines(f"{url}\n" for url in new_urls)
+
+            self.urls.update(new_urls)
+
+
+class RunSeenUrls:
+    """
+    Seen URLs of one scraping run: the persisted SeenUrlIndex plus the URLs scraped by the run, so a listing that
+    moved to a later page is not scraped twice. A resumed run starts with the URLs of the records its CSV already
+    holds (checkpointed together with their pages), URLs parsed but never written by the interrupted run are not seen.
+    """
+    def __init__(self, index, urls=()):
+        self.index = index
+        self.urls = set(urls)
+        self.lock = threading.Lock()
+
+    def __contains__(self, url):
+        return url in self.urls or url in self.index
+
+    def add(self, url):
+        """ Marks the url as scraped by this run, False if it was already seen (e.g. by a parallel worker). Not persisted """
+        if not url:
+            return True
+
+        with self.lock:
+            if url in self:
+                return False
+            self.urls.add(url)
+            return True
@@ -0,0 +1,126 @@
+import csv, json, os, threading
+from pathlib import Path
+
+
+class StreamingCsvSink:
+    """
+    Appends scraped records to the raw CSV in batches instead of buffering the whole run in memory.
+    A checkpoint file next to the CSV records which (deal_type, city, page) tasks are already on disk,
+    so an interrupted run can resume where it stopped. The checkpoint also holds the run identity (date and
+    scraping parameters), the scraper state that must survive a restart (early stop pages) and the CSV size
+    after the flush: rows appended by a flush whose checkpoint was never written are cut off on resume, so the
+    CSV holds exactly the records of the completed pages. A checkpoint of a different run is never resumed.
+    It is removed only when the run completes.
+    """
+    def __init__(self, csv_path, headers, flush_every=None):
+        self.csv_path = Path(csv_path)
+        self.checkpoint_path = self.csv_path.with_suffix(".checkpoint.json")
+        self.headers = headers
+        self.flush_every = flush_every  # Records per flush. None flushes after every page
+
+        self.run = None  # identity of the run, a checkpoint is only resumed by the same run
+        self.state = {}  # scraper state saved with the completed tasks
+        self.completed = set()  # tasks whose records are already written
+        self.buffer = []
+        self.pending_tasks = []
+        self.records_written = 0
+        self.csv_size = 0  # bytes of the CSV covered by the checkpoint
+        self.lock = threading.Lock()
+
+    def open(self, resume=True, run=None):
+        """ Resumes from the checkpoint of the same run (a JSON serializable run identity), otherwise starts
+            a new CSV containing only the header. Returns the saved scraper state ({} for a new run)
+        """
+        self.run = json.loads(json.dumps(run))  # compared with the identity read back from JSON
+
+        if resume and self.checkpoint_path.exists() and self.csv_path.exists():
+            with open(self.checkpoint_path, encoding="utf-8") as f:
+                checkpoint = json.load(f)
+
+            if checkpoint.get("run") == self.run:
+                self.state = checkpoint.get("state", {})
+                self.completed = {tuple(task) for task in checkpoint["completed"]}
+                self.records_written = checkpoint["records_written"]
+                self.csv_size = checkpoint.get("csv_size", os.path.getsize(self.csv_path))
+                with open(self.csv_path, mode='r+b') as csvfile:
+                    csvfile.truncate(self.csv_size)  # rows of a flush that was not checkpointed
+                print(f"[INFO] Resuming {self.csv_path.name}: {len(self.completed)} pages, {self.records_written} records already written.")
+                return self.state
+
+            print(f"[WARN] Ignoring checkpoint of another run for {self.csv_path.name} ({checkpoint.get('run')}), starting over.")
+
+        os.makedirs(self.csv_path.parent, exist_ok=True)
+        with open(self.csv_path, mode='w', newline='', encoding='utf-8') as csvfile:
+            csv.DictWriter(csvfile, fieldnames=self.headers).writeheader()
+            self.csv_size = csvfile.tell()
+
+        self.state = {}
+        self.completed = set()
+        self.records_written = 0
+        self.__write_checkpoint()
+        return self.state
+
+    def is_completed(self, task):
+        return tuple(task) in self.completed
+
+    def written_values(self, column):
+        """ Values of a column in the records already written (the resumed part of the CSV) """
+        with self.lock, open(self.csv_path, newline='', encoding='utf-8') as csvfile:
+            return [row[column] for row in csv.DictReader(csvfile) if row[column]]
+
+    def write_page(self, task, records, state=None):
+        """ Buffers the records of one finished page and flushes when the batch is full.
+            state (optional) replaces the saved scraper state, it is checkpointed together with this page
+        """
+        with self.lock:
+            self.buffer.extend(records)
+            self.pending_tasks.append(tuple(task))
+            if state is not None:
+                self.state = state
+
+            if self.flush_every is None or len(self.buffer) >= self.flush_every:
+                self.__flush()
+
+    def flush(self):
+        """ Writes the buffered records and marks their pages as completed """
+        with self.lock:
+            self.__flush()
+
+    def close(self, complete=True):
+        """ Flushes the remaining records. The checkpoint is removed only when the run is complete,
+            otherwise it is kept for a resumed run. Returns the number of records written
+        """
+        self.flush()
+
+        if complete and self.checkpoint_path.exists():
+            self.checkpoint_path.unlink()
+
+        return self.records_written
+
+    def __flush(self):
+        """ Appends buffered records, then marks their pages as completed in the checkpoint """
+        if self.buffer:
+            with open(self.csv_path, mode='a', newline='', encoding='utf-8') as csvfile:
+                csv.DictWriter(csvfile, fieldnames=self.headers).writerows(self.buffer)
+                csvfile.flush()
+                os.fsync(csvfile.fileno())
+                self.csv_size = csvfile.tell()
+
+        self.records_written += len(self.buffer)
+        self.completed.update(self.pending_tasks)
+        self.buffer = []
+        self.pending_tasks = []
+        self.__write_checkpoint()
+
+    def __write_checkpoint(self):
+        """ Atomically replaces the checkpoint file """
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, mode='w', encoding='utf-8') as f:
+            json.dump({
+                "run": self.run,
+                "state": self.state,
+                "completed": sorted(self.completed, key=str),
+                "records_written": self.records_written,
+                "csv_size": self.csv_size,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, self.checkpoint_path)
@@ -0,0 +1,123 @@
+import importlib
+import sys
+import types
+import numpy as np
+import pytest
+from fastapi.staticfiles import StaticFiles
+from fastapi.testclient import TestClient
+
+
+class RecordingModel:
+    """ Stand-in pipeline recording every predict call: predicts area_m2 * price_per_sqm """
+    def __init__(self, price_per_sqm):
+        self.price_per_sqm = price_per_sqm
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(X)
+        return np.log1p(X["area_m2"].to_numpy() * self.price_per_sqm)
+
+
+class UncheckedStaticFiles(StaticFiles):
+    """ The charts directory is generated by the EDA run and may not exist """
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs, check_dir=False)
+
+
+def _schema(district):
+    return {
+        "defaults": {"bedrooms": 2, "floor": 3, "year": 2026, "month": 1},
+        "cities": ["თბილისი"],
+        "city_districts": {"თბილისი": [district]},
+        "area_m2": {"hard_min": 10, "hard_max": 500},
+        "bedrooms": {"hard_min": 0, "hard_max": 10},
+        "floor": {"hard_min": -2, "hard_max": 50},
+        "upload_date": {"years": [2026], "year_month_map": {"2026": [1, 2]}},
+    }
+
+
+@pytest.fixture
+def api(monkeypatch):
+    """ The app imported with stubbed models and inference schemas instead of the trained files """
+    state = types.ModuleType("backend.app.state")
+    state.SALE_MODEL, state.RENT_MODEL = RecordingModel(1000.0), RecordingModel(10.0)
+    state.SALE_SCHEMA, state.RENT_SCHEMA = _schema("ვაკე"), _schema("საბურთალო")
+
+    monkeypatch.setitem(sys.modules, "backend.app.state", state)
+    monkeypatch.delitem(sys.modules, "backend.app.schemas", raising=False)
+    monkeypatch.delitem(sys.modules, "backend.app.main", raising=False)
+    monkeypatch.setattr("fastapi.staticfiles.StaticFiles", UncheckedStaticFiles)
+
+    main = importlib.import_module("backend.app.main")
+    return TestClient(main.app), state
+
+
+def _sale(area_m2):
+    return {"transaction_type": "sale", "city": "თბილისი", "district": "ვაკე", "area_m2": area_m2}
+
+
+def _rent(area_m2):
+    return {"transaction_type": "rent", "city": "თბილისი", "district": "საბურთალო", "area_m2": area_m2}
+
+
+def test_batch_calls_each_model_once_and_keeps_the_item_order(api):
+    client, state = api
+    items = [_sale(50), _rent(40), _sale(100), _rent(60), _sale(75)]
+
+    response = client.post("/api/predict/batch", json={"items": items})
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"index": 0, "total_price": 50_000.0},
+        {"index": 1, "total_price": 400.0},
+        {"index": 2, "total_price": 100_000.0},
+        {"index": 3, "total_price": 600.0},
+        {"index": 4, "total_price": 75_000.0},
+    ]
+    assert [len(X) for X in state.SALE_MODEL.calls] == [3]
+    assert [len(X) for X in state.RENT_MODEL.calls] == [2]
+    assert state.RENT_MODEL.calls[0]["district_name"].tolist() == ["საბურთალო", "საბურთალო"]
+
+
+def test_batch_reports_invalid_items_without_rejecting_the_batch(api):
+    client, state = api
+    items = [_sale(50), {**_sale(50), "city": "თელავი"}, "not an object", {"city": "თბილისი"}, _rent(1000), _rent(40)]
+
+    response = client.post("/api/predict/batch", json={"items": items})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == list(range(len(items)))
+    assert results[0] == {"index": 0, "total_price": 50_000.0}
+    assert "City 'თელავი' is not supported" in results[1]["error"]
+    assert results[2]["error"] == "Item must be an object, got str"
+    assert results[3]["error"] == "transaction_type: Field required; district: Field required; area_m2: Field required"
+    assert "Invalid area" in results[4]["error"]
+    assert results[5] == {"index": 5, "total_price": 400.0}
+
+    # only the valid items reach the models
+    assert [len(X) for X in state.SALE_MODEL.calls] == [1]
+    assert [len(X) for X in state.RENT_MODEL.calls] == [1]
+
+
+def test_batch_size_limits(api):
+    client, state = api
+
+    assert client.post("/api/predict/batch", json={"items": []}).status_code == 422
+    assert client.post("/api/predict/batch", json={"items": [_sale(50)] * 10_001}).status_code == 422
+    assert state.SALE_MODEL.calls == []
+
+    response = client.post("/api/predict/batch", json={"items": [_sale(50)] * 10_000})
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 10_000
+    assert [len(X) for X in state.SALE_MODEL.calls] == [10_000]
+
+
+def test_single_and_batch_predictions_round_alike(api):
+    client, state = api
+    state.SALE_MODEL.price_per_sqm = 1.0  # predicts 10.025: np.round gives 10.02, Python's round 10.03
+
+    single = client.post("/api/predict", json=_sale(10.025)).json()["total_price"]
+    batch = client.post("/api/predict/batch", json={"items": [_sale(10.025)]}).json()["results"][0]["total_price"]
+
+    assert single == batch == round(float(np.expm1(np.log1p(10.025))), 2) == 10.03
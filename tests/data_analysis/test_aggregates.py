@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from data_analysis.EDA.Aggregates import Aggregates
+
+
+def _apartments(n, seed):
+    rng = np.random.default_rng(seed)
+    cities = rng.choice(["ქუთაისი", "ბათუმი", "თბილისი"], n)
+    return pd.DataFrame({
+        "city": cities,
+        "district_name": [f"{city}-{k}" for city, k in zip(cities, rng.integers(0, 12, n))],
+        "price": rng.uniform(20_000, 300_000, n).round(),
+        "price_per_sqm": np.where(rng.random(n) < 0.05, 0.0, rng.uniform(300, 3000, n).round(1)),
+        "bedrooms": rng.integers(1, 6, n).astype(float),
+        "floor": rng.integers(-1, 25, n).astype(float),
+        "upload_date": pd.Timestamp("2025-01-01") + pd.to_timedelta(rng.integers(0, 400, n), unit="D"),
+    })
+
+
+def test_aggregates_match_per_chart_filters():
+    sale, rent = _apartments(2000, 0), _apartments(800, 1)
+    aggregates = Aggregates(sale, rent)
+
+    combined = pd.concat([sale, rent])
+    assert aggregates.city_counts.to_dict() == combined["city"].value_counts().to_dict()
+
+    for title, df in (("Sale", sale), ("Rent", rent)):
+        for city in ["ქუთაისი", "ბათუმი", "თბილისი"]:
+            city_df = df[df["city"] == city]
+
+            assert aggregates.city_stats[title].loc[city, "count"] == len(city_df)
+            assert aggregates.city_stats[title].loc[city, "median_price"] == np.median(city_df["price"].values)
+            np.testing.assert_array_equal(aggregates.city_values(title, city, "price"), city_df["price"].values)
+
+            # same districts, counts and tie order as value_counts().nlargest()
+            top = aggregates.top_districts(title, city, 8)
+            expected = city_df["district_name"].value_counts().nlargest(8)
+            assert list(top.items()) == list(expected.items())
+
+            district = top.index[0]
+            np.testing.assert_array_equal(
+                aggregates.district_values(title, city, district, "price_per_sqm"),
+                city_df[city_df["district_name"] == district]["price_per_sqm"].values
+            )
+
+            # monthly medians only over positive values
+            listings, per_city = aggregates.monthly_city_stats[(title, "price_per_sqm")]
+            valid = df[df["price_per_sqm"] > 0]
+            valid_city = valid[valid["city"] == city]
+            expected_medians = valid_city.groupby(valid_city["upload_date"].dt.to_period("M"))["price_per_sqm"].median()
+
+            assert listings == len(valid)
+            assert per_city[city][0] == len(valid_city)
+            np.testing.assert_array_equal(per_city[city][1].values, expected_medians.values)
+
+        for bedrooms in range(1, 6):
+            np.testing.assert_array_equal(
+                aggregates.bedroom_prices[title][bedrooms], df[df["bedrooms"] == bedrooms]["price"].values
+            )
+
+        assert aggregates.monthly_counts[title].sum() == len(df)
+
+    kutaisi_floors = combined[combined["city"] == "ქუთაისი"]["floor"]
+    assert aggregates.floor_bucket_counts.loc["ქუთაისი", "1–2"] == (kutaisi_floors <= 2).sum()
+    assert aggregates.floor_bucket_counts.loc["ქუთაისი", "16+"] == (kutaisi_floors > 15).sum()
+
+
+def test_aggregates_missing_city_is_empty():
+    aggregates = Aggregates(_apartments(50, 2), _apartments(50, 3))
+
+    assert len(aggregates.city_values("Sale", "თელავი", "price")) == 0
+    assert aggregates.top_districts("Rent", "თელავი", 10).empty
+
+
+def test_unknown_floors_are_counted_as_16_plus():
+    sale, rent = _apartments(300, 4), _apartments(200, 5)
+    sale.loc[sale.index[:40], "floor"] = np.nan
+    rent["floor"] = rent["floor"].astype("Int64")
+    rent.loc[rent.index[:25], "floor"] = pd.NA
+
+    # the former chart helper: floor <= 2 ... else "16+", so a missing floor falls through to "16+"
+    def bucket_floor(floor):
+        for bucket, upper in zip(Aggregates.FLOOR_BUCKETS, Aggregates.FLOOR_BINS[1:]):
+            if pd.notna(floor) and floor <= upper:
+                return bucket
+        return "16+"
+
+    combined = pd.concat([sale, rent], ignore_index=True)
+    expected = pd.crosstab(combined["city"], combined["floor"].map(bucket_floor))
+
+    counts = Aggregates(sale, rent).floor_bucket_counts
+    assert counts.values.sum() == len(combined)
+    for city in expected.index:
+        for bucket in Aggregates.FLOOR_BUCKETS:
+            assert counts.loc[city, bucket] == expected.get(bucket, pd.Series(dtype=int)).get(city, 0)
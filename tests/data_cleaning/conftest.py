@@ -0,0 +1,10 @@
+import pytest
+from config import paths
+
+
+@pytest.fixture(autouse=True)
+def street_maps_cache_path(tmp_path, monkeypatch):
+    """ Keeps the normalized street map cache out of the project data directory """
+    cache_path = tmp_path / "cache" / "street_to_district_normalized.json"
+    monkeypatch.setattr(paths, "STREET_MAPS_CACHE_PATH", cache_path)
+    return cache_path
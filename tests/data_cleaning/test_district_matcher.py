@@ -0,0 +1,32 @@
+import pandas as pd
+from data_cleaning.utils.DistrictMatcher import DistrictMatcher
+
+
+def test_longest_variant_wins_anywhere_in_text():
+    matcher = DistrictMatcher({
+        "ვაკე": "ვაკე",
+        "საბურთალო": "საბურთალო",
+        "საბურთალოზე": "საბურთალო",
+        "ვაკის პარკთან": "ვაკე",
+    })
+
+    texts = pd.Series([
+        "იყიდება ბინა ვაკეში",
+        "ბინა ვაკე-საბურთალოზე",
+        "ვაკის პარკთან, საბურთალოზე",
+        "ბინა გლდანში",
+        None,
+    ])
+
+    result = matcher.find_series(texts).tolist()
+
+    assert result == ["ვაკე", "საბურთალო", "ვაკე", None, None]
+
+
+def test_overlapping_longer_variant_is_found():
+    # "ab" is matched first, the longer "bcd" starts inside it
+    matcher = DistrictMatcher({"ab": "first", "bcd": "second"})
+
+    assert matcher.find("xabcd") == "second"
+    assert matcher.find("xab") == "first"
+    assert matcher.find(42) is None
@@ -1,3 +1,4 @@
+import json
 import pandas as pd
 from data_cleaning.NormalizeDistricts import NormalizeDistricts
 
@@ -25,3 +26,66 @@ def test_normalize_districts_from_street_mapping():
     ]
 
     assert result == expected
+
+
+def test_normalized_street_maps_are_cached_by_source_hash(street_maps_cache_path):
+    df = pd.DataFrame({
+        "city": ["ქუთაისი"],
+        "district_name": [None],
+        "street_address": ["განჯის ქუჩა 12"],
+    })
+
+    NormalizeDistricts(df.copy()).normalize_non_tbilisi_districts()
+    assert street_maps_cache_path.exists()
+
+    # A cache entry with the current key is used as-is instead of rebuilding the maps
+    cache = json.loads(street_maps_cache_path.read_text(encoding="utf-8"))
+    cache["cities"]["ქუთაისი"]["normalized"]["განჯისქუჩა"] = "cached"
+    street_maps_cache_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+
+    cleaner = NormalizeDistricts(df.copy())
+    cleaner.normalize_non_tbilisi_districts()
+    assert cleaner.apartments_df["district_name"].tolist() == ["cached"]
+
+    # A stale key (JSON or rules changed) triggers a rebuild
+    cache["key"] = "stale"
+    street_maps_cache_path.write_text(json.dumps(cache, ensure_ascii=False), encoding="utf-8")
+
+    cleaner = NormalizeDistricts(df.copy())
+    cleaner.normalize_non_tbilisi_districts()
+    assert cleaner.apartments_df["district_name"].tolist() == ["ბალახვანი"]
+
+
+def test_street_maps_cache_version_invalidates_the_cache(street_maps_cache_path, monkeypatch):
+    df = pd.DataFrame({
+        "city": ["ქუთაისი"],
+        "district_name": [None],
+        "street_address": ["განჯის ქუჩა 12"],
+    })
+
+    NormalizeDistricts(df.copy()).normalize_non_tbilisi_districts()
+    key = json.loads(street_maps_cache_path.read_text(encoding="utf-8"))["key"]
+
+    # Normalization logic changed: the version bump alone gives a new key
+    monkeypatch.setattr(NormalizeDistricts, "STREET_MAPS_CACHE_VERSION", NormalizeDistricts.STREET_MAPS_CACHE_VERSION + 1)
+    NormalizeDistricts(df.copy()).normalize_non_tbilisi_districts()
+    assert json.loads(street_maps_cache_path.read_text(encoding="utf-8"))["key"] != key
+
+
+def test_fuzzy_street_pass_resolves_misspelled_streets():
+    df = pd.DataFrame({
+        "city": ["ქუთაისი", "ქუთაისი"],
+        "district_name": [None, None],
+        "street_address": ["განჯისს ქუჩა 4", "ზზზზზზ"],
+    })
+
+    exact_only = NormalizeDistricts(df.copy())
+    exact_only.normalize_non_tbilisi_districts()
+    assert exact_only.apartments_df["district_name"].isna().all()
+
+    fuzzy = NormalizeDistricts(df.copy(), fuzzy_street_threshold=0.6)
+    fuzzy.normalize_non_tbilisi_districts()
+    result = fuzzy.apartments_df["district_name"]
+
+    assert result.iloc[0] == "ბალახვანი"
+    assert pd.isna(result.iloc[1])
@@ -35,3 +35,13 @@ def test_normalize_price():
     )
 
     pd.testing.assert_series_equal(result, expected)
+
+
+def test_normalize_price_rounds_half_cents_like_python_round():
+    df = pd.DataFrame({'price': ['12.345 $', '78.675 $', '1.005 $', '10.005 ₾']})
+
+    cleaner = DataCleaning(df, currency_rate=1.0)
+    cleaner._normalize_price()
+
+    # round(12.345, 2) == 12.35 while numpy / Series.round give 12.34
+    assert cleaner.apartments_df['price'].tolist() == [12.35, 78.67, 1.0, 10.01]
@@ -0,0 +1,70 @@
+import json
+import pytest
+from datastorage.csv.BackupStore import BackupStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Small chunks so that a few hundred lines span several of them
+    monkeypatch.setattr(BackupStore, "MIN_CHUNK_SIZE", 256)
+    monkeypatch.setattr(BackupStore, "BOUNDARY_MASK", 0x7)
+    return BackupStore(tmp_path / "backups")
+
+
+def write_lines(path, lines):
+    path.write_bytes("".join(f'{line},"ბინა\nვაკეში"\n' for line in lines).encode())
+    return path
+
+
+def chunk_count(store):
+    return sum(1 for _ in store.chunks_dir.glob("*/*"))
+
+
+def test_snapshots_share_unchanged_chunks_and_restore_by_timestamp(store, tmp_path):
+    csv_path = write_lines(tmp_path / "apartments.csv", [f"u{i}" for i in range(500)])
+    first = csv_path.read_bytes()
+    store.snapshot(csv_path, timestamp="20260101_000000")
+    chunks_after_first = chunk_count(store)
+
+    # One row edited in the middle, rows appended at the end
+    write_lines(csv_path, [f"u{i}" if i != 250 else "changed" for i in range(520)])
+    second = csv_path.read_bytes()
+    store.snapshot(csv_path, timestamp="20260102_000000")
+
+    assert chunks_after_first > 5
+    assert chunk_count(store) - chunks_after_first <= 4
+
+    store.restore("20260101_120000", tmp_path / "restored.csv")  # latest snapshot before the timestamp
+    assert (tmp_path / "restored.csv").read_bytes() == first
+    store.restore("20260102_000000", tmp_path / "restored.csv")
+    assert (tmp_path / "restored.csv").read_bytes() == second
+
+    with pytest.raises(FileNotFoundError):
+        store.restore("20251231_000000", tmp_path / "restored.csv")
+
+
+def test_cleanup_removes_unreferenced_chunks(store, tmp_path):
+    csv_path = tmp_path / "apartments.csv"
+    for day, rows in enumerate([100, 200, 300], start=1):
+        write_lines(csv_path, [f"{day}-{i}" for i in range(rows)])
+        store.snapshot(csv_path, timestamp=f"2026010{day}_000000")
+
+    store.cleanup(keep_last=1)
+
+    assert store.list_snapshots() == ["20260103_000000"]
+    store.restore("20260103_000000", tmp_path / "restored.csv")
+    assert (tmp_path / "restored.csv").read_bytes() == csv_path.read_bytes()
+    manifest = json.loads((store.snapshots_dir / "20260103_000000.json").read_text())
+    assert chunk_count(store) == len(set(manifest["chunks"]))
+
+
+def test_legacy_backups_are_imported(store, tmp_path):
+    store.backups_dir.mkdir(parents=True)
+    legacy = write_lines(store.backups_dir / "apartments_20250101_101010.csv", ["u1", "u2"])
+    content = legacy.read_bytes()
+
+    store.import_legacy_backups()
+
+    assert not legacy.exists()
+    store.restore("20250101_101010", tmp_path / "restored.csv")
+    assert (tmp_path / "restored.csv").read_bytes() == content
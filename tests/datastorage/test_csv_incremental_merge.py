@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+from config import paths, schema
+from datastorage.csv.CSV import CSV
+
+
+@pytest.fixture
+def csv_storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(paths, "APARTMENTS_CSV_PATH", tmp_path / "apartments.csv")
+    monkeypatch.setattr(paths, "APARTMENTS_CSV_URL_INDEX_PATH", tmp_path / "apartments.url_index.npz")
+    monkeypatch.setattr(paths, "APARTMENTS_CSV_BACKUPS_DIR", tmp_path / "backups")
+    return tmp_path
+
+
+def write_batch(path, urls, prices):
+    schema.write_processed_csv(pd.DataFrame({
+        "url": urls,
+        "city": ["თბილისი"] * len(urls),
+        "price": pd.array(prices, dtype="Float64"),
+        "description": ["იყიდება ბინა\nვაკეში"] * len(urls),
+    }), path)
+    return path
+
+
+def merge_all(csv_storage, batches, incremental):
+    csv_path = csv_storage / "apartments.csv"
+    csv_path.unlink(missing_ok=True)
+    (csv_storage / "apartments.url_index.npz").unlink(missing_ok=True)
+
+    for i, (urls, prices) in enumerate(batches):
+        CSV().deduplicate_and_write(write_batch(csv_storage / f"batch_{i}.csv", urls, prices), incremental=incremental)
+
+    return schema.read_processed_csv(csv_path)
+
+
+def test_incremental_merge_matches_full_rewrite(csv_storage):
+    batches = [
+        (["u1", "u2", "u3"], [100, 200, None]),
+        (["u4", "u2", "u5"], [400, 200, 500]),      # u2 unchanged → only appends
+        (["u1", "u6", "u6"], [150, 600, 650]),      # u1 changed → moved to the end, u6 repeated in the batch
+        (["u3", "u7"], [None, 700]),                # nothing changed for u3
+    ]
+
+    incremental = merge_all(csv_storage, batches, incremental=True)
+    full = merge_all(csv_storage, batches, incremental=False)
+
+    # Same rows; unchanged URLs keep their position instead of moving to the end
+    pd.testing.assert_frame_equal(
+        incremental.sort_values("url", ignore_index=True), full.sort_values("url", ignore_index=True)
+    )
+    assert incremental["url"].tolist() == ["u2", "u3", "u4", "u5", "u1", "u6", "u7"]
+    assert incremental.loc[incremental["url"] == "u6", "price"].item() == 650
+
+
+def test_backup_restores_the_csv_bytes(csv_storage):
+    write_batch(csv_storage / "apartments.csv", ["u1"], [100])
+
+    store = CSV().backup_store
+    CSV().backup()
+
+    (timestamp,) = store.list_snapshots()
+    store.restore(timestamp, csv_storage / "restored.csv")
+    assert (csv_storage / "restored.csv").read_bytes() == (csv_storage / "apartments.csv").read_bytes()
+
+
+def test_url_index_is_rebuilt_when_csv_changes_outside(csv_storage):
+    merge_all(csv_storage, [(["u1", "u2"], [100, 200])], incremental=True)
+
+    # Edited by hand: u2 removed, the stored index no longer matches the file
+    write_batch(csv_storage / "apartments.csv", ["u1"], [100])
+    CSV().deduplicate_and_write(write_batch(csv_storage / "batch.csv", ["u2"], [200]))
+
+    assert schema.read_processed_csv(csv_storage / "apartments.csv")["url"].tolist() == ["u1", "u2"]
@@ -0,0 +1,42 @@
+import pandas as pd
+from config import schema
+
+
+def test_processed_csv_round_trip_is_typed(tmp_path):
+    n_rows = 6_000  # larger than one pyarrow block, descriptions contain quoted newlines
+    df = pd.DataFrame({
+        "url": [f"https://livo.ge/{i}" for i in range(n_rows)],
+        "city": ["თბილისი", "ბათუმი", None] * (n_rows // 3),
+        "price": pd.array([120_000.5, None, 80_000] * (n_rows // 3), dtype="Float64"),
+        "description": ["იყიდება ბინა\nვაკეში, " + "ახალი რემონტით " * 10] * n_rows,
+        "district_name": ["ვაკე", None, "N/A"] * (n_rows // 3),
+        "bedrooms": pd.array([2, None, 3] * (n_rows // 3), dtype="Int64"),
+        "upload_date": pd.to_datetime(["2026-01-01 10:05", None, "2025-12-31 23:59"] * (n_rows // 3)),
+    })
+
+    path = tmp_path / "apartments.csv"
+    schema.write_processed_csv(df, path)
+    result = schema.read_processed_csv(path)
+
+    assert len(result) == n_rows
+    assert result["city"].dtype == "category"
+    assert result["district_name"].dtype == "category"
+    assert result["price"].dtype == "Float64"
+    assert result["bedrooms"].dtype == "Int64"
+    assert result["upload_date"].dtype == "datetime64[ns]"
+
+    assert result["description"].iloc[-1] == df["description"].iloc[-1]
+    assert result["bedrooms"].tolist()[:3] == [2, pd.NA, 3]
+    assert result["district_name"].isna().tolist()[:3] == [False, True, True]
+    assert result["upload_date"].iloc[0] == pd.Timestamp("2026-01-01 10:05")
+
+
+def test_integer_columns_accept_float_text(tmp_path):
+    # datastorage/csv/apartments.csv files written before the schema stored bedrooms as "2.0"
+    path = tmp_path / "apartments.csv"
+    path.write_text("url,bedrooms,floor\nhttps://livo.ge/1,2.0,\nhttps://livo.ge/2,<NA>,5\n", encoding="utf-8")
+
+    result = schema.read_processed_csv(path)
+
+    assert result["bedrooms"].tolist() == [2, pd.NA]
+    assert result["floor"].tolist() == [pd.NA, 5]
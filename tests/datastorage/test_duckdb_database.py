@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+from config import schema
+from datastorage.duckdb.DuckDBDatabase import DuckDBDatabase
+
+SALE, RENT = "იყიდება", "ქირავდება თვიურად"
+
+
+@pytest.fixture
+def processed_csv(tmp_path):
+    df = pd.DataFrame({
+        "url": ["u1", "u2", "u3", "u4"],
+        "city": ["თბილისი", "ბათუმი", "თბილისი", "თბილისი"],
+        "price": [100000, 500, 90000, None],
+        "price_per_sqm": [1000, 10, 900, 800],
+        "description": ["იყიდება ბინა\nვაკეში", None, "ბინა", "ბინა"],
+        "district_name": ["ვაკე", None, "საბურთალო", "ვაკე"],
+        "street_address": ["ჭავჭავაძის გამზ.", None, "ვაჟა-ფშაველა", None],
+        "area_m2": [100, 50, 100, 100],
+        "bedrooms": pd.array([2, None, 3, 1], dtype="Int64"),
+        "floor": pd.array([3, 4, None, 1], dtype="Int64"),
+        "upload_date": pd.to_datetime(["2026-01-05 10:00", "2026-02-01 00:00", None, "2026-01-01 00:00"]),
+        "transaction_type": [SALE, RENT, SALE, SALE],
+        "source": ["myhome.ge", "livo.ge", "home.ss.ge", "myhome.ge"],
+    })
+    schema.write_processed_csv(df, tmp_path / "apartments.csv")
+    return tmp_path / "apartments.csv"
+
+
+def test_insertion_and_readers(tmp_path, processed_csv):
+    database = DuckDBDatabase(tmp_path / "apartments.duckdb")
+    database.database_insertion(processed_csv)
+    database.database_insertion(processed_csv)  # already loaded apartments are skipped
+
+    apartments = database.get_all_apartments().sort_values("url", ignore_index=True)
+    assert apartments["url"].tolist() == ["u1", "u2", "u3"]  # u4 has no price
+    assert all(apartments[column].dtype == dtype for column, dtype in schema.PROCESSED_DTYPES.items())
+    assert apartments.loc[0, "description"] == "იყიდება ბინა\nვაკეში"
+    assert pd.isna(apartments.loc[1, "district_name"])
+    assert pd.isna(apartments.loc[2, "floor"]) and pd.isna(apartments.loc[2, "upload_date"])
+
+    by_type = database.get_apartments_by_transactions([SALE, RENT], columns=schema.ANALYSIS_COLUMNS)
+    assert sorted(by_type[SALE]["price"].tolist()) == [90000, 100000]
+    assert by_type[RENT]["city"].tolist() == ["ბათუმი"]
+    assert "description" not in by_type[SALE].columns
+
+    filtered = database.get_apartments(["url"], cities=["თბილისი"], start_date="2026-01-01", end_date="2026-02-01")
+    assert filtered["url"].tolist() == ["u1"]
+
+    with pytest.raises(ValueError):
+        database.get_apartments(["url; DROP TABLE dw.fct_apartments"])
+
+
+def test_schema_na_tokens_are_staged_as_null(tmp_path, processed_csv):
+    text = processed_csv.read_text(encoding="utf-8")
+    text = text.replace("ვაჟა-ფშაველა", "N/A").replace(",ბინა,საბურთალო,", ',"",საბურთალო,')
+    processed_csv.write_text(text, encoding="utf-8")
+
+    database = DuckDBDatabase(tmp_path / "apartments.duckdb")
+    database.database_insertion(processed_csv)
+
+    u3 = database.get_apartments(["url", "description", "street_address"]).set_index("url").loc["u3"]
+    assert pd.isna(u3["street_address"]) and pd.isna(u3["description"])
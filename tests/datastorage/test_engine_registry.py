@@ -0,0 +1,19 @@
+from sqlalchemy import text
+from datastorage.postgresql.EngineRegistry import EngineRegistry
+
+
+def test_engine_is_shared_and_checkouts_are_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(EngineRegistry, "_engines", {})
+    db_url = f"sqlite:///{tmp_path / 'apartments.db'}"
+
+    engine = EngineRegistry.get_engine(db_url)
+    assert EngineRegistry.get_engine(db_url) is engine
+
+    for _ in range(3):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    (metrics,) = EngineRegistry.pool_metrics().values()
+    assert metrics["checkouts"] == 3
+    assert metrics["connections_created"] == 1  # the connection is reused from the pool
+    EngineRegistry.dispose_all()
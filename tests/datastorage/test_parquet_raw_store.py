@@ -0,0 +1,87 @@
+import pandas as pd
+from datastorage.parquet.ParquetRawStore import ParquetRawStore
+
+
+def make_store(tmp_path):
+    return ParquetRawStore(store_dir=tmp_path / "store", index_path=tmp_path / "store" / "url_index.parquet")
+
+
+def test_append_keeps_latest_scrape_per_url(tmp_path):
+    store = make_store(tmp_path)
+
+    store.append(pd.DataFrame({
+        "url": ["https://www.myhome.ge/pr/1", "https://livo.ge/2"],
+        "price": ["100 $", "200 $"],
+    }), scraped_at=pd.Timestamp("2026-01-01 03:00"))
+
+    store.append(pd.DataFrame({
+        "url": ["https://www.myhome.ge/pr/1", "https://home.ss.ge/3"],
+        "price": ["90 $", 300],  # mixed types are stored as strings
+    }), scraped_at=pd.Timestamp("2026-01-02 03:00"))
+
+    assert sorted(p.name for p in (tmp_path / "store").glob("scrape_date=*")) == [
+        "scrape_date=2026-01-01", "scrape_date=2026-01-02"
+    ]
+    assert (tmp_path / "store" / "scrape_date=2026-01-02" / "source=home.ss.ge").is_dir()
+
+    latest = store.read(columns=["price"]).set_index("url")["price"]
+    assert latest.to_dict() == {
+        "https://livo.ge/2": "200 $",
+        "https://www.myhome.ge/pr/1": "90 $",
+        "https://home.ss.ge/3": "300",
+    }
+
+    history = store.read(latest_only=False)
+    assert len(history) == 4
+
+    first_day = store.read(start_date="2026-01-01", end_date="2026-01-01", latest_only=False)
+    assert sorted(first_day["url"]) == ["https://livo.ge/2", "https://www.myhome.ge/pr/1"]
+
+
+def test_import_csv_runs_once(tmp_path):
+    csv_path = tmp_path / "all_data.csv"
+    pd.DataFrame({
+        "url": ["https://livo.ge/1", "https://livo.ge/2"],
+        "price": ["1 $", "2 $"],
+        "scraped_at": ["2025-12-30 10:00:00", "2025-12-31 10:00:00"],
+    }).to_csv(csv_path, index=False)
+
+    store = make_store(tmp_path)
+    assert store.import_csv(csv_path) == 2
+    assert store.import_csv(csv_path) == 0
+
+    assert len(store.load_index()) == 2
+    assert len(store.read(start_date="2025-12-31")) == 1
+
+
+def test_append_writes_an_index_part_and_compacts_occasionally(tmp_path):
+    store = make_store(tmp_path)
+    store.COMPACT_EVERY = 3
+    index_path, parts_dir = tmp_path / "store" / "url_index.parquet", tmp_path / "store" / "url_index"
+
+    def append(day, urls):
+        store.append(pd.DataFrame({"url": urls, "price": [f"{day} $"] * len(urls)}), scraped_at=pd.Timestamp(f"2026-01-0{day}"))
+
+    append(1, ["https://livo.ge/1", "https://livo.ge/2"])
+    append(2, ["https://livo.ge/2"])
+    assert store.is_empty() is False
+    assert not index_path.exists()
+    assert len(list(parts_dir.glob("part-*.parquet"))) == 2
+    assert store.load_index().set_index("url")["scraped_at"].dt.day.to_dict() == {
+        "https://livo.ge/1": 1, "https://livo.ge/2": 2
+    }
+
+    append(3, ["https://livo.ge/3"])
+    assert index_path.exists()
+    assert list(parts_dir.glob("*")) == []
+    compacted = index_path.read_bytes()
+
+    # later appends leave the compacted index untouched
+    append(4, ["https://livo.ge/1"])
+    assert index_path.read_bytes() == compacted
+    assert len(list(parts_dir.glob("part-*.parquet"))) == 1
+
+    latest = store.read(columns=["price"]).set_index("url")["price"]
+    assert latest.to_dict() == {
+        "https://livo.ge/2": "2 $", "https://livo.ge/3": "3 $", "https://livo.ge/1": "4 $"
+    }
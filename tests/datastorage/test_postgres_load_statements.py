@@ -0,0 +1,117 @@
+import csv
+from contextlib import contextmanager
+import pandas as pd
+from config import schema
+from datastorage.postgresql.PostgresDatabase import PostgresDatabase
+
+
+class RecordingEngine:
+    """ Stand-in engine recording the SQL of every connection: no Postgres server needed """
+    def __init__(self, mv_index_exists=True):
+        self.statements = []
+        self.copied = []  # CSV text of every COPY FROM STDIN
+        self.mv_index_exists = mv_index_exists
+
+    def execute(self, statement, *args):
+        self.statements.append(str(statement).strip())
+        return self
+
+    def scalar(self):
+        return int(self.mv_index_exists)
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    connect = begin
+
+    def raw_connection(self):
+        engine = self
+
+        class Cursor:
+            rowcount = 2
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql):
+                engine.statements.append(sql)
+
+            def copy_expert(self, sql, file, size):
+                engine.statements.append(sql)
+                engine.copied.append(file.read())
+
+        class Connection:
+            def cursor(self):
+                return Cursor()
+
+            def commit(self):
+                engine.statements.append("COMMIT")
+
+            def rollback(self):
+                pass
+
+            def close(self):
+                pass
+
+        return Connection()
+
+
+def _database(engine):
+    database = PostgresDatabase.__new__(PostgresDatabase)
+    database.engine = engine
+    return database
+
+
+def test_load_statements_lift_the_statement_timeout():
+    engine = RecordingEngine()
+    database = _database(engine)
+
+    database._PostgresDatabase__copy_to_staging([pd.DataFrame({"url": ["a", "b"], "price": [1, 2]})])
+    assert engine.statements[0] == PostgresDatabase.NO_STATEMENT_TIMEOUT
+    assert engine.statements[1].startswith('COPY sa.apartments ("url", "price") FROM STDIN')
+
+    engine.statements.clear()
+    database.refresh_materialized_view()
+    assert engine.statements[-2:] == [
+        PostgresDatabase.NO_STATEMENT_TIMEOUT, "REFRESH MATERIALIZED VIEW CONCURRENTLY dw.all_apartments_mv"
+    ]
+
+
+def test_missing_materialized_view_is_created_instead_of_refreshed():
+    engine = RecordingEngine(mv_index_exists=False)
+    _database(engine).refresh_materialized_view()
+
+    assert engine.statements[1] == PostgresDatabase.NO_STATEMENT_TIMEOUT
+    assert "CREATE MATERIALIZED VIEW IF NOT EXISTS dw.all_apartments_mv" in engine.statements[2]
+    assert not any(statement.startswith("REFRESH") for statement in engine.statements)
+
+
+def test_copy_loads_every_schema_na_token_as_null(tmp_path):
+    processed_csv = tmp_path / "apartments.csv"
+    processed_csv.write_text(
+        ",".join(schema.PROCESSED_COLUMNS) + "\n"
+        "u1,თბილისი,100000.0,1000.0,N/A,ვაკე,,100.0,2,3,2026-01-05 10:00:00,იყიდება,myhome.ge\n"
+        'u2,ბათუმი,500.0,NA,"",<NA>,ჭავჭავაძის გამზ.,50.0,,4.0,,ქირავდება თვიურად,livo.ge\n',
+        encoding="utf-8"
+    )
+    engine = RecordingEngine()
+
+    rows = _database(engine)._PostgresDatabase__copy_to_staging(schema.iter_processed_csv(processed_csv))
+    assert rows == 2 and len(engine.copied) == 1
+
+    # staging as Postgres loads it: NULL '<NA>'
+    header, *staged = csv.reader(engine.copied[0].splitlines())
+    staged = [{column: None if value == schema.NA_REP else value for column, value in zip(header, row)} for row in staged]
+
+    assert header == schema.PROCESSED_COLUMNS
+    assert [row["description"] for row in staged] == [None, None]
+    assert [row["street_address"] for row in staged] == [None, "ჭავჭავაძის გამზ."]
+    assert [row["district_name"] for row in staged] == ["ვაკე", None]
+    assert [row["price_per_sqm"] for row in staged] == ["1000.0", None]
+    assert [row["bedrooms"] for row in staged] == ["2", None]
+    assert [row["floor"] for row in staged] == ["3", "4"]
+    assert [row["upload_date"] for row in staged] == ["2026-01-05 10:00:00", None]
@@ -0,0 +1,54 @@
+from decimal import Decimal
+import pandas as pd
+from config import schema
+from datastorage.postgresql.PostgresDatabase import PostgresDatabase
+
+
+class StreamingEngine:
+    """ Stand-in engine for the server-side cursor connection of iter_apartments """
+    def connect(self):
+        return self
+
+    def execution_options(self, **options):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _database():
+    database = PostgresDatabase.__new__(PostgresDatabase)
+    database.engine = StreamingEngine()
+    return database
+
+
+def test_chunks_have_the_schema_dtypes(monkeypatch):
+    columns = ["url", "city", "price", "bedrooms", "floor", "upload_date"]
+
+    # what read_sql infers from two chunks of the same query
+    chunks = [
+        pd.DataFrame({
+            "url": ["u1", "u2"], "city": ["თბილისი", "ბათუმი"], "price": [Decimal("100000.00"), Decimal("500.50")],
+            "bedrooms": [2, 3], "floor": [3.0, float("nan")], "upload_date": pd.to_datetime(["2026-01-05", None]),
+        }),
+        pd.DataFrame({
+            "url": ["u3"], "city": ["ქუთაისი"], "price": [Decimal("90000.00")],
+            "bedrooms": [None], "floor": [None], "upload_date": [None],
+        }),
+    ]
+    monkeypatch.setattr(pd, "read_sql", lambda *args, **kwargs: iter(chunks))
+    expected = {column: schema.PROCESSED_DTYPES[column] for column in columns}
+
+    for chunk in _database().iter_apartments(columns):
+        assert list(chunk.columns) == columns
+        assert all(chunk[column].dtype == dtype for column, dtype in expected.items())
+
+    apartments = _database().get_apartments(columns)
+    assert all(apartments[column].dtype == dtype for column, dtype in expected.items())
+    assert apartments["city"].tolist() == ["თბილისი", "ბათუმი", "ქუთაისი"]
+    assert apartments["price"].tolist() == [100000.0, 500.5, 90000.0]
+    assert apartments["bedrooms"].tolist() == [2, 3, pd.NA]
+    assert apartments["floor"].tolist() == [3, pd.NA, pd.NA]
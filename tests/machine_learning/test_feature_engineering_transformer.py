@@ -0,0 +1,34 @@
+import numpy as np
+import pandas as pd
+from backend.machine_learning.pipeline.FeatureEngineeringTransformer import FeatureEngineeringTransformer
+
+
+def test_transform_district_lookups():
+    train = pd.DataFrame({
+        "city": ["ქუთაისი"] * 100 + ["ქუთაისი"] * 2 + ["ბათუმი"] * 3,
+        "district_name": ["გორა"] * 100 + ["ბალახვანი"] * 2 + ["ძველი ბათუმი"] * 3,
+        "area_m2": [50.0] * 105,
+        "bedrooms": [2] * 105,
+        "floor": [3] * 105,
+        "price_per_sqm": [1000.0] * 100 + [500.0] * 2 + [2000.0] * 3,
+        "upload_date": ["2025-07-15 12:00"] * 105,
+    })
+
+    transformer = FeatureEngineeringTransformer().fit(train)
+
+    X = pd.DataFrame({
+        "city": ["ქუთაისი", "ქუთაისი", "ბათუმი", "თელავი"],
+        "district_name": ["გორა", "ბალახვანი", "ძველი ბათუმი", "ცენტრი"],
+        "area_m2": [50.0] * 4,
+        "bedrooms": [2] * 4,
+        "floor": [3] * 4,
+        "upload_date": ["2026-01-15 12:00"] * 4,
+    })
+
+    result = transformer.transform(X)
+
+    # districts below 100 listings are grouped, unseen cities keep their district
+    assert result["district_grouped"].tolist() == ["გორა", "other", "other", "ცენტრი"]
+    # unseen (city, district) pairs fall back to the global median and a zero count
+    assert result["district_median_price_per_sqm"].tolist() == [1000.0, 500.0, 2000.0, 1000.0]
+    np.testing.assert_allclose(result["district_listing_count"], np.log1p([100, 2, 3, 0]))
@@ -0,0 +1,42 @@
+import threading
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+import pytest
+from datastorage.parquet.ParquetRawStore import ParquetRawStore
+from scrapers.SeenUrlIndex import SeenUrlIndex
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def listings_server():
+    """ Local stand-in for home.ss.ge serving the saved listings pages, yields its port """
+    server = HTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(FIXTURES_DIR)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_port
+    server.shutdown()
+
+
+@pytest.fixture
+def raw_store(tmp_path, monkeypatch):
+    """ Raw store in tmp_path, used by the seen URL index and ApartmentsDataFrame """
+    store = partial(ParquetRawStore, store_dir=tmp_path / "raw_store", index_path=tmp_path / "raw_store" / "url_index.parquet")
+    monkeypatch.setattr("scrapers.SeenUrlIndex.ParquetRawStore", store)
+    monkeypatch.setattr("data_cleaning.ApartmentsDataFrame.ParquetRawStore", store)
+    return store
+
+
+@pytest.fixture
+def new_process(tmp_path, raw_store, monkeypatch):
+    """ Starts a fresh seen URL index in tmp_path (as a new process would) and returns it """
+    def start():
+        monkeypatch.setattr(SeenUrlIndex, "_instance", None)
+        return SeenUrlIndex(index_path=tmp_path / "seen_urls.txt", raw_data_path=tmp_path / "all_data.csv")
+
+    return start
@@ -0,0 +1,43 @@
+import threading
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+import pandas as pd
+from scrapers.SSHomeScraper import SSHomeScraper
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def test_sshome_http_backend_against_saved_page(tmp_path):
+    # Local stand-in for home.ss.ge serving a saved listings page
+    server = HTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(FIXTURES_DIR)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    scraper = SSHomeScraper()
+    scraper.city_id_dict = {'თბილისი': 95}
+    scraper.number_of_pages_to_scrape = 2
+    scraper.raw_apartments_csv_path = tmp_path / "sshome_apartments.csv"
+    scraper.get_url = lambda city_id, page, deal_type: f"http://127.0.0.1:{server.server_port}/sshome_listings_page.html"
+
+    try:
+        scraper.scraper(deal_types=[1], fetch_backend='http')
+    finally:
+        server.shutdown()
+
+    result = pd.read_csv(scraper.raw_apartments_csv_path, dtype=str)
+
+    # the listing without a currency in its price is skipped, like in the Selenium backend
+    assert result["url"].tolist() == [
+        "https://home.ss.ge/ka/udzravi-qoneba/iyideba-2-otaxiani-bina-vakeshi-1001",
+        "https://home.ss.ge/ka/udzravi-qoneba/iyideba-3-otaxiani-bina-saburtaloze-1002",
+    ]
+    assert result["price"].tolist() == ["120,000 $", "250,000 ₾"]
+    assert result["area_m2"].tolist() == ["65 მ²", "90 მ²"]
+    assert result.loc[0, "bedrooms"] == "2" and pd.isna(result.loc[1, "bedrooms"])
+    assert result["floor"].tolist() == ["5/12", "3/9"]
+    assert result["upload_date"].tolist() == ["12 იან 10:15", "2 საათის წინ"]
@@ -0,0 +1,84 @@
+from scrapers.MyHomeScraper import MyHomeScraper
+
+
+class FakeElement:
+    """ Stand-in WebElement with static text and children per XPath """
+    def __init__(self, text='', children=None, attributes=None):
+        self.text = text
+        self.children = children or {}
+        self.attributes = attributes or {}
+
+    def find_elements(self, by, value):
+        return self.children.get(value, [])
+
+    def find_element(self, by, value):
+        return self.children[value][0]
+
+    def get_attribute(self, name):
+        return self.attributes.get(name)
+
+
+class LateCard(FakeElement):
+    """ Listing card whose 5 inner divs appear only after the first lookups """
+    def __init__(self, url, blocks, lookups_before_render=2):
+        super().__init__(attributes={'href': url})
+        self.blocks = blocks
+        self.lookups_before_render = lookups_before_render
+
+    def find_elements(self, by, value):
+        if self.lookups_before_render > 0:
+            self.lookups_before_render -= 1
+            return []
+        return self.blocks
+
+
+class FakeDriver:
+    def __init__(self, script_result):
+        self.script_result = script_result
+
+    def execute_script(self, script, *args):
+        return self.script_result
+
+
+def _raw(url, district):
+    return {
+        'url': url,
+        'blocks': ['120,000\n$\n1,500 მ²', 'description', 'street', '80 მ²', f'{district}\n12 იან'],
+        'features': [{'text': '80 მ²', 'icon': None}],
+    }
+
+
+def test_incomplete_card_is_read_again_with_webdriver():
+    scraper = MyHomeScraper()
+    blocks = [FakeElement(text) for text in ['120,000\n$\n1,500 მ²', 'description', 'street', '', 'ვაკე\n12 იან']]
+    blocks[3].children = {"./div": [FakeElement('80 მ²')]}
+    listings = [FakeElement(), LateCard('https://www.myhome.ge/pr/2', blocks), FakeElement()]
+
+    # the script ran while the second card was still rendering
+    driver = FakeDriver([
+        _raw('https://www.myhome.ge/pr/1', 'საბურთალო'),
+        {'error': 'expected 5 div elements to load.'},
+        _raw('https://www.myhome.ge/pr/3', 'დიდუბე'),
+    ])
+
+    raw_listings = scraper.extract_listings_js(driver, listings, 'თბილისი', 2)
+    assert raw_listings[1] == {
+        'url': 'https://www.myhome.ge/pr/2',
+        'blocks': ['120,000\n$\n1,500 მ²', 'description', 'street', '', 'ვაკე\n12 იან'],
+        'features': [{'text': '80 მ²', 'icon': None}],
+    }
+
+    records, _ = scraper.collect_records(listings, raw_listings, 'თბილისი', 2)
+    assert [record['url'] for record in records] == [f'https://www.myhome.ge/pr/{i}' for i in (1, 2, 3)]
+    assert [record['district_name'] for record in records] == ['საბურთალო', 'ვაკე', 'დიდუბე']
+
+
+def test_card_that_never_renders_is_skipped():
+    scraper = MyHomeScraper()
+    listings = [LateCard('https://www.myhome.ge/pr/1', [], lookups_before_render=10 ** 6)]
+    driver = FakeDriver([{'error': 'expected 5 div elements to load.'}])
+
+    raw_listings = scraper.extract_listings_js(driver, listings, 'თბილისი', 2)
+
+    assert raw_listings == [{'error': 'expected 5 div elements to load.'}]
+    assert scraper.collect_records(listings, raw_listings, 'თბილისი', 2) == ([], False)
@@ -0,0 +1,117 @@
+import json
+import threading
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pathlib import Path
+import pandas as pd
+import pytest
+from selenium.common.exceptions import WebDriverException
+from scrapers.SSHomeScraper import SSHomeScraper
+from scrapers.StreamingCsvSink import StreamingCsvSink
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+def _scraper(tmp_path, port=0):
+    scraper = SSHomeScraper()
+    scraper.city_id_dict = {'თბილისი': 95}
+    scraper.number_of_pages_to_scrape = 3
+    scraper.http_concurrency = 2
+    scraper.raw_apartments_csv_path = tmp_path / "sshome_apartments.csv"
+    scraper.get_url = lambda city_id, page, deal_type: f"http://127.0.0.1:{port}/sshome_listings_page.html"
+    return scraper
+
+
+def test_failed_workers_keep_checkpoint_and_resume(tmp_path):
+    def open_client(fetch_backend):
+        raise WebDriverException("driver failed to start")
+
+    failing = _scraper(tmp_path)
+    failing.open_client = open_client
+
+    with pytest.raises(RuntimeError, match="2 of 2 pages were not scraped"):
+        failing.scraper(deal_types=[1], fetch_backend='http')
+
+    checkpoint_path = failing.raw_apartments_csv_path.with_suffix(".checkpoint.json")
+    assert checkpoint_path.exists()
+    assert json.loads(checkpoint_path.read_text(encoding="utf-8"))["completed"] == []
+
+    # the next run of the day scrapes the pages left behind and finalizes the checkpoint
+    server = HTTPServer(("127.0.0.1", 0), partial(QuietHandler, directory=str(FIXTURES_DIR)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        _scraper(tmp_path, server.server_port).scraper(deal_types=[1], fetch_backend='http')
+    finally:
+        server.shutdown()
+
+    assert not checkpoint_path.exists()
+    assert len(pd.read_csv(failing.raw_apartments_csv_path, dtype=str)) == 4
+
+
+def test_checkpoint_of_another_run_is_not_resumed(tmp_path):
+    csv_path = tmp_path / "apartments.csv"
+    run = {"date": "2026-10-17", "deal_types": [1], "early_stop": True}
+
+    sink = StreamingCsvSink(csv_path, ["url"])
+    sink.open(run=run)
+    sink.write_page((1, "თბილისი", 2), [{"url": "a"}], state={"stop_pages": [[1, "თბილისი", 2]]})
+    sink.close(complete=False)
+
+    # same run: completed pages and early stop state come back
+    resumed = StreamingCsvSink(csv_path, ["url"])
+    assert resumed.open(run=run) == {"stop_pages": [[1, "თბილისი", 2]]}
+    assert resumed.is_completed((1, "თბილისი", 2)) and resumed.records_written == 1
+
+    # next day: the stale checkpoint is ignored and the CSV starts over
+    next_day = StreamingCsvSink(csv_path, ["url"])
+    assert next_day.open(run={**run, "date": "2026-10-18"}) == {}
+    assert not next_day.is_completed((1, "თბილისი", 2))
+    assert pd.read_csv(csv_path).empty
+
+
+@pytest.mark.parametrize("flush_every", [None, 10])
+def test_crash_then_resume_scrapes_every_listing_once(tmp_path, listings_server, new_process, flush_every):
+    # every page lists the same 2 listings: only page 2 yields records, later pages hold known listings
+    urls = [
+        "https://home.ss.ge/ka/udzravi-qoneba/iyideba-2-otaxiani-bina-vakeshi-1001",
+        "https://home.ss.ge/ka/udzravi-qoneba/iyideba-3-otaxiani-bina-saburtaloze-1002",
+    ]
+    new_process()
+    crashing = _scraper(tmp_path, listings_server)
+    crashing.http_concurrency = 1
+    crashing.number_of_pages_to_scrape = 4
+    fetch_page = crashing.fetch_page
+
+    def crash_on_page_3(fetcher, deal_type, city_name, city_id, page, seen_urls=None):
+        if page == 3:
+            raise ConnectionAbortedError("process killed")
+        return fetch_page(fetcher, deal_type, city_name, city_id, page, seen_urls)
+
+    crashing.fetch_page = crash_on_page_3
+    with pytest.raises(ConnectionAbortedError):
+        crashing.scraper(deal_types=[1], incremental=True, fetch_backend='http', flush_every=flush_every)
+
+    csv_path = crashing.raw_apartments_csv_path
+    checkpoint = json.loads(csv_path.with_suffix(".checkpoint.json").read_text(encoding="utf-8"))
+    if flush_every is None:
+        # page 2 was flushed and checkpointed, then a flush died before its checkpoint write
+        assert checkpoint["completed"] == [[1, "თბილისი", 95, 2]]
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write(f"{urls[0]},თბილისი,torn row\n")
+    else:
+        # page 2 was still buffered: neither its records nor its urls survive the crash
+        assert checkpoint["completed"] == [] and pd.read_csv(csv_path).empty
+
+    resumed = _scraper(tmp_path, listings_server)
+    resumed.http_concurrency = 1
+    resumed.number_of_pages_to_scrape = 4
+    new_process()
+    resumed.scraper(deal_types=[1], incremental=True, fetch_backend='http', flush_every=flush_every)
+
+    assert pd.read_csv(csv_path, dtype=str)["url"].tolist() == urls
+    assert not csv_path.with_suffix(".checkpoint.json").exists()
@@ -0,0 +1,62 @@
+import pandas as pd
+from data_cleaning.ApartmentsDataFrame import ApartmentsDataFrame
+from scrapers.MyHomeScraper import MyHomeScraper
+from scrapers.SeenUrlIndex import RunSeenUrls
+from scrapers.SSHomeScraper import SSHomeScraper
+
+URLS = [
+    "https://home.ss.ge/ka/udzravi-qoneba/iyideba-2-otaxiani-bina-vakeshi-1001",
+    "https://home.ss.ge/ka/udzravi-qoneba/iyideba-3-otaxiani-bina-saburtaloze-1002",
+]
+
+
+def _scraper(tmp_path, port):
+    scraper = SSHomeScraper()
+    scraper.city_id_dict = {'თბილისი': 95}
+    scraper.number_of_pages_to_scrape = 3
+    scraper.raw_apartments_csv_path = tmp_path / "sshome_apartments.csv"
+    scraper.get_url = lambda city_id, page, deal_type: f"http://127.0.0.1:{port}/sshome_listings_page.html"
+    return scraper
+
+
+def test_urls_are_persisted_only_once_stored(tmp_path, listings_server, new_process, monkeypatch):
+    new_process()
+    scraper = _scraper(tmp_path, listings_server)
+    scraper.scraper(deal_types=[1], incremental=True, fetch_backend='http')
+
+    # both pages list the same listings: the repeats are skipped within the run, but nothing is persisted yet
+    assert pd.read_csv(scraper.raw_apartments_csv_path)["url"].tolist() == URLS
+    assert not (tmp_path / "seen_urls.txt").exists()
+
+    # the pipeline failed before the raw store: the next run scrapes the listings again
+    seen_urls = new_process()
+    assert not any(url in seen_urls for url in URLS)
+
+    scraper.scraper(deal_types=[1], incremental=True, fetch_backend='http')
+    monkeypatch.setattr(ApartmentsDataFrame, "_instance", None)
+    ApartmentsDataFrame(tmp_path / "livo.csv", tmp_path / "myhome.csv", scraper.raw_apartments_csv_path)
+
+    assert (tmp_path / "seen_urls.txt").read_text(encoding="utf-8").splitlines() == URLS
+    assert all(url in new_process() for url in URLS)
+
+
+def test_listing_taken_by_a_parallel_worker_is_not_recorded_twice(new_process):
+    scraper = MyHomeScraper()
+    seen_urls = RunSeenUrls(new_process())
+    url = 'https://www.myhome.ge/pr/1'
+    raw = {
+        'url': url,
+        'blocks': ['120,000\n$\n1,500 მ²', 'description', 'street', '80 მ²', 'ვაკე\n12 იან'],
+        'features': [{'text': '80 მ²', 'icon': None}],
+    }
+
+    # another worker records the same listing while this one parses it
+    parse_raw_listing = scraper.parse_raw_listing
+    def parse_while_taken(*args):
+        record = parse_raw_listing(*args)
+        assert seen_urls.add(url)
+        return record
+    scraper.parse_raw_listing = parse_while_taken
+
+    assert scraper.collect_records([None], [raw], 'თბილისი', 1, seen_urls) == ([], True)
+    assert url in seen_urls